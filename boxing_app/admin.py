@@ -1,11 +1,20 @@
 from django.contrib import admin
-from django.utils.safestring import mark_safe
+from django.utils.html import format_html
+from . import images
 from .models import (
     NavbarItem, Service, Header, Footer, Trainer, Event, ShopItem, About,
     TrainingSchedule, BMICalculator, CartItem, GalleryImage, HomePageContent,
     MembershipPlan, MembershipPageContent
 )
 
+def thumbnail(obj):
+    """50px preview: the small thumbnail once it is built, the original until then"""
+    if not obj.image:
+        return "No Image"
+    meta = images.current(obj)
+    url = images.thumbnail_url(meta) if meta else obj.image.url
+    return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" loading="lazy" />', url)
+
 @admin.register(NavbarItem)
 class NavbarItemAdmin(admin.ModelAdmin):
     list_display = ['name', 'link', 'order', 'is_active']
@@ -37,9 +46,7 @@ class TrainerAdmin(admin.ModelAdmin):
     readonly_fields = ['image_preview']
     
     def image_preview(self, obj):
-        if obj.image:
-            return mark_safe(f'<img src="{obj.image.url}" width="50" height="50" style="object-fit: cover;" />')
-        return "No Image"
+        return thumbnail(obj)
     image_preview.short_description = 'Image Preview'
 
 @admin.register(Event)
@@ -58,9 +65,7 @@ class ShopItemAdmin(admin.ModelAdmin):
     readonly_fields = ['image_preview']
     
     def image_preview(self, obj):
-        if obj.image:
-            return mark_safe(f'<img src="{obj.image.url}" width="50" height="50" style="object-fit: cover;" />')
-        return "No Image"
+        return thumbnail(obj)
     image_preview.short_description = 'Image Preview'
 
 @admin.register(About)
@@ -81,8 +86,9 @@ class BMICalculatorAdmin(admin.ModelAdmin):
 
 @admin.register(CartItem)
 class CartItemAdmin(admin.ModelAdmin):
-    list_display = ['item', 'quantity', 'added_date']
+    list_display = ['item', 'user', 'quantity', 'added_date']
     list_filter = ['added_date']
+    list_select_related = ['item', 'user']
     readonly_fields = ['added_date']
 
 @admin.register(GalleryImage)
@@ -94,9 +100,7 @@ class GalleryImageAdmin(admin.ModelAdmin):
     readonly_fields = ['image_preview']
     
     def image_preview(self, obj):
-        if obj.image:
-            return mark_safe(f'<img src="{obj.image.url}" width="50" height="50" style="object-fit: cover;" />')
-        return "No Image"
+        return thumbnail(obj)
     image_preview.short_description = 'Image Preview'
 
 @admin.register(HomePageContent)
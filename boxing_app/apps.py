@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BoxingAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'boxing_app'
+
+    def ready(self):
+        from .cart import connect_cart_signals
+        from .signals import connect_content_signals, connect_image_signals
+        connect_content_signals()
+        connect_image_signals()
+        connect_cart_signals()
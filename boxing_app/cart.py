@@ -0,0 +1,374 @@
+"""
+Shopping carts.
+
+Logged-in users keep their cart in ``CartItem`` rows, one per product, and
+every change is a single UPDATE/INSERT/DELETE (quantities move with ``F()``
+so parallel requests can't overwrite each other). Guests keep theirs in a
+signed cookie, so browsing and filling a cart never writes to the session
+store. Logging in merges the cookie cart into the account, and a cart that
+an earlier release left in the session is moved into whichever cart the
+visitor has on their next request.
+
+``CartMiddleware`` puts the right one on ``request.cart``; both offer the
+same methods to the views. ``request.cart.totals()`` is what the layout and
+the count endpoint need (count, subtotal, version), computed at most once per
+request; a member's totals are also cached until their cart or the catalog
+changes, so showing the badge doesn't query the database.
+"""
+import hashlib
+import json
+import time
+from decimal import Decimal
+from functools import cached_property
+
+from django.contrib.auth.signals import user_logged_in
+from django.core import signing
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import DecimalField, F, Sum
+from django.utils.functional import SimpleLazyObject
+
+from . import content_cache
+from .models import CartItem, ShopItem
+
+
+FREE_SHIPPING_THRESHOLD = Decimal('100.00')
+SHIPPING_FEE = Decimal('15.00')
+TAX_RATE = Decimal('0.08')
+
+COOKIE_NAME = 'cart'
+COOKIE_SALT = 'boxing_app.cart'
+COOKIE_MAX_AGE = 60 * 60 * 24 * 30
+
+# Where carts lived before: still read once, then moved (see get_cart)
+LEGACY_SESSION_KEY = 'cart'
+
+VERSION_KEY = 'cart:version:{user}'
+TOTALS_KEY = 'cart:totals:{user}:{version}'
+TOTALS_TIMEOUT = 60 * 60
+
+
+class CartSummary:
+    """Priced snapshot of a cart: line items plus subtotal, shipping, tax and total"""
+
+    def __init__(self, items):
+        self.items = items
+        self.count = sum(item['quantity'] for item in items)
+        self.subtotal = sum((item['subtotal'] for item in items), Decimal('0.00'))
+        self.shipping = Decimal('0.00') if self.subtotal > FREE_SHIPPING_THRESHOLD else SHIPPING_FEE
+        self.tax = self.subtotal * TAX_RATE
+        self.total = self.subtotal + self.shipping + self.tax
+
+
+class CartTotals:
+    """Item count, subtotal and a version string that changes whenever either may have"""
+
+    def __init__(self, version, count, subtotal):
+        self.version = version
+        self.count = count
+        self._subtotal = subtotal  # a Decimal, or a function that prices the cart on first use
+
+    @cached_property
+    def subtotal(self):
+        return self._subtotal() if callable(self._subtotal) else self._subtotal
+
+
+def _clean(data):
+    """The well-formed ``{product_id_str: quantity}`` lines of an untrusted cart dict"""
+    if not isinstance(data, dict):
+        return {}
+    return {
+        key: quantity for key, quantity in data.items()
+        if isinstance(key, str) and key.isdigit() and isinstance(quantity, int) and quantity > 0
+    }
+
+
+def _line(product, quantity):
+    return {
+        'product': product,
+        'quantity': quantity,
+        'subtotal': product.price * Decimal(quantity),
+        'product_id': product.id,
+    }
+
+
+class CookieCart:
+    """Guest cart stored as ``{product_id_str: quantity}`` in a signed cookie"""
+
+    def __init__(self, request):
+        self.data = self._load(request)
+        self.modified = False
+        self._totals = None
+
+    @staticmethod
+    def _load(request):
+        try:
+            data = json.loads(request.get_signed_cookie(COOKIE_NAME, salt=COOKIE_SALT, max_age=COOKIE_MAX_AGE))
+        except (KeyError, signing.BadSignature, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {key: quantity for key, quantity in data.items() if isinstance(quantity, int) and quantity > 0}
+
+    def merge(self, data):
+        """Add the ``{product_id_str: quantity}`` lines of another cart"""
+        for key, quantity in _clean(data).items():
+            self.data[key] = self.data.get(key, 0) + quantity
+        self.save()
+
+    def __contains__(self, product_id):
+        return str(product_id) in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def count(self):
+        return self.totals().count
+
+    def version(self):
+        return hashlib.md5(json.dumps(self.data, sort_keys=True).encode()).hexdigest()[:16]
+
+    def totals(self):
+        if self._totals is None:
+            self._totals = CartTotals(self.version(), sum(self.data.values()), self._subtotal)
+        return self._totals
+
+    def _subtotal(self):
+        ids = [int(key) for key in self.data if key.isdigit()]
+        prices = ShopItem.objects.filter(id__in=ids, is_active=True).in_bulk(ids) if ids else {}
+        return sum((product.price * self.data[str(pk)] for pk, product in prices.items()), Decimal('0.00'))
+
+    def add(self, product_id, quantity=1):
+        key = str(product_id)
+        self.data[key] = self.data.get(key, 0) + quantity
+        self.save()
+
+    def increase(self, product_id):
+        self.add(product_id)
+
+    def decrease(self, product_id):
+        """Drop one unit; returns the remaining quantity (0 when the line was removed)"""
+        key = str(product_id)
+        if self.data[key] > 1:
+            self.data[key] -= 1
+            remaining = self.data[key]
+        else:
+            del self.data[key]
+            remaining = 0
+        self.save()
+        return remaining
+
+    def remove(self, product_id):
+        del self.data[str(product_id)]
+        self.save()
+
+    def clear(self):
+        self.data = {}
+        self.save()
+
+    def save(self):
+        self.modified = True
+        self._totals = None
+
+    def update_response(self, response):
+        if not self.modified:
+            return
+        if self.data:
+            response.set_signed_cookie(
+                COOKIE_NAME, json.dumps(self.data, separators=(',', ':')), salt=COOKIE_SALT,
+                max_age=COOKIE_MAX_AGE, httponly=True, samesite='Lax',
+            )
+        else:
+            response.delete_cookie(COOKIE_NAME, samesite='Lax')
+
+    def hydrate(self):
+        """Load every product in the cart with a single query and price the lines.
+
+        Ids that are malformed, deleted or no longer active are dropped from
+        the cookie in one go.
+        """
+        ids = {}
+        stale = []
+        for product_id_str in self.data:
+            try:
+                ids[int(product_id_str)] = product_id_str
+            except ValueError:
+                stale.append(product_id_str)
+
+        products = ShopItem.objects.filter(is_active=True).in_bulk(list(ids)) if ids else {}
+        stale.extend(key for product_id, key in ids.items() if product_id not in products)
+
+        items = [
+            _line(products[product_id], self.data[key]) for product_id, key in ids.items() if product_id in products
+        ]
+
+        if stale:
+            for key in stale:
+                del self.data[key]
+            self.save()
+
+        summary = CartSummary(items)
+        self._totals = CartTotals(self.version(), summary.count, summary.subtotal)
+        return summary
+
+
+class DatabaseCart:
+    """A logged-in user's ``CartItem`` rows"""
+
+    def __init__(self, user):
+        self.user = user
+        self._totals = None
+
+    def lines(self):
+        return CartItem.objects.filter(user=self.user)
+
+    def __contains__(self, product_id):
+        return self.lines().filter(item_id=product_id).exists()
+
+    def __len__(self):
+        return self.lines().count()
+
+    def count(self):
+        return self.totals().count
+
+    def version(self):
+        """Changes with every change to this cart and to any product"""
+        key = VERSION_KEY.format(user=self.user.pk)
+        cart_version = cache.get(key)
+        if cart_version is None:
+            # From the clock, like content_cache: never reuse a version after a cache flush
+            cache.add(key, time.time_ns(), None)
+            cart_version = cache.get(key)
+        return f'{cart_version}.{content_cache.get_versions([ShopItem])[0]}'
+
+    def totals(self):
+        if self._totals is None:
+            version = self.version()
+            key = TOTALS_KEY.format(user=self.user.pk, version=version)
+            cached = cache.get(key)
+            if cached is None:
+                cached = self.lines().filter(item__is_active=True).aggregate(
+                    count=Sum('quantity'),
+                    subtotal=Sum(F('quantity') * F('item__price'), output_field=DecimalField()),
+                )
+                cache.set(key, cached, TOTALS_TIMEOUT)
+            self._totals = CartTotals(version, cached['count'] or 0, cached['subtotal'] or Decimal('0.00'))
+        return self._totals
+
+    def changed(self):
+        """Call after every write to this user's lines"""
+        self._totals = None
+        try:
+            cache.incr(VERSION_KEY.format(user=self.user.pk))
+        except ValueError:
+            cache.set(VERSION_KEY.format(user=self.user.pk), time.time_ns(), None)
+
+    def _increment(self, product_id, quantity):
+        return self.lines().filter(item_id=product_id).update(quantity=F('quantity') + quantity)
+
+    def add(self, product_id, quantity=1):
+        if not self._increment(product_id, quantity):
+            try:
+                with transaction.atomic():
+                    CartItem.objects.create(user=self.user, item_id=product_id, quantity=quantity)
+            except IntegrityError:
+                # A parallel request inserted the line between our UPDATE and INSERT
+                self._increment(product_id, quantity)
+        self.changed()
+
+    def increase(self, product_id):
+        self.add(product_id)
+
+    def _decrement(self, product_id):
+        return self.lines().filter(item_id=product_id, quantity__gt=1).update(quantity=F('quantity') - 1)
+
+    def decrease(self, product_id):
+        """Drop one unit; returns the remaining quantity (0 when the line was removed)"""
+        line = self.lines().filter(item_id=product_id)
+        # Only a line still at 1: a parallel add may have raised it since our UPDATE
+        if self._decrement(product_id) or not line.filter(quantity__lte=1).delete()[0]:
+            remaining = line.values_list('quantity', flat=True).first() or 0
+        else:
+            remaining = 0
+        self.changed()
+        return remaining
+
+    def remove(self, product_id):
+        self.lines().filter(item_id=product_id).delete()
+        self.changed()
+
+    def clear(self):
+        self.lines().delete()
+        self.changed()
+
+    def merge(self, data):
+        """Add the ``{product_id_str: quantity}`` lines of a guest cart"""
+        data = _clean(data)
+        products = set(ShopItem.objects.filter(
+            id__in=[int(key) for key in data], is_active=True,
+        ).values_list('id', flat=True))
+        for key, quantity in data.items():
+            if int(key) in products:
+                self.add(int(key), quantity)
+
+    def update_response(self, response):
+        pass
+
+    def hydrate(self):
+        """Price the lines with one query; lines of products no longer active are deleted"""
+        lines = list(self.lines().select_related('item').order_by('added_date', 'pk'))
+        stale = [line.pk for line in lines if not line.item.is_active]
+        if stale:
+            CartItem.objects.filter(pk__in=stale).delete()
+            self.changed()
+        summary = CartSummary([_line(line.item, line.quantity) for line in lines if line.item.is_active])
+        # The layout's badge then needs no query of its own
+        self._totals = CartTotals(self.version(), summary.count, summary.subtotal)
+        return summary
+
+
+def get_cart(request):
+    if not hasattr(request, '_cached_cart'):
+        cart = DatabaseCart(request.user) if request.user.is_authenticated else CookieCart(request)
+        session = getattr(request, 'session', None)
+        if session is not None and LEGACY_SESSION_KEY in session:
+            # A cart from before carts left the session; moved over on the visitor's first request
+            legacy = session.pop(LEGACY_SESSION_KEY)
+            if _clean(legacy):
+                cart.merge(legacy)
+        request._cached_cart = cart
+    return request._cached_cart
+
+
+class CartMiddleware:
+    """Sets a lazy ``request.cart`` and writes the guest cart cookie back when it changed"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.cart = SimpleLazyObject(lambda: get_cart(request))
+        response = self.get_response(request)
+        cart = getattr(request, '_cached_cart', None)
+        if cart is not None:
+            cart.update_response(response)
+        if COOKIE_NAME in request.COOKIES and request.user.is_authenticated:
+            # Merged into the account when they logged in
+            response.delete_cookie(COOKIE_NAME, samesite='Lax')
+        return response
+
+
+def merge_guest_cart(sender, request, user, **kwargs):
+    """Move the guest cart into the account that just logged in"""
+    if request is None:
+        return
+    guest = CookieCart(request)
+    if guest.data:
+        DatabaseCart(user).merge(guest.data)
+    # Whatever the request does next, it does with the account's cart
+    request._cached_cart = DatabaseCart(user)
+    request.cart = SimpleLazyObject(lambda: get_cart(request))
+
+
+def connect_cart_signals():
+    user_logged_in.connect(merge_guest_cart, dispatch_uid='cart_merge_guest_cart')
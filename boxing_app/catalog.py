@@ -0,0 +1,167 @@
+"""
+Catalog paging shared by the shop page and the JSON catalog API.
+
+Pages are keyset-paginated on the sort key plus ``id`` as a tie-breaker, so
+fetching page N costs the same as page 1 and never needs OFFSET. Rows come
+from ``.values()`` and are serialized without building model instances.
+Relevance-ordered search results have no stable key to seek on and page
+by offset instead (they are already narrowed down by the search index).
+"""
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+
+from . import images
+from .models import ShopItem
+from .search import search_products, search_terms
+
+
+SORT_OPTIONS = {
+    'price_low_high': 'price',
+    'price_high_low': '-price',
+    'name_a_z': 'name',
+    'name_z_a': '-name',
+}
+DEFAULT_SORT = 'order'
+RELEVANCE = 'relevance'
+
+# Public field name -> model field
+FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'price': 'price',
+    'category': 'category',
+    'image_url': 'image',
+    'image_srcset': 'image_variants',
+    'description': 'description',
+    'in_stock': 'in_stock',
+}
+DEFAULT_FIELDS = ['id', 'name', 'price', 'category', 'image_url', 'image_srcset', 'in_stock']
+
+CURSOR_SALT = 'boxing_app.catalog.cursor'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def page_size(requested=None):
+    default = getattr(settings, 'CATALOG_PAGE_SIZE', 24)
+    maximum = getattr(settings, 'CATALOG_MAX_PAGE_SIZE', 100)
+    try:
+        size = int(requested) if requested else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+def parse_fields(requested):
+    """Validate a comma separated ``fields=`` value; unknown names are ignored"""
+    if not requested:
+        return list(DEFAULT_FIELDS)
+    fields = [name for name in (f.strip() for f in requested.split(',')) if name in FIELDS]
+    return fields or list(DEFAULT_FIELDS)
+
+
+def sort_key(sort, search=''):
+    if sort in SORT_OPTIONS:
+        return SORT_OPTIONS[sort]
+    if search_terms(search):
+        return RELEVANCE
+    return DEFAULT_SORT
+
+
+def filtered_products(category='', search=''):
+    products = ShopItem.objects.filter(is_active=True)
+    if search:
+        products = search_products(products, search)
+    if category:
+        products = products.filter(category=category)
+    return products
+
+
+def encode_cursor(payload):
+    return signing.dumps(payload, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    try:
+        return signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise InvalidCursor(cursor)
+
+
+def _ordering(key):
+    """``key`` plus ``id`` in the same direction, so one index scan gives the order"""
+    return (key, '-id' if key.startswith('-') else 'id')
+
+
+def _seek(queryset, key, cursor):
+    """Restrict ``queryset`` to rows strictly after the cursor position"""
+    field = key.lstrip('-')
+    value = cursor['value']
+    after = '__lt' if key.startswith('-') else '__gt'
+    return queryset.filter(Q(**{field + after: value}) | Q(**{field: value, 'id' + after: cursor['id']}))
+
+
+def get_page(queryset, key, cursor=None, limit=None, fields=None, scope=()):
+    """Return ``(items, next_cursor)`` for one page of ``queryset``.
+
+    With ``fields`` the items are ``.values()`` dicts of the backing model
+    fields; without, they are model instances (for templates).
+    ``next_cursor`` is None on the last page. ``scope`` names the filters
+    behind ``queryset`` (category, search): a cursor only continues the
+    listing with the same sort key and scope it was issued for, anything
+    else is an ``InvalidCursor``.
+    """
+    limit = page_size(limit)
+    scope = list(scope)
+    payload = decode_cursor(cursor) if cursor else None
+    if payload is not None and (
+        not isinstance(payload, dict) or payload.get('key') != key or payload.get('scope') != scope
+    ):
+        raise InvalidCursor(cursor)
+
+    def next_cursor(position):
+        return encode_cursor({'key': key, 'scope': scope, **position})
+
+    if key == RELEVANCE:
+        offset = payload['offset'] if payload else 0
+        if fields:
+            queryset = queryset.values(*{FIELDS[name] for name in fields})
+        items = list(queryset[offset:offset + limit + 1])
+        if len(items) <= limit:
+            return items, None
+        return items[:limit], next_cursor({'offset': offset + limit})
+
+    field = key.lstrip('-')
+    queryset = queryset.order_by(*_ordering(key))
+    if payload:
+        queryset = _seek(queryset, key, payload)
+    if fields:
+        queryset = queryset.values(*({FIELDS[name] for name in fields} | {field, 'id'}))
+    items = list(queryset[:limit + 1])
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    value, last_id = (last[field], last['id']) if fields else (getattr(last, field), last.id)
+    return items, next_cursor({'value': str(value) if field == 'price' else value, 'id': last_id})
+
+
+def serialize(rows, fields):
+    storage = ShopItem._meta.get_field('image').storage
+    data = []
+    for row in rows:
+        item = {}
+        for name in fields:
+            value = row[FIELDS[name]]
+            if name == 'image_url':
+                value = storage.url(value) if value else ''
+            elif name == 'image_srcset':
+                value = images.srcset(value, 'webp') if value else ''
+            elif name == 'price':
+                value = float(value)
+            item[name] = value
+        data.append(item)
+    return data
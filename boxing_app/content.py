@@ -0,0 +1,110 @@
+"""Cached page content shared by the public views (see ``content_cache``)."""
+from . import content_cache
+from .models import (
+    About, Event, GalleryImage, HomePageContent, MembershipPageContent,
+    MembershipPlan, Service, ShopItem, Trainer, TrainingSchedule,
+)
+
+
+@content_cache.register('home', HomePageContent, GalleryImage, Trainer, Event)
+def home_page():
+    home_content, created = HomePageContent.objects.get_or_create(
+        id=1,
+        defaults={
+            'title': "IT'S ALL ABOUT WHAT YOU CAN ACHIEVE",
+            'subtitle': "Empower yourself to make the changes you need to make. Elite boxing training for champions.",
+            'hero_button_1_text': "Start Training",
+            'hero_button_1_link': "/training-schedule",
+            'hero_button_2_text': "Learn More",
+            'hero_button_2_link': "/about",
+        }
+    )
+    return {
+        'home_content': home_content,
+        'gallery_images': list(GalleryImage.objects.filter(is_active=True)),
+        'trainers': list(Trainer.objects.filter(is_active=True)),
+        'events': list(Event.objects.filter(is_active=True)),
+    }
+
+
+@content_cache.register('about', About, Trainer)
+def about_page():
+    try:
+        about_content = About.objects.first()
+        if not about_content:
+            # Create default about content if none exists
+            about_content = About.objects.create(
+                title="About Boxing Academy",
+                description="Welcome to our premier boxing academy...",
+                mission="To train champions and build character...",
+                contact_email="info@boxingacademy.com",
+                contact_phone="+1 (555) 123-4567",
+                address="123 Boxing Street, City, State 12345"
+            )
+    except Exception:
+        # Fallback if there's any issue
+        about_content = None
+
+    return {
+        'about': about_content,
+        'trainers': list(Trainer.objects.filter(is_active=True)),
+    }
+
+
+@content_cache.register('services', Service)
+def services_page():
+    return {'services': list(Service.objects.filter(is_active=True))}
+
+
+@content_cache.register('training_schedule', TrainingSchedule)
+def training_schedule_page():
+    return {'schedule': list(TrainingSchedule.objects.filter(is_active=True))}
+
+
+def _prepare_plan(plan):
+    """Precompute the values the template derives from a plan so they are cached with it"""
+    plan.features_list = plan.get_features_list()
+    plan.duration_text = plan.get_duration_display_text()
+    plan.discount = plan.get_discount_percentage()
+    plan.savings = plan.get_savings_amount()
+    return plan
+
+
+@content_cache.register('membership_plans', MembershipPlan, MembershipPageContent)
+def membership_plans_page():
+    membership_content, created = MembershipPageContent.objects.get_or_create(
+        id=1,
+        defaults={
+            'title': 'CHAMPIONSHIP',
+            'subtitle': 'MEMBERSHIP PLANS',
+            'description': 'Choose the perfect training program to unleash your potential and join our championship legacy',
+            'hot_sale_title': 'HOT SALE - LIMITED TIME OFFER',
+            'hot_sale_description': 'Special discounted plans for a limited time. Don\'t miss this opportunity!'
+        }
+    )
+
+    # One query for every active plan, partitioned in Python
+    plans = [
+        _prepare_plan(plan)
+        for plan in MembershipPlan.objects.filter(is_active=True).order_by('display_order')
+    ]
+    plans_by_type = {plan_type: [] for plan_type, _ in MembershipPlan.PLAN_TYPES}
+    for plan in plans:
+        plans_by_type.setdefault(plan.plan_type, []).append(plan)
+
+    return {
+        'plans': [plan for plan in plans if not plan.is_hot_sale],
+        'hot_sale_plans': [plan for plan in plans if plan.is_hot_sale],
+        'plans_by_type': plans_by_type,
+        'plan_categories': {plan_type: bool(group) for plan_type, group in plans_by_type.items()},
+        'membership_content': membership_content,
+    }
+
+
+@content_cache.register('shop_categories', ShopItem)
+def shop_categories():
+    categories = (
+        ShopItem.objects.filter(is_active=True)
+        .order_by('category').values_list('category', flat=True).distinct()
+    )
+    return {'categories': [(category, category) for category in categories if category]}
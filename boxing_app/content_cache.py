@@ -0,0 +1,137 @@
+"""
+Versioned read-through cache for page content.
+
+Every tracked model has a version counter in the cache. Cached entries are
+keyed on the versions of the models they were built from, so bumping a
+version (done by the post_save/post_delete handlers in ``signals.py``)
+makes every dependent entry unreachable without having to know its key.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+VERSION_KEY = 'content:version:{label}'
+ENTRY_KEY = 'content:entry:{name}:{versions}'
+STATS_KEY = 'content:stats:{stat}'
+
+_registry = {}
+
+
+def _timeout():
+    return getattr(settings, 'CONTENT_CACHE_TIMEOUT', 60 * 60)
+
+
+def _version_key(model):
+    return VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def _initial_version():
+    # Counters start from the clock rather than 1, so a counter lost to a
+    # cache flush never comes back at a value that was already handed out
+    # (process-local copies such as the FAQ matcher compare versions too).
+    return time.time_ns()
+
+
+def get_versions(models):
+    """Return the current version of each model, initialising missing counters"""
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            initial = _initial_version()
+            cache.add(key, initial, None)
+            found[key] = cache.get(key, initial)
+    return [found[key] for key in keys]
+
+
+def bump_version(model):
+    """Invalidate every cached entry built from ``model``"""
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def _record(stat):
+    key = STATS_KEY.format(stat=stat)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_stats():
+    """Hit/miss counters since the last ``reset_stats()``"""
+    keys = {stat: STATS_KEY.format(stat=stat) for stat in ('hits', 'misses')}
+    found = cache.get_many(keys.values())
+    return {stat: found.get(key, 0) for stat, key in keys.items()}
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(stat=stat) for stat in ('hits', 'misses')])
+
+
+def register(name, *models):
+    """Register ``builder`` as the source of the cached entry ``name``.
+
+    ``models`` are the models the builder reads; saving or deleting any of
+    them invalidates the entry.
+    """
+    def decorator(builder):
+        _registry[name] = (builder, models)
+        return builder
+    return decorator
+
+
+def tracked_models():
+    return entry_models(_registry)
+
+
+def entry_models(names):
+    """The models the given entries are built from, without duplicates"""
+    models = []
+    for name in names:
+        for model in _registry[name][1]:
+            if model not in models:
+                models.append(model)
+    return models
+
+
+def _entry_key(name, models):
+    versions = '.'.join(str(version) for version in get_versions(models))
+    return ENTRY_KEY.format(name=name, versions=versions)
+
+
+def _build(name, key):
+    builder, models = _registry[name]
+    value = builder()
+    # Builders may create default rows (get_or_create), which bumps a version
+    # while building; rebuild once so the entry lands under the live key.
+    current_key = _entry_key(name, models)
+    if current_key != key:
+        key, value = current_key, builder()
+    cache.set(key, value, _timeout())
+    return value
+
+
+def get(name):
+    """Return the cached value for ``name``, building it on a miss"""
+    key = _entry_key(name, _registry[name][1])
+    value = cache.get(key)
+    if value is not None:
+        _record('hits')
+        return value
+    _record('misses')
+    return _build(name, key)
+
+
+def warm(names=None):
+    """Build and store the given entries (all registered entries by default)"""
+    names = names or list(_registry)
+    for name in names:
+        _build(name, _entry_key(name, _registry[name][1]))
+    return names
@@ -0,0 +1,9 @@
+from django.utils.functional import SimpleLazyObject
+
+
+def cart_totals(request):
+    """``cart_totals``: the request's ``CartTotals``, worked out only if a template uses it"""
+    cart = getattr(request, 'cart', None)
+    if cart is None:
+        return {}
+    return {'cart_totals': SimpleLazyObject(cart.totals)}
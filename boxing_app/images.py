@@ -0,0 +1,146 @@
+"""
+Responsive derivatives of uploaded photos.
+
+Every upload gets resized copies at the ``IMAGE_WIDTHS`` below its own width
+(plus one at its width, capped at the largest), in AVIF when Pillow can
+write it and in WebP, and a square admin thumbnail. They live next to the
+original under ``<upload dir>/variants/<name>/`` and are described by the
+model's ``image_variants`` field: source name, dimensions, widths and
+formats. Templates build ``srcset``/``width``/``height`` from that field
+alone, without touching storage.
+
+Derivatives are built after the upload commits, in a background thread
+(``IMAGE_DERIVATIVES_BACKGROUND``), or for existing uploads by
+``manage.py build_image_derivatives``. Until then pages use the original.
+"""
+import functools
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+from . import content_cache
+from .models import Event, GalleryImage, ShopItem, Trainer
+
+
+logger = logging.getLogger(__name__)
+
+MODELS = [Trainer, Event, ShopItem, GalleryImage]
+
+SAVE_OPTIONS = {
+    'avif': {'quality': 60, 'speed': 8},
+    'webp': {'quality': 80, 'method': 4},
+}
+THUMBNAIL_FORMAT = 'webp'
+
+_executor = None
+
+
+@functools.cache
+def output_formats():
+    """Formats this Pillow build can write, in the order browsers should prefer them"""
+    Image.init()
+    return [fmt for fmt in SAVE_OPTIONS if fmt.upper() in Image.SAVE]
+
+
+def variant_name(source, label, fmt):
+    directory, filename = posixpath.split(source)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, 'variants', stem, f'{label}.{fmt}')
+
+
+def _save(image, storage, name, fmt):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt.upper(), **SAVE_OPTIONS[fmt])
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def build(source, storage=default_storage):
+    """Write the derivatives of the stored image ``source``; returns its ``image_variants`` metadata"""
+    largest = max(settings.IMAGE_WIDTHS)
+    with storage.open(source) as file:
+        image = Image.open(file)
+        original = image.size
+        # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale, which is most of the work for camera photos
+        image.draft('RGB', (largest, largest))
+        decoded = image.size
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.size != decoded:  # rotated a quarter turn by its EXIF orientation
+        original = original[::-1]
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.getbands() else 'RGB')
+
+    width, height = image.size
+    widths = sorted({w for w in settings.IMAGE_WIDTHS if w < width} | {min(width, largest)})
+    formats = output_formats()
+    for target in widths:
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS, reducing_gap=3.0,
+        )
+        for fmt in formats:
+            _save(resized, storage, variant_name(source, f'{target}w', fmt), fmt)
+
+    size = settings.IMAGE_THUMBNAIL_SIZE
+    _save(ImageOps.fit(image, (size, size), Image.LANCZOS), storage, variant_name(source, 'thumb', THUMBNAIL_FORMAT), THUMBNAIL_FORMAT)
+    return {'source': source, 'width': original[0], 'height': original[1], 'widths': widths, 'formats': formats}
+
+
+def current(instance):
+    """``instance.image_variants`` if it describes the current image, else None"""
+    meta = instance.image_variants
+    if instance.image and meta and meta.get('source') == instance.image.name:
+        return meta
+    return None
+
+
+def srcset(meta, fmt):
+    return ', '.join(
+        f"{default_storage.url(variant_name(meta['source'], f'{width}w', fmt))} {width}w" for width in meta['widths']
+    )
+
+
+def thumbnail_url(meta):
+    return default_storage.url(variant_name(meta['source'], 'thumb', THUMBNAIL_FORMAT))
+
+
+def process(model, pk, force=False):
+    """Build and record the derivatives of one row's image; returns whether anything was built"""
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not instance.image or (current(instance) and not force):
+        return False
+    source = instance.image.name
+    meta = build(source)
+    # update() skips the post_save handlers (no re-queue); skip it if the image was replaced meanwhile
+    if model.objects.filter(pk=pk, image=source).update(image_variants=meta):
+        content_cache.bump_version(model)
+    return True
+
+
+def _process_in_background(model, pk):
+    try:
+        process(model, pk)
+    except Exception:
+        logger.exception("Could not build image derivatives for %s %s", model._meta.label, pk)
+    finally:
+        # This thread's connection is never closed by the request cycle
+        connection.close()
+
+
+def schedule(model, pk):
+    """Build the derivatives once the current transaction commits"""
+    global _executor
+    if not settings.IMAGE_DERIVATIVES_BACKGROUND:
+        transaction.on_commit(lambda: process(model, pk))
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-derivatives')
+    transaction.on_commit(lambda: _executor.submit(_process_in_background, model, pk))
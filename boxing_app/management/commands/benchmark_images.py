@@ -0,0 +1,71 @@
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+
+from boxing_app import images
+
+
+EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.avif'}
+
+
+def slot_width(meta, slot):
+    """The width a browser picks from the srcset for a ``slot``-px wide box"""
+    return next((width for width in meta['widths'] if width >= slot), meta['widths'][-1])
+
+
+class Command(BaseCommand):
+    help = (
+        "Build derivatives for a folder of sample images (in a temporary directory) and compare "
+        "bytes sent for a page slot and an admin thumbnail against the originals"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=settings.BASE_DIR / 'boxing_app' / 'static' / 'images')
+        parser.add_argument('--slot', type=int, default=640,
+                            help="Rendered width in device px of the image on the page (e.g. 2x a 320px card)")
+
+    def handle(self, *args, **options):
+        sources = sorted(p for p in Path(options['source']).iterdir() if p.suffix.lower() in EXTENSIONS)
+        formats = images.output_formats()
+        slot = options['slot']
+        header = ''.join(f"{fmt + ' KB':>10}" for fmt in formats)
+        self.stdout.write(f"{len(sources)} images, {slot}px slot, formats: {', '.join(formats)}\n")
+        self.stdout.write(f"{'image':<36}{'size':>11}{'orig KB':>10}{header}{'thumb KB':>10}{'build ms':>10}")
+
+        totals = {'original': 0, 'thumb': 0, **{fmt: 0 for fmt in formats}}
+        build_time = 0.0
+        with tempfile.TemporaryDirectory() as directory:
+            storage = FileSystemStorage(location=directory)
+            for path in sources:
+                name = storage.save(path.name, path.open('rb'))
+                start = time.perf_counter()
+                meta = images.build(name, storage)
+                elapsed = time.perf_counter() - start
+                build_time += elapsed
+
+                width = slot_width(meta, slot)
+                sizes = {fmt: storage.size(images.variant_name(name, f'{width}w', fmt)) for fmt in formats}
+                sizes['original'] = storage.size(name)
+                sizes['thumb'] = storage.size(images.variant_name(name, 'thumb', images.THUMBNAIL_FORMAT))
+                for key, size in sizes.items():
+                    totals[key] += size
+                columns = ''.join(f"{sizes[fmt] / 1024:>10.0f}" for fmt in formats)
+                self.stdout.write(
+                    f"{path.name[:35]:<36}{meta['width']:>5}x{meta['height']:<5}{sizes['original'] / 1024:>10.0f}"
+                    f"{columns}{sizes['thumb'] / 1024:>10.1f}{elapsed * 1000:>10.0f}"
+                )
+
+        original = totals['original']
+        self.stdout.write(f"\npage weight for these images at a {slot}px slot:")
+        self.stdout.write(f"  originals  {original / 1024 ** 2:8.2f} MB")
+        for fmt in formats:
+            self.stdout.write(f"  {fmt:<10} {totals[fmt] / 1024 ** 2:8.2f} MB  (-{1 - totals[fmt] / original:.0%})")
+        self.stdout.write(
+            f"admin changelist previews: {original / 1024 ** 2:.2f} MB of originals -> "
+            f"{totals['thumb'] / 1024:.0f} KB of thumbnails (-{1 - totals['thumb'] / original:.1%})"
+        )
+        self.stdout.write(f"build time: {build_time / len(sources) * 1000:.0f} ms per image on average")
@@ -0,0 +1,99 @@
+import gzip
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import TemplateDoesNotExist
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from boxing_app.storage import MINIFIERS
+
+from .prerender import page_sources
+
+
+STYLESHEET = re.compile(r'<link rel="stylesheet" href="([^"]+)">')
+SCRIPT = re.compile(r'<script src="([^"]+)"></script>')
+PRELOAD = re.compile(r'\s*<link rel="preload" href="[^"]+" as="\w+">')
+
+
+def gzipped(data):
+    return len(gzip.compress(data, 6))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the HTML of every public page with its stylesheets and scripts inline (as the templates had "
+        "them) against the HTML that links the minified bundles, which browsers download once and cache"
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            client = Client()
+            responses = {}
+            for name in page_sources():
+                try:
+                    responses[name] = client.get(reverse(name))
+                except TemplateDoesNotExist as e:
+                    responses[name] = f"missing template {e}"
+            transaction.set_rollback(True)
+
+        bundles = {}
+        self.stdout.write(f"{'page':<20}{'inline KB':>10}{'linked KB':>10}{'saved':>7}"
+                          f"{'gz inline':>11}{'gz linked':>11}{'bundles':>9}")
+        totals = {'pages': 0, 'inline': 0, 'linked': 0}
+        for name, response in responses.items():
+            if isinstance(response, str) or response.status_code != 200:
+                self.stdout.write(f"{name:<20}  {response if isinstance(response, str) else f'status {response.status_code}'}")
+                continue
+            html = response.content.decode()
+            inline, used = self.inline(html, bundles)
+            linked = html.encode()
+            totals['pages'] += 1
+            totals['inline'] += gzipped(inline)
+            totals['linked'] += gzipped(linked)
+            self.stdout.write(
+                f"{name:<20}{len(inline) / 1024:>10.1f}{len(linked) / 1024:>10.1f}{1 - len(linked) / len(inline):>7.0%}"
+                f"{gzipped(inline) / 1024:>11.1f}{gzipped(linked) / 1024:>11.1f}{len(used):>9}"
+            )
+
+        self.stdout.write("\nbundles (minified, gzipped), fetched once and then cached:")
+        for path, (source, minified) in sorted(bundles.items()):
+            self.stdout.write(f"  {path:<36}{len(source) / 1024:>8.1f} KB -> {len(minified) / 1024:>6.1f} KB"
+                              f" -> {gzipped(minified) / 1024:>5.1f} KB")
+        once = sum(gzipped(minified) for _, minified in bundles.values())
+        self.stdout.write(
+            f"\nvisiting these {totals['pages']} pages, gzipped: {totals['inline'] / 1024:.0f} KB with everything inline, "
+            f"{(totals['linked'] + once) / 1024:.0f} KB linked ({totals['linked'] / 1024:.0f} KB HTML + "
+            f"{once / 1024:.0f} KB bundles)"
+        )
+
+    def inline(self, html, bundles):
+        """``html`` as it was with the bundles' sources in ``<style>``/``<script>`` blocks, and the bundles used"""
+        used = set()
+
+        def source(url):
+            path = url[len(settings.STATIC_URL):]
+            found = finders.find(path)
+            if not url.startswith(settings.STATIC_URL) or not found:
+                return None
+            used.add(path)
+            if path not in bundles:
+                with open(found, 'rb') as file:
+                    text = file.read().decode()
+                bundles[path] = (text.encode(), MINIFIERS[posixpath.splitext(path)[1]](text).encode())
+            return bundles[path][0].decode()
+
+        def style(match):
+            css = source(match.group(1))
+            return match.group(0) if css is None else f'<style>\n{css}</style>'
+
+        def script(match):
+            js = source(match.group(1))
+            return match.group(0) if js is None else f'<script>\n{js}</script>'
+
+        html = SCRIPT.sub(script, STYLESHEET.sub(style, PRELOAD.sub('', html)))
+        return html.encode(), used
@@ -0,0 +1,70 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from boxing_app.models import ShopItem
+from boxing_app.search import backend, icontains_search, search_products
+
+
+CATEGORIES = ['Gloves', 'Equipment', 'Apparel', 'Protection', 'Accessories']
+WORDS = [
+    'leather', 'training', 'sparring', 'heavy', 'speed', 'bag', 'wraps', 'pro',
+    'competition', 'lace', 'velcro', 'padded', 'lightweight', 'durable', 'grip',
+    'shorts', 'headgear', 'mouthguard', 'rope', 'shoes', 'mitts', 'focus',
+    'champion', 'elite', 'youth', 'classic', 'vintage', 'breathable', 'foam',
+]
+SYLLABLES = ['ka', 'to', 'ri', 'mu', 'sen', 'dor', 'vel', 'qua', 'lin', 'bre', 'zo', 'ham']
+QUERIES = ['gloves', 'leather sparring', 'spee', 'headgear padded', 'champion elite mitts', 'nonexistentterm']
+
+
+class Command(BaseCommand):
+    help = "Compare full-text product search with the ICONTAINS path on a synthetic catalog (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # Filler vocabulary so descriptions look like real text rather than
+        # the same 30 words repeated (which would make every query match
+        # most of the catalog).
+        self.filler = [''.join(rng.choices(SYLLABLES, k=3)) for _ in range(5000)]
+        with transaction.atomic():
+            self.populate(options['items'], rng)
+            base = ShopItem.objects.filter(is_active=True)
+            self.stdout.write(f"{options['items']} items, search backend: {backend(base)}\n")
+            self.stdout.write(f"{'query':<24}{'icontains ms':>14}{'search ms':>12}{'hits':>8}")
+            for query in QUERIES:
+                slow, _ = self.time(lambda: list(icontains_search(base, query)[:50]), options['repeat'])
+                fast, fast_hits = self.time(lambda: list(search_products(base, query)[:50]), options['repeat'])
+                self.stdout.write(f"{query:<24}{slow:>14.2f}{fast:>12.2f}{fast_hits:>8}")
+            transaction.set_rollback(True)
+
+    def populate(self, count, rng):
+        batch = []
+        for i in range(count):
+            category = rng.choice(CATEGORIES)
+            words = rng.sample(WORDS, 3)
+            batch.append(ShopItem(
+                name=f"{' '.join(words[:2]).title()} {category} {i}",
+                price=Decimal(rng.randint(500, 20000)) / 100,
+                description=' '.join(rng.choices(self.filler, k=23) + rng.sample(WORDS, 2)),
+                category=category,
+                order=i,
+            ))
+            if len(batch) == 5000:
+                ShopItem.objects.bulk_create(batch)
+                batch = []
+        ShopItem.objects.bulk_create(batch)
+
+    def time(self, run, repeat):
+        run()  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            hits = len(run())
+        return (time.perf_counter() - start) * 1000 / repeat, hits
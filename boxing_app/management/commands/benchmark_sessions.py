@@ -0,0 +1,69 @@
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from boxing_app.models import ShopItem
+
+
+ENGINES = ['db', 'cached_db', 'cache', 'signed_cookies']
+
+# Run in this order, so decrease never empties the cart
+ENDPOINTS = ['get_cart_count', 'add_to_cart', 'increase_quantity', 'decrease_quantity']
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests per second and django_session queries per request for the cart endpoints with each "
+        "session backend (benchmark rows rolled back afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help="Timed requests per endpoint and backend")
+        parser.add_argument('--anonymous', action='store_true', help="Use the guest (cookie) cart instead of a member's")
+
+    def handle(self, *args, **options):
+        results = {}
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            product = ShopItem.objects.filter(is_active=True).first() or ShopItem.objects.create(
+                name='Benchmark gloves', price=Decimal('10.00'),
+            )
+            user = User.objects.create_user('benchmark_sessions', password=None)
+            for engine in ENGINES:
+                with override_settings(SESSION_ENGINE=f'django.contrib.sessions.backends.{engine}'):
+                    client = Client()
+                    if not options['anonymous']:
+                        client.force_login(user)
+                    for name in ENDPOINTS:
+                        results[engine, name] = self.run(client, name, product.id, options['requests'])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'guest' if options['anonymous'] else 'member'}, {options['requests']} requests "
+                          f"per endpoint; req/s and django_session queries per request\n")
+        self.stdout.write(f"{'endpoint':<20}" + ''.join(f"{engine:>22}" for engine in ENGINES))
+        for name in ENDPOINTS:
+            cells = ''.join(
+                f"{results[engine, name][0]:>14.0f}{results[engine, name][1]:>8.2f}" for engine in ENGINES
+            )
+            self.stdout.write(f"{name:<20}{cells}")
+
+    def run(self, client, name, product_id, requests):
+        """``(requests per second, session queries per request)``"""
+        url = reverse(name) if name == 'get_cart_count' else reverse(name, args=[product_id])
+        client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        client.cookies.pop('messages', None)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+                # A browser shows the flash messages on the next page; don't let them pile up
+                client.cookies.pop('messages', None)
+            elapsed = time.perf_counter() - start
+        session_queries = sum('django_session' in query['sql'] for query in queries.captured_queries)
+        return requests / elapsed, session_queries / requests
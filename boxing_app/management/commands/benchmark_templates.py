@@ -0,0 +1,123 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import TemplateDoesNotExist
+from django.test import Client, override_settings
+from django.urls import URLPattern, reverse
+
+from boxing_app import urls
+from boxing_app.models import CartItem, MembershipPlan, ShopItem
+
+
+PLAIN_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+CACHED_LOADERS = [('django.template.loaders.cached.Loader', PLAIN_LOADERS)]
+
+# Timing these would change the benchmark user's cart or session
+STATE_CHANGING = {
+    'logout', 'add_to_cart', 'remove_from_cart', 'increase_quantity', 'decrease_quantity', 'clear_cart',
+}
+
+
+def template_settings(loaders):
+    engine = {**settings.TEMPLATES[0], 'APP_DIRS': False}
+    engine['OPTIONS'] = {**engine['OPTIONS'], 'loaders': loaders, 'debug': False}
+    return [engine]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every page in boxing_app/urls.py with the plain template loaders and nothing cached, "
+        "then with the cached loader, layout fragments and (for guests) whole-page caching "
+        "(benchmark user rolled back afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help="Timed requests per page and mode")
+        parser.add_argument('--anonymous', action='store_true', help="Browse as a guest instead of a member")
+
+    def handle(self, *args, **options):
+        modes = [
+            ('before', template_settings(PLAIN_LOADERS),
+             {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}),
+            ('after', template_settings(CACHED_LOADERS),
+             {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-fragments'}),
+        ]
+        with transaction.atomic():
+            client = self.client(options['anonymous'])
+            pages, skipped = self.pages()
+            results = {}
+            # Modes alternate page by page so drift (other load, CPU clock) hits both alike
+            for name, url in pages:
+                for mode, templates, fragment_cache in modes:
+                    with override_settings(
+                        DEBUG=False, TEMPLATES=templates, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                        CACHES={**settings.CACHES, 'template_fragments': fragment_cache},
+                    ):
+                        results[name, mode] = self.time(client, url, options['requests'])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'anonymous' if options['anonymous'] else 'member with a cart'}, "
+                          f"{options['requests']} requests per page, median ms\n")
+        self.stdout.write(f"{'page':<20}{'url':<28}{'status':>7}{'before':>9}{'after':>9}{'saved':>8}")
+        for name, url in pages:
+            before, after = results[name, 'before'], results[name, 'after']
+            if isinstance(before, str):
+                self.stdout.write(f"{name:<20}{url:<28}  {before}")
+                continue
+            (status, slow), (_, fast) = before, after
+            self.stdout.write(f"{name:<20}{url:<28}{status:>7}{slow:>9.2f}{fast:>9.2f}{1 - fast / slow:>8.0%}")
+        for name, reason in skipped:
+            self.stdout.write(f"{name:<20}skipped: {reason}")
+
+    def client(self, anonymous):
+        client = Client()
+        if anonymous:
+            return client
+        user = User.objects.create_user('benchmark_templates', password=None)
+        client.force_login(user)
+        product = ShopItem.objects.filter(is_active=True).first()
+        if product:
+            CartItem.objects.create(user=user, item=product, quantity=2)
+        return client
+
+    def pages(self):
+        """``(name, url)`` for every named route that can be fetched without side effects"""
+        args = {
+            'product_detail': ShopItem.objects.filter(is_active=True).values_list('id', flat=True).first(),
+            'membership_detail': MembershipPlan.objects.filter(is_active=True).values_list('name', flat=True).first(),
+        }
+        pages, skipped = [], []
+        for pattern in urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            name = pattern.name
+            if name in STATE_CHANGING:
+                skipped.append((name, "changes the session"))
+            elif pattern.pattern.converters:
+                if args.get(name) is None:
+                    skipped.append((name, "no row to show"))
+                else:
+                    pages.append((name, reverse(name, args=[args[name]])))
+            else:
+                pages.append((name, reverse(name)))
+        return pages, skipped
+
+    def time(self, client, url, requests):
+        """``(status, median ms)`` for ``url``, or a reason it could not be rendered"""
+        try:
+            client.get(url)  # parse/fill caches before timing
+        except TemplateDoesNotExist as e:
+            return f"missing template {e}"
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return response.status_code, statistics.median(latencies)
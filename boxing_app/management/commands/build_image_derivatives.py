@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from boxing_app import images
+
+
+class Command(BaseCommand):
+    help = "Build the resized WebP/AVIF copies and admin thumbnails of uploaded images that don't have them yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Rebuild images that already have derivatives")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"output formats: {', '.join(images.output_formats())}")
+        for model in images.MODELS:
+            built = failed = 0
+            start = time.perf_counter()
+            for pk in model.objects.exclude(image='').exclude(image=None).values_list('pk', flat=True):
+                try:
+                    built += images.process(model, pk, force=options['force'])
+                except OSError as e:
+                    failed += 1
+                    self.stderr.write(f"{model._meta.label} {pk}: {e}")
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {built} built, {failed} failed "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
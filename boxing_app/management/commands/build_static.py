@@ -0,0 +1,90 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from boxing_app import images
+from boxing_app.storage import OPTIMIZED_EXTENSIONS, modern_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Run collectstatic with the production storage (optimized images, AVIF/WebP copies, critical CSS, "
+        "fingerprints, gzip/brotli) and report the bytes saved per asset"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help="List the assets of other apps (admin, ...) too instead of just their total")
+        parser.add_argument('--ignore', '-i', action='append', default=[], dest='ignore_patterns', metavar='PATTERN',
+                            help="Passed on to collectstatic")
+
+    def handle(self, *args, **options):
+        storages = {
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'boxing_app.storage.OptimizedStaticFilesStorage'},
+        }
+        with override_settings(STORAGES=storages):
+            start = time.perf_counter()
+            call_command('collectstatic', interactive=False, verbosity=0, ignore_patterns=options['ignore_patterns'])
+            self.stdout.write(f"collected into {settings.STATIC_ROOT} in {time.perf_counter() - start:.1f}s\n")
+            self.report(staticfiles_storage, options['all'])
+
+    def sizes(self, storage, name):
+        """The size of each built copy of one manifest entry"""
+        hashed = storage.hashed_files[name]
+        built = {'built': storage.size(hashed)}
+        for suffix in ('gz', 'br'):
+            if storage.exists(f'{hashed}.{suffix}'):
+                built[suffix] = storage.size(f'{hashed}.{suffix}')
+        if Path(name).suffix.lower() in OPTIMIZED_EXTENSIONS:
+            for fmt in images.output_formats():
+                variant = storage.hashed_files.get(modern_name(name, fmt))
+                if variant:
+                    built[fmt] = storage.size(variant)
+        return built
+
+    def report(self, storage, list_all):
+        own = tuple(str(Path(directory).resolve()) for directory in settings.STATICFILES_DIRS)
+        generated = {modern_name(name, fmt) for name in storage.hashed_files for fmt in images.output_formats()
+                     if Path(name).suffix.lower() in OPTIMIZED_EXTENSIONS}
+        columns = ['built', 'avif', 'webp', 'gz', 'br']
+        self.stdout.write(f"{'asset':<48}{'source KB':>10}" + ''.join(f"{c + ' KB':>10}" for c in columns) + f"{'saved':>8}")
+
+        totals = {'source': 0, 'sent': 0}
+        others = {'count': 0, 'source': 0, 'sent': 0}
+        for name in sorted(storage.hashed_files):
+            if name in generated:
+                continue
+            path = finders.find(name)
+            source = Path(path).stat().st_size if path else None
+            built = self.sizes(storage, name)
+            # What a current browser downloads: the smallest copy it is offered
+            sent = min(built.values())
+            baseline = source if source is not None else built['built']
+            totals['source'] += baseline
+            totals['sent'] += sent
+            if path and not list_all and not str(Path(path).resolve()).startswith(own):
+                others['count'] += 1
+                others['source'] += baseline
+                others['sent'] += sent
+                continue
+            cells = ''.join(f"{built[c] / 1024:>10.1f}" if c in built else f"{'-':>10}" for c in columns)
+            source_cell = f"{source / 1024:>10.1f}" if source is not None else f"{'(new)':>10}"
+            saved = f"{1 - sent / baseline:>8.0%}" if baseline else f"{'-':>8}"
+            self.stdout.write(f"{name[:47]:<48}{source_cell}{cells}{saved}")
+
+        if others['count']:
+            self.stdout.write(
+                f"{others['count']} files of other apps: {others['source'] / 1024:.0f} KB -> {others['sent'] / 1024:.0f} KB "
+                f"(use --all to list them)"
+            )
+        self.stdout.write(
+            f"\ntotal: {totals['source'] / 1024 ** 2:.2f} MB of sources -> {totals['sent'] / 1024 ** 2:.2f} MB sent "
+            f"(-{1 - totals['sent'] / max(totals['source'], 1):.0%})"
+        )
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.template import TemplateDoesNotExist
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from boxing_app import content_cache
+from boxing_app.models import About, MembershipPlan, ShopItem
+
+
+STATE_FILE = '.prerender.json'
+
+
+def rows_signature(querysets):
+    """Digest of every row in ``querysets``; changes with any insert, update or delete"""
+    digest = hashlib.sha256()
+    for queryset in querysets:
+        digest.update(queryset.model._meta.label_lower.encode())
+        for row in queryset.order_by('pk').values_list().iterator():
+            digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+def files_signature(*roots):
+    digest = hashlib.sha256()
+    for root in roots:
+        for path in sorted(Path(root).rglob('*')):
+            if path.is_file():
+                digest.update(str(path.relative_to(root)).encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def mark_prerendered(html):
+    """Flag the page for js/script.js, which then swaps in the visitor's own navigation"""
+    return html.replace(b'<body ', b'<body data-prerendered ', 1)
+
+
+def page_sources():
+    """Route name -> models the page shows, for every public page without URL arguments"""
+    def entries(*names):
+        return content_cache.entry_models(names)
+
+    return {
+        'home': entries('home'),
+        'about': entries('about'),
+        'contact': [About],
+        'services': entries('services'),
+        'facilities': [],
+        'training_schedule': entries('training_schedule'),
+        'bmi_calculator': [],
+        'membership_plans': entries('membership_plans'),
+        'shop': [ShopItem],
+        'testimonials': [],
+        'motivational': [],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every public page to static HTML for a CDN, with fingerprinted static files. "
+        "Pages whose source rows, templates and assets are unchanged since the last run are kept as they are."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.PRERENDER_DIR)
+        parser.add_argument('--force', action='store_true', help="Re-render every page")
+
+    def handle(self, *args, **options):
+        output = Path(options['output']).resolve()
+        static_root = output / settings.STATIC_URL.strip('/')
+        storages = {
+            **settings.STORAGES,
+            'staticfiles': {
+                'BACKEND': 'boxing_app.storage.OptimizedStaticFilesStorage',
+                'OPTIONS': {'location': str(static_root), 'base_url': settings.STATIC_URL},
+            },
+        }
+        with override_settings(
+            DEBUG=False, STORAGES=storages, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0, ignore_patterns=['admin'])
+            self.copy_media(output / settings.MEDIA_URL.strip('/'))
+            self.render(output, static_root, options['force'])
+
+    def pages(self):
+        """``(url, sources signature)`` for every page to export"""
+        for name, models in page_sources().items():
+            yield reverse(name), rows_signature([model.objects.all() for model in models])
+
+        # A product page also lists the other products of its category
+        categories = {}
+        for product_id, category in ShopItem.objects.filter(is_active=True).values_list('id', 'category'):
+            if category not in categories:
+                categories[category] = rows_signature([ShopItem.objects.filter(category=category)])
+            yield reverse('product_detail', args=[product_id]), categories[category]
+
+        for plan in MembershipPlan.objects.filter(is_active=True).values_list('pk', 'name'):
+            yield reverse('membership_detail', args=[plan[1]]), rows_signature([MembershipPlan.objects.filter(pk=plan[0])])
+
+    def render(self, output, static_root, force):
+        state_path = output / STATE_FILE
+        state = json.loads(state_path.read_text()) if state_path.exists() and not force else {}
+        # Templates and asset fingerprints are part of every page
+        layout = files_signature(*settings.TEMPLATES[0]['DIRS'], static_root / 'staticfiles.json')
+        pages = state.get('pages', {}) if state.get('layout') == layout else {}
+
+        client = Client()
+        exported, rendered, skipped = {}, 0, []
+        for url, sources in self.pages():
+            path = output / unquote(url).lstrip('/') / 'index.html'
+            if pages.get(url) == sources and path.exists():
+                exported[url] = sources
+                continue
+            try:
+                response = client.get(url, secure=True)
+            except TemplateDoesNotExist as e:
+                skipped.append((url, f"missing template {e}"))
+                continue
+            if response.status_code != 200:
+                skipped.append((url, f"status {response.status_code}"))
+                continue
+            if settings.CSRF_COOKIE_NAME in response.cookies:
+                skipped.append((url, "uses a CSRF token, left to the app server"))
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(mark_prerendered(response.content))
+            exported[url] = sources
+            rendered += 1
+
+        # Views may create their default rows on first render; record the rows as they are now
+        current = dict(self.pages())
+        exported = {url: current[url] for url in exported}
+
+        removed = 0
+        for url in set(pages) - set(exported):
+            (output / unquote(url).lstrip('/') / 'index.html').unlink(missing_ok=True)
+            removed += 1
+
+        state_path.write_text(json.dumps({'layout': layout, 'pages': exported}, indent=2, sort_keys=True))
+        self.stdout.write(
+            f"{output}: {rendered} rendered, {len(exported) - rendered} unchanged, {removed} removed"
+        )
+        for url, reason in skipped:
+            self.stdout.write(f"  skipped {url}: {reason}")
+
+    def copy_media(self, media_output):
+        """Copy uploads that are new or changed since the last run"""
+        media_root = Path(settings.MEDIA_ROOT)
+        if not media_root.is_dir():
+            return
+        for source in media_root.rglob('*'):
+            if not source.is_file():
+                continue
+            target = media_output / source.relative_to(media_root)
+            stat = source.stat()
+            if target.exists() and (target.stat().st_size, target.stat().st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
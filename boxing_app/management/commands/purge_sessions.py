@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+DB_ENGINES = {'django.contrib.sessions.backends.db', 'django.contrib.sessions.backends.cached_db'}
+
+
+def purge_expired(batch_size, pause=0.0):
+    """Delete expired session rows ``batch_size`` at a time; returns how many went.
+
+    Unlike ``clearsessions`` (one DELETE over the whole table) each batch is a
+    short statement of its own, so logins and other session writes are not
+    held up behind a long lock.
+    """
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=timezone.now()).values_list('session_key', flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        if len(keys) < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions from the database in small batches (run it from a scheduler, or keep it running with --every)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.1, help="Seconds to wait between batches")
+        parser.add_argument('--every', type=float, help="Keep running and purge every this many seconds")
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE not in DB_ENGINES:
+            self.stdout.write(f"{settings.SESSION_ENGINE} does not keep sessions in the database; nothing to purge")
+            return
+        while True:
+            start = time.perf_counter()
+            deleted = purge_expired(options['batch_size'], options['pause'])
+            self.stdout.write(f"{deleted} expired sessions deleted in {time.perf_counter() - start:.1f}s")
+            if not options['every']:
+                return
+            time.sleep(options['every'])
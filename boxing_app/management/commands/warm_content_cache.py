@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from boxing_app import content, content_cache
+
+
+class Command(BaseCommand):
+    help = "Prebuild the cached page content so the first visitors after a deploy get warm hits"
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help="Entries to warm (default: all)")
+        parser.add_argument('--reset-stats', action='store_true', help="Reset the hit/miss counters")
+
+    def handle(self, *args, **options):
+        warmed = content_cache.warm(options['names'] or None)
+        if options['reset_stats']:
+            content_cache.reset_stats()
+        for name in warmed:
+            self.stdout.write(f"warmed {name}")
+        stats = content_cache.get_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(warmed)} entries warmed (hits={stats['hits']}, misses={stats['misses']})"
+        ))
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boxing_app', '0010_shopitem_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='event_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', 'name'], name='gallery_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membershipplan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', 'name'], name='plan_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membershipplan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['plan_type', 'display_order'], name='plan_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membershipplan',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_hot_sale', True)), fields=['display_order', 'name'], name='plan_active_hot_sale_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='navbaritem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='navbaritem_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='service_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='shopitem_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'price'], name='shopitem_active_cat_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['price'], name='shopitem_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='shopitem_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trainer',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='trainer_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trainingschedule',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='schedule_active_order_idx'),
+        ),
+    ]
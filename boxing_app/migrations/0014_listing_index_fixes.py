@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boxing_app', '0013_cartitem_user'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='membershipplan',
+            name='plan_active_type_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='membershipplan',
+            name='plan_active_hot_sale_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='shopitem',
+            name='shopitem_active_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='shopitem',
+            name='shopitem_active_cat_price_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='shopitem',
+            name='shopitem_active_price_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='shopitem',
+            name='shopitem_active_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='shopitem_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['price', 'id'], name='shopitem_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name', 'id'], name='shopitem_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'order', 'id'], name='shopitem_active_cat_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'price', 'id'], name='shopitem_active_cat_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shopitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'name', 'id'], name='shopitem_active_cat_name_idx'),
+        ),
+    ]
@@ -1,6 +1,12 @@
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+# Public listings only ever read active rows, so their indexes are partial on
+# this condition (SQLite cannot use a plain (is_active, ...) index for the
+# bare ``WHERE "is_active"`` Django generates).
+ACTIVE = models.Q(is_active=True)
+
 class NavbarItem(models.Model):
     name = models.CharField(max_length=100)
     link = models.CharField(max_length=200)
@@ -9,6 +15,9 @@ class NavbarItem(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], condition=ACTIVE, name='navbaritem_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -22,6 +31,9 @@ class Service(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], condition=ACTIVE, name='service_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -48,12 +60,16 @@ class Trainer(models.Model):
     role = models.CharField(max_length=100)
     bio = models.TextField(blank=True)
     image = models.ImageField(upload_to='trainers/', blank=True, null=True)
+    image_variants = models.JSONField(null=True, blank=True, editable=False)
     experience = models.CharField(max_length=100, blank=True)
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], condition=ACTIVE, name='trainer_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -65,11 +81,15 @@ class Event(models.Model):
     location = models.CharField(max_length=200, blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     image = models.ImageField(upload_to='events/', blank=True, null=True)
+    image_variants = models.JSONField(null=True, blank=True, editable=False)
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], condition=ACTIVE, name='event_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -79,6 +99,7 @@ class ShopItem(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     description = models.TextField(blank=True)
     image = models.ImageField(upload_to='shop/', blank=True, null=True)
+    image_variants = models.JSONField(null=True, blank=True, editable=False)
     category = models.CharField(max_length=100, blank=True)
     in_stock = models.BooleanField(default=True)
     order = models.IntegerField(default=0)
@@ -86,6 +107,15 @@ class ShopItem(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            # One per catalog sort, with and without a category; ``id`` is the keyset tie-breaker (catalog.get_page)
+            models.Index(fields=['order', 'id'], condition=ACTIVE, name='shopitem_active_order_idx'),
+            models.Index(fields=['price', 'id'], condition=ACTIVE, name='shopitem_active_price_idx'),
+            models.Index(fields=['name', 'id'], condition=ACTIVE, name='shopitem_active_name_idx'),
+            models.Index(fields=['category', 'order', 'id'], condition=ACTIVE, name='shopitem_active_cat_order_idx'),
+            models.Index(fields=['category', 'price', 'id'], condition=ACTIVE, name='shopitem_active_cat_price_idx'),
+            models.Index(fields=['category', 'name', 'id'], condition=ACTIVE, name='shopitem_active_cat_name_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -124,6 +154,9 @@ class TrainingSchedule(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], condition=ACTIVE, name='schedule_active_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.day} - {self.class_name}"
@@ -136,10 +169,18 @@ class BMICalculator(models.Model):
         return self.title
 
 class CartItem(models.Model):
+    """One line of a logged-in user's cart (guests keep theirs in a signed cookie, see cart.py)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, related_name='cart_items')
     item = models.ForeignKey(ShopItem, on_delete=models.CASCADE)
     quantity = models.IntegerField(default=1)
     added_date = models.DateTimeField(auto_now_add=True)
-    
+
+    class Meta:
+        constraints = [
+            # Parallel add-to-cart requests must end up on one line
+            models.UniqueConstraint(fields=['user', 'item'], name='unique_cart_line'),
+        ]
+
     def __str__(self):
         return f"{self.quantity} x {self.item.name}"
     
@@ -150,6 +191,7 @@ class CartItem(models.Model):
 class GalleryImage(models.Model):
     name = models.CharField(max_length=100)
     image = models.ImageField(upload_to='gallery/')
+    image_variants = models.JSONField(null=True, blank=True, editable=False)
     caption = models.TextField(blank=True)
     category = models.CharField(max_length=50, choices=[
         ('training', 'Training'),
@@ -162,6 +204,9 @@ class GalleryImage(models.Model):
     
     class Meta:
         ordering = ['display_order', 'name']
+        indexes = [
+            models.Index(fields=['display_order', 'name'], condition=ACTIVE, name='gallery_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -210,6 +255,9 @@ class MembershipPlan(models.Model):
     
     class Meta:
         ordering = ['display_order', 'name']
+        indexes = [
+            models.Index(fields=['display_order', 'name'], condition=ACTIVE, name='plan_active_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - ${self.price}"
@@ -0,0 +1,75 @@
+"""
+Whole-page cache for pages that look the same to every anonymous visitor.
+
+An anonymous visitor with an empty cart gets exactly the HTML any other such
+visitor would, so the first render is stored in the ``template_fragments``
+cache and replayed to the rest without touching the view, the ORM or the
+template engine. Entries are keyed on the path plus the content cache
+versions of the entries the page is built from, so saving one of those models
+in the admin (which bumps its version) makes the next request render afresh.
+
+Shared responses say ``Cache-Control: public`` with a short max-age, carry an
+ETag (conditional requests get a 304 without a render) and ``Vary: Cookie``
+so a visitor who logs in or fills a cart is not served the anonymous copy.
+Everyone else gets the view's response marked ``private``.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers, set_response_etag,
+)
+
+from . import content_cache
+
+
+PAGE_KEY = 'page:{path}:{versions}'
+
+
+def _is_shared(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and not request.cart.count()
+    )
+
+
+def cache_anonymous_page(*content):
+    """Serve the view from cache to anonymous visitors with an empty cart.
+
+    ``content`` names the ``content_cache`` entries the page renders; the page
+    is invalidated together with them.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _is_shared(request):
+                response = view(request, *args, **kwargs)
+                patch_cache_control(response, private=True, max_age=0)
+                return response
+
+            fragments = caches['template_fragments']
+            models = content_cache.entry_models(content)
+            versions = '.'.join(str(version) for version in content_cache.get_versions(models))
+            key = PAGE_KEY.format(path=request.path, versions=versions)
+            entry = fragments.get(key)
+            if entry is None:
+                response = view(request, *args, **kwargs)
+                # A page holding a CSRF token belongs to the visitor whose cookie it matches
+                if response.status_code != 200 or response.streaming or request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+                    return response
+                set_response_etag(response)
+                entry = (response.content, response['Content-Type'], response['ETag'])
+                fragments.set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+            else:
+                body, content_type, etag = entry
+                response = HttpResponse(body, content_type=content_type)
+                response['ETag'] = etag
+
+            patch_cache_control(response, public=True, max_age=settings.PAGE_CACHE_MAX_AGE)
+            patch_vary_headers(response, ['Cookie'])
+            return get_conditional_response(request, etag=entry[2], response=response)
+        return wrapper
+    return decorator
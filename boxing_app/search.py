@@ -0,0 +1,90 @@
+"""
+Full-text product search.
+
+PostgreSQL uses a generated ``search_vector`` tsvector column with a GIN
+index; SQLite uses an external-content FTS5 table kept in sync by triggers.
+Both are created by migration 0010 and update themselves on every
+insert/update/delete, so nothing has to be reindexed from Python. Other
+backends (or SQLite builds without FTS5) fall back to ICONTAINS matching.
+
+Note that SQLite migrations which rebuild ``boxing_app_shopitem`` (e.g.
+altering a column) drop its triggers; such migrations must recreate them.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+
+FTS_TABLE = 'boxing_app_shopitem_fts'
+
+_fts_tables = {}
+
+
+def search_terms(query):
+    """Split a user query into lowercase word tokens (safe to splice into tsquery/FTS5 syntax)"""
+    return re.findall(r'\w+', query.lower())
+
+
+def _has_fts_table(connection):
+    name = connection.settings_dict['NAME']
+    if name not in _fts_tables:
+        with connection.cursor() as cursor:
+            _fts_tables[name] = FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts_tables[name]
+
+
+def backend(queryset):
+    """Name of the search implementation used for ``queryset``'s database"""
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite' and _has_fts_table(connection):
+        return 'fts5'
+    return 'icontains'
+
+
+def icontains_search(queryset, query):
+    return queryset.filter(
+        Q(name__icontains=query) |
+        Q(description__icontains=query) |
+        Q(category__icontains=query)
+    )
+
+
+def search_products(queryset, query):
+    """Filter ``queryset`` of ShopItems to those matching ``query``, best match first.
+
+    Every term must match (as a prefix, so "glov" finds "gloves"). Matches are
+    annotated with ``search_rank`` where higher is more relevant; name hits
+    outweigh category hits, which outweigh description hits.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    table = queryset.model._meta.db_table
+    implementation = backend(queryset)
+
+    if implementation == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            RawSQL(f'"{table}"."search_vector" @@ to_tsquery(\'english\', %s)', [tsquery], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'ts_rank("{table}"."search_vector", to_tsquery(\'english\', %s))', [tsquery], output_field=FloatField())
+        ).order_by('-search_rank', 'order')
+
+    if implementation == 'fts5':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        # A join (rather than a correlated subquery) lets FTS5 score each
+        # match once; bm25() is lower-is-better, so negate it to sort like
+        # ts_rank.
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = "{table}"."id"', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'-bm25({FTS_TABLE}, 10.0, 1.0, 5.0)'},
+        ).order_by('-search_rank', 'order')
+
+    return icontains_search(queryset, query)
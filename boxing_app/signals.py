@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import content  # noqa: F401 - registers the cached entries
+from . import content_cache, images
+
+
+def invalidate_content(sender, **kwargs):
+    """Bump the content cache version of the saved/deleted model"""
+    content_cache.bump_version(sender)
+
+
+def connect_content_signals():
+    for model in content_cache.tracked_models():
+        post_save.connect(invalidate_content, sender=model, dispatch_uid=f'content_cache_save_{model._meta.label_lower}')
+        post_delete.connect(invalidate_content, sender=model, dispatch_uid=f'content_cache_delete_{model._meta.label_lower}')
+
+
+def reset_image_variants(sender, instance, **kwargs):
+    """Forget the derivatives of a replaced or cleared image"""
+    if instance.image_variants and not images.current(instance):
+        instance.image_variants = None
+
+
+def queue_image_derivatives(sender, instance, raw=False, **kwargs):
+    if not raw and instance.image and not images.current(instance):
+        images.schedule(sender, instance.pk)
+
+
+def connect_image_signals():
+    for model in images.MODELS:
+        label = model._meta.label_lower
+        pre_save.connect(reset_image_variants, sender=model, dispatch_uid=f'image_variants_reset_{label}')
+        post_save.connect(queue_image_derivatives, sender=model, dispatch_uid=f'image_variants_queue_{label}')
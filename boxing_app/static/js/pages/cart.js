@@ -0,0 +1,62 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Animate cart items on scroll
+    gsap.utils.toArray('.card-3d').forEach((card, index) => {
+        gsap.fromTo(card, {
+            y: 60,
+            opacity: 0,
+            rotationX: -10
+        }, {
+            y: 0,
+            opacity: 1,
+            rotationX: 0,
+            duration: 1,
+            delay: index * 0.1,
+            scrollTrigger: {
+                trigger: card,
+                start: "top 80%",
+                end: "bottom 20%",
+                toggleActions: "play none none reverse"
+            }
+        });
+    });
+
+    // Remove button animations
+    gsap.utils.toArray('button').forEach(button => {
+        button.addEventListener('mouseenter', () => {
+            gsap.to(button, {
+                scale: 1.1,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+
+        button.addEventListener('mouseleave', () => {
+            gsap.to(button, {
+                scale: 1,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+    });
+
+    // Cart icon floating animation
+    gsap.to('.fa-shopping-cart', {
+        y: -5,
+        rotation: 5,
+        duration: 2,
+        repeat: -1,
+        yoyo: true,
+        ease: "power1.inOut"
+    });
+
+    // Pulse animation for checkout button
+    if (document.querySelector('.btn-neon')) {
+        gsap.to('.btn-neon', {
+            boxShadow: "0 0 20px rgba(255, 0, 60, 0.4)",
+            duration: 2,
+            repeat: -1,
+            yoyo: true,
+            ease: "power1.inOut"
+        });
+    }
+});
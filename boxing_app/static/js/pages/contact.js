@@ -0,0 +1,12 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Add any contact page specific JavaScript here
+    const form = document.querySelector('form');
+    if (form) {
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+            // Add form submission logic here
+            alert('Thank you for your message! We will get back to you soon.');
+            form.reset();
+        });
+    }
+});
@@ -0,0 +1,180 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize GSAP
+    gsap.registerPlugin(ScrollTrigger, ScrollToPlugin);
+
+    // Enhanced facility card animations with staggered effects
+    gsap.utils.toArray('.facility-detail-card').forEach((card, index) => {
+        const tl = gsap.timeline({
+            scrollTrigger: {
+                trigger: card,
+                start: "top 85%",
+                end: "bottom 20%",
+                toggleActions: "play none none reverse"
+            }
+        });
+
+        tl.fromTo(card, 
+            { 
+                opacity: 0, 
+                y: 100, 
+                scale: 0.9,
+                rotationY: 10 
+            },
+            { 
+                opacity: 1, 
+                y: 0, 
+                scale: 1,
+                rotationY: 0,
+                duration: 1.2,
+                ease: "power3.out",
+                delay: index * 0.3
+            }
+        );
+
+        // Add floating animation to images on hover
+        const image = card.querySelector('img');
+        if (image) {
+            card.addEventListener('mouseenter', () => {
+                gsap.to(image, {
+                    y: -10,
+                    duration: 0.6,
+                    ease: "power2.out"
+                });
+            });
+
+            card.addEventListener('mouseleave', () => {
+                gsap.to(image, {
+                    y: 0,
+                    duration: 0.6,
+                    ease: "power2.out"
+                });
+            });
+        }
+    });
+
+    // Enhanced filter functionality
+    const filterButtons = document.querySelectorAll('.facility-filter-btn');
+    const facilityItems = document.querySelectorAll('.facility-item');
+
+    filterButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            const filter = this.getAttribute('data-filter');
+
+            // Enhanced button animation
+            gsap.to(filterButtons, {
+                scale: 0.95,
+                duration: 0.3,
+                ease: "power2.out",
+                stagger: 0.1
+            });
+
+            // Update active button with enhanced animation
+            filterButtons.forEach(btn => {
+                btn.classList.remove('active');
+                gsap.to(btn, {
+                    scale: 1,
+                    duration: 0.3,
+                    ease: "power2.out"
+                });
+            });
+
+            this.classList.add('active');
+            gsap.to(this, {
+                scale: 1.05,
+                duration: 0.3,
+                ease: "back.out(1.7)"
+            });
+
+            // Enhanced filter animation
+            facilityItems.forEach((item, index) => {
+                if (filter === 'all' || item.classList.contains(filter)) {
+                    gsap.to(item, {
+                        opacity: 1,
+                        scale: 1,
+                        y: 0,
+                        duration: 0.6,
+                        delay: index * 0.1,
+                        ease: "power2.out",
+                        onStart: () => item.classList.remove('hidden')
+                    });
+                } else {
+                    gsap.to(item, {
+                        opacity: 0,
+                        scale: 0.8,
+                        y: 50,
+                        duration: 0.4,
+                        onComplete: () => item.classList.add('hidden')
+                    });
+                }
+            });
+        });
+    });
+
+    // Enhanced URL parameter handling
+    const urlParams = new URLSearchParams(window.location.search);
+    const facility = urlParams.get('facility');
+
+    if (facility) {
+        setTimeout(() => {
+            const targetElement = document.querySelector(`[data-facility="${facility}"]`);
+            if (targetElement) {
+                gsap.to(window, {
+                    duration: 1.5,
+                    scrollTo: {
+                        y: targetElement,
+                        offsetY: 100
+                    },
+                    ease: "power2.inOut"
+                });
+
+                // Enhanced highlight effect
+                const highlightTl = gsap.timeline();
+                highlightTl.fromTo(targetElement,
+                    { 
+                        backgroundColor: 'rgba(178, 31, 31, 0.4)',
+                        scale: 1.02
+                    },
+                    { 
+                        backgroundColor: 'transparent', 
+                        scale: 1,
+                        duration: 2.5,
+                        ease: "power2.out"
+                    }
+                );
+            }
+        }, 1500);
+    }
+
+    // Enhanced button hover animations
+    gsap.utils.toArray('.btn-pro, .btn-pro-outline').forEach(button => {
+        button.addEventListener('mouseenter', () => {
+            gsap.to(button, {
+                scale: 1.05,
+                y: -2,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+
+        button.addEventListener('mouseleave', () => {
+            gsap.to(button, {
+                scale: 1,
+                y: 0,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+    });
+
+    // Add parallax effect to hero section
+    gsap.to('.home-hero', {
+        scrollTrigger: {
+            trigger: '.home-hero',
+            start: 'top top',
+            end: 'bottom top',
+            scrub: true
+        },
+        y: 100,
+        ease: "none"
+    });
+});
@@ -0,0 +1,152 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Register ScrollTrigger
+    gsap.registerPlugin(ScrollTrigger);
+
+    // Hero section animations
+    gsap.to('.hero-title', {
+        opacity: 1,
+        y: 0,
+        duration: 1,
+        ease: "power2.out"
+    });
+
+    gsap.to('.hero-subtitle', {
+        opacity: 1,
+        y: 0,
+        duration: 1,
+        delay: 0.3,
+        ease: "power2.out"
+    });
+
+    gsap.to('.hero-buttons', {
+        opacity: 1,
+        y: 0,
+        duration: 1,
+        delay: 0.6,
+        ease: "power2.out"
+    });
+
+    // Section title animations
+    gsap.utils.toArray('.section-title').forEach(title => {
+        gsap.to(title, {
+            opacity: 1,
+            y: 0,
+            duration: 1,
+            scrollTrigger: {
+                trigger: title,
+                start: "top 80%",
+                end: "bottom 20%",
+                toggleActions: "play none none reverse"
+            }
+        });
+    });
+
+    gsap.utils.toArray('.section-subtitle').forEach(subtitle => {
+        gsap.to(subtitle, {
+            opacity: 1,
+            y: 0,
+            duration: 1,
+            delay: 0.2,
+            scrollTrigger: {
+                trigger: subtitle,
+                start: "top 80%",
+                end: "bottom 20%",
+                toggleActions: "play none none reverse"
+            }
+        });
+    });
+
+    // Card animations - including facility cards
+    gsap.utils.toArray('.gallery-card, .trainer-card, .event-card, .stats-card, .facility-card').forEach((card, index) => {
+        gsap.to(card, {
+            opacity: 1,
+            y: 0,
+            rotationX: 0,
+            duration: 1,
+            delay: index * 0.1,
+            scrollTrigger: {
+                trigger: card,
+                start: "top 85%",
+                end: "bottom 20%",
+                toggleActions: "play none none reverse"
+            }
+        });
+    });
+
+    // Counting animation for stats
+    const counters = document.querySelectorAll('.animate-count');
+    counters.forEach(counter => {
+        const target = parseInt(counter.getAttribute('data-target'));
+        const duration = 2000;
+        const step = target / (duration / 16);
+        let current = 0;
+
+        const updateCount = () => {
+            current += step;
+            if (current < target) {
+                counter.textContent = Math.floor(current);
+                requestAnimationFrame(updateCount);
+            } else {
+                counter.textContent = target;
+            }
+        };
+
+        ScrollTrigger.create({
+            trigger: counter,
+            start: "top 80%",
+            onEnter: updateCount,
+            once: true
+        });
+    });
+
+    // 3D hover effects
+    gsap.utils.toArray('.card-pro').forEach(card => {
+        card.addEventListener('mousemove', (e) => {
+            const rect = card.getBoundingClientRect();
+            const x = e.clientX - rect.left;
+            const y = e.clientY - rect.top;
+
+            const centerX = rect.width / 2;
+            const centerY = rect.height / 2;
+
+            const rotateY = (x - centerX) / 20;
+            const rotateX = (centerY - y) / 20;
+
+            gsap.to(card, {
+                rotationY: rotateY,
+                rotationX: rotateX,
+                transformPerspective: 1000,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+
+        card.addEventListener('mouseleave', () => {
+            gsap.to(card, {
+                rotationY: 0,
+                rotationX: 0,
+                duration: 0.5,
+                ease: "power3.out"
+            });
+        });
+    });
+
+    // Button hover animations
+    gsap.utils.toArray('.btn-pro').forEach(button => {
+        button.addEventListener('mouseenter', () => {
+            gsap.to(button, {
+                scale: 1.05,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+
+        button.addEventListener('mouseleave', () => {
+            gsap.to(button, {
+                scale: 1,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+    });
+});
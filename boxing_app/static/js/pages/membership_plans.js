@@ -0,0 +1,116 @@
+// Initialize animations
+document.addEventListener('DOMContentLoaded', function() {
+    // GSAP animations
+    gsap.registerPlugin(ScrollTrigger);
+
+    // Fade in up animations
+    gsap.utils.toArray('.fade-in-up').forEach(el => {
+        gsap.fromTo(el, {
+            opacity: 0,
+            y: 30
+        }, {
+            opacity: 1,
+            y: 0,
+            duration: 0.8,
+            ease: "power2.out",
+            scrollTrigger: {
+                trigger: el,
+                start: "top 80%",
+                end: "bottom 20%",
+                toggleActions: "play none none reverse"
+            }
+        });
+    });
+
+    // Scale in animations
+    gsap.utils.toArray('.scale-in').forEach(el => {
+        gsap.fromTo(el, {
+            opacity: 0,
+            scale: 0.9
+        }, {
+            opacity: 1,
+            scale: 1,
+            duration: 0.6,
+            ease: "back.out(1.7)"
+        });
+    });
+
+    // Card hover effects
+    gsap.utils.toArray('.glass-card').forEach(card => {
+        card.addEventListener('mouseenter', () => {
+            gsap.to(card, {
+                y: -8,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+
+        card.addEventListener('mouseleave', () => {
+            gsap.to(card, {
+                y: 0,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+    });
+});
+
+// Existing functionality (defensive guards added)
+const planCategory = document.getElementById('planCategory');
+const registrationSection = document.getElementById('registrationSection');
+const selectedPlanName = document.getElementById('selectedPlanName');
+const formPlanName = document.getElementById('formPlanName');
+const registerButtons = document.querySelectorAll('.register-btn');
+
+// Show plans based on selected category
+if (planCategory) {
+    planCategory.addEventListener('change', function() {
+        const selectedCategory = this.value;
+
+        document.querySelectorAll('.plan-category-beginner, .plan-category-pro, .plan-category-elite, .plan-category-custom').forEach(card => {
+            card.classList.add('hidden');
+        });
+
+        if (selectedCategory) {
+            document.querySelectorAll('.plan-category-' + selectedCategory).forEach(card => {
+                card.classList.remove('hidden');
+            });
+        }
+    });
+}
+
+// Registration button click
+if (registerButtons && registerButtons.length) {
+    registerButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            const planName = this.getAttribute('data-plan') || '';
+            if (selectedPlanName) selectedPlanName.textContent = planName;
+            if (formPlanName) formPlanName.textContent = planName;
+            if (registrationSection) registrationSection.classList.remove('hidden');
+
+            // Scroll to registration section
+            if (registrationSection) registrationSection.scrollIntoView({ behavior: 'smooth' });
+        });
+    });
+}
+
+// Form submission
+const registrationForm = document.getElementById('registrationForm');
+if (registrationForm) {
+    registrationForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        // Add success animation
+        gsap.to(this, {
+            scale: 0.95,
+            duration: 0.1,
+            yoyo: true,
+            repeat: 1,
+            onComplete: () => {
+                alert('Thank you for your registration! We will contact you shortly to complete your membership.');
+                this.reset();
+                if (registrationSection) registrationSection.classList.add('hidden');
+            }
+        });
+    });
+}
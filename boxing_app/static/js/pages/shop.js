@@ -0,0 +1,136 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Simple fade-in animation for cards
+    gsap.utils.toArray('.card-pro').forEach((card, index) => {
+        gsap.fromTo(card, {
+            y: 50,
+            opacity: 0
+        }, {
+            y: 0,
+            opacity: 1,
+            duration: 0.8,
+            delay: index * 0.1,
+            scrollTrigger: {
+                trigger: card,
+                start: "top 85%",
+                toggleActions: "play none none reverse"
+            }
+        });
+    });
+
+    // Smooth button hover effects
+    gsap.utils.toArray('.btn-pro').forEach(button => {
+        button.addEventListener('mouseenter', () => {
+            gsap.to(button, {
+                scale: 1.02,
+                duration: 0.2,
+                ease: "power2.out"
+            });
+        });
+
+        button.addEventListener('mouseleave', () => {
+            gsap.to(button, {
+                scale: 1,
+                duration: 0.2,
+                ease: "power2.out"
+            });
+        });
+    });
+
+    // Smooth scrolling for anchor links
+    document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+        anchor.addEventListener('click', function (e) {
+            e.preventDefault();
+            const target = document.querySelector(this.getAttribute('href'));
+            if (target) {
+                target.scrollIntoView({
+                    behavior: 'smooth',
+                    block: 'start'
+                });
+            }
+        });
+    });
+
+    // Catalog paging: filters and "Load More" fetch pages from the catalog API
+    // URLs, token and the current filters come from data-* attributes on the grid
+    const productGrid = document.getElementById('productGrid');
+    const { catalogUrl, addToCartUrl, csrfToken } = productGrid.dataset;
+    const loadMoreWrapper = document.getElementById('loadMoreWrapper');
+    const loadMoreButton = document.getElementById('loadMore');
+    const filterButtons = document.querySelectorAll('#categoryFilters [data-category]');
+    const catalogQuery = {
+        category: productGrid.dataset.category,
+        sort: productGrid.dataset.sort,
+        search: productGrid.dataset.search,
+    };
+
+    function escapeHtml(value) {
+        const div = document.createElement('div');
+        div.textContent = value;
+        return div.innerHTML;
+    }
+
+    function renderProduct(product) {
+        const srcset = product.image_srcset ? ` srcset="${escapeHtml(product.image_srcset)}" sizes="160px"` : '';
+        const image = product.image_url
+            ? `<img src="${escapeHtml(product.image_url)}"${srcset} alt="${escapeHtml(product.name)}" class="w-full h-full object-cover rounded-2xl" loading="lazy">`
+            : '<i class="fas fa-shopping-bag text-gray-400 text-4xl"></i>';
+        const card = document.createElement('div');
+        card.className = 'card-pro group relative overflow-hidden transition-all duration-300 hover:shadow-2xl';
+        card.style.cssText = 'background: linear-gradient(135deg, rgba(30, 30, 30, 0.95) 0%, rgba(50, 50, 50, 0.9) 100%); backdrop-filter: blur(10px); border: 1px solid rgba(220, 38, 38, 0.2);';
+        card.innerHTML = `
+            <div class="card-content p-6 text-center">
+                <div class="w-40 h-40 mx-auto mb-6 rounded-2xl bg-gradient-to-br from-gray-800 to-gray-900 flex items-center justify-center border border-gray-700 relative overflow-hidden">${image}</div>
+                <h3 class="text-xl font-bold text-white mb-4 line-clamp-2">${escapeHtml(product.name)}</h3>
+                <div class="mb-4">
+                    <div class="text-3xl font-bold text-accent-red mb-2">$${product.price.toFixed(2)}</div>
+                    ${product.category ? `<p class="text-gray-400 text-sm uppercase tracking-wide">${escapeHtml(product.category)}</p>` : ''}
+                </div>
+                <form method="POST" action="${addToCartUrl.replace('/0/', `/${product.id}/`)}">
+                    <input type="hidden" name="csrfmiddlewaretoken" value="${csrfToken}">
+                    <button type="submit" class="btn-pro w-full flex items-center justify-center" ${product.in_stock ? '' : 'disabled'}>
+                        ${product.in_stock ? '<i class="fas fa-cart-plus mr-3"></i>Add to Cart' : '<i class="fas fa-ban mr-3"></i>Out of Stock'}
+                    </button>
+                </form>
+            </div>`;
+        return card;
+    }
+
+    async function fetchPage(cursor) {
+        const params = new URLSearchParams({fields: 'id,name,price,category,image_url,image_srcset,in_stock'});
+        Object.entries(catalogQuery).forEach(([key, value]) => { if (value) params.set(key, value); });
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${catalogUrl}?${params}`);
+        if (!response.ok) throw new Error(`Catalog request failed: ${response.status}`);
+        return response.json();
+    }
+
+    function showPage(data, append) {
+        if (!append) productGrid.innerHTML = '';
+        data.products.forEach(product => productGrid.appendChild(renderProduct(product)));
+        loadMoreButton.dataset.cursor = data.next_cursor || '';
+        loadMoreWrapper.classList.toggle('hidden', !data.next_cursor);
+    }
+
+    loadMoreButton.addEventListener('click', async () => {
+        loadMoreButton.disabled = true;
+        try {
+            showPage(await fetchPage(loadMoreButton.dataset.cursor), true);
+        } finally {
+            loadMoreButton.disabled = false;
+        }
+    });
+
+    filterButtons.forEach(button => {
+        button.addEventListener('click', async function() {
+            filterButtons.forEach(btn => {
+                btn.classList.remove('btn-pro');
+                btn.classList.add('btn-pro-outline');
+            });
+            this.classList.remove('btn-pro-outline');
+            this.classList.add('btn-pro');
+
+            catalogQuery.category = this.dataset.category;
+            showPage(await fetchPage(''), false);
+        });
+    });
+});
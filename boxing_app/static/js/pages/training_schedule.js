@@ -0,0 +1,122 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Animate schedule cards on scroll
+    gsap.utils.toArray('.card-pro').forEach((card, index) => {
+        gsap.fromTo(card, {
+            y: 80,
+            opacity: 0,
+            rotationY: -10
+        }, {
+            y: 0,
+            opacity: 1,
+            rotationY: 0,
+            duration: 1,
+            delay: index * 0.1,
+            scrollTrigger: {
+                trigger: card,
+                start: "top 80%",
+                end: "bottom 20%",
+                toggleActions: "play none none reverse"
+            }
+        });
+    });
+
+    // Class level icons floating animation
+    gsap.to('.fa-seedling, .fa-fire, .fa-trophy', {
+        y: -5,
+        rotation: 5,
+        duration: 2,
+        repeat: -1,
+        yoyo: true,
+        ease: "power1.inOut"
+    });
+
+    // Register button hover effects
+    gsap.utils.toArray('button').forEach(button => {
+        button.addEventListener('mouseenter', () => {
+            gsap.to(button, {
+                scale: 1.05,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+
+        button.addEventListener('mouseleave', () => {
+            gsap.to(button, {
+                scale: 1,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+    });
+
+    // Stats counter animation
+    gsap.utils.toArray('.card-pro .text-5xl').forEach(stat => {
+        gsap.fromTo(stat, {
+            scale: 0.5,
+            opacity: 0
+        }, {
+            scale: 1,
+            opacity: 1,
+            duration: 1,
+            delay: 0.5,
+            ease: "back.out(1.7)"
+        });
+    });
+
+    // 3D card hover effects
+    gsap.utils.toArray('.card-pro').forEach(card => {
+        card.addEventListener('mousemove', (e) => {
+            const rect = card.getBoundingClientRect();
+            const x = e.clientX - rect.left;
+            const y = e.clientY - rect.top;
+
+            const centerX = rect.width / 2;
+            const centerY = rect.height / 2;
+
+            const rotateY = (x - centerX) / 20;
+            const rotateX = (centerY - y) / 20;
+
+            gsap.to(card, {
+                rotationY: rotateY,
+                rotationX: rotateX,
+                transformPerspective: 1000,
+                duration: 0.3,
+                ease: "power2.out"
+            });
+        });
+
+        card.addEventListener('mouseleave', () => {
+            gsap.to(card, {
+                rotationY: 0,
+                rotationX: 0,
+                duration: 0.5,
+                ease: "power3.out"
+            });
+        });
+    });
+
+    // Smooth scrolling for anchor links
+    document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+        anchor.addEventListener('click', function (e) {
+            e.preventDefault();
+            const target = document.querySelector(this.getAttribute('href'));
+            if (target) {
+                target.scrollIntoView({
+                    behavior: 'smooth',
+                    block: 'start'
+                });
+            }
+        });
+    });
+
+    // Animated background elements
+    gsap.to('.animate-float', {
+        y: -10,
+        rotation: 2,
+        duration: 3,
+        repeat: -1,
+        yoyo: true,
+        ease: "sine.inOut",
+        stagger: 0.5
+    });
+});
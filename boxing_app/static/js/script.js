@@ -0,0 +1,371 @@
+// Mobile menu functionality
+function bindMobileMenu() {
+    const mobileMenuButton = document.getElementById('mobileMenuButton');
+    const closeMobileMenu = document.getElementById('closeMobileMenu');
+    const mobileMenu = document.getElementById('mobileMenu');
+
+    if (mobileMenuButton && mobileMenu) {
+        mobileMenuButton.addEventListener('click', () => {
+            mobileMenu.classList.add('open');
+            document.body.style.overflow = 'hidden';
+        });
+    }
+
+    if (closeMobileMenu && mobileMenu) {
+        closeMobileMenu.addEventListener('click', () => {
+            mobileMenu.classList.remove('open');
+            document.body.style.overflow = 'auto';
+        });
+    }
+}
+
+bindMobileMenu();
+
+// Pre-rendered pages (manage.py prerender) always carry the logged-out navigation;
+// fetch this visitor's own (member links, cart badge) from the app server
+if ('prerendered' in document.body.dataset && document.body.dataset.navUrl) {
+    fetch(document.body.dataset.navUrl, { credentials: 'same-origin' })
+        .then(response => response.ok ? response.text() : null)
+        .then(html => {
+            const nav = document.querySelector('nav');
+            if (!html || !nav) return;
+            const fresh = document.createRange().createContextualFragment(html).querySelector('nav');
+            if (fresh && fresh.outerHTML !== nav.outerHTML) {
+                nav.replaceWith(fresh);
+                bindMobileMenu();
+            }
+        })
+        .catch(() => {});
+}
+
+// Enhanced scroll effect for navigation
+window.addEventListener('scroll', function() {
+    const nav = document.querySelector('nav');
+    if (nav) {
+        if (window.scrollY > 100) {
+            nav.style.backgroundColor = 'rgba(0, 0, 0, 0.98)';
+            nav.style.backdropFilter = 'blur(10px)';
+        } else {
+            nav.style.backgroundColor = '';
+            nav.style.backdropFilter = '';
+        }
+    }
+});
+
+// Boxing knowledge database
+const boxingKnowledge = {
+    techniques: {
+        "basic boxing stances": "The main boxing stances are: 1) Orthodox (left foot forward for right-handed), 2) Southpaw (right foot forward for left-handed). Keep feet shoulder-width apart, knees slightly bent, hands up protecting your face.",
+        "jab technique": "The jab is your most important punch. Extend your lead hand straight out, rotate fist to land with knuckles, snap it back quickly. Use it to measure distance and set up combinations.",
+        "cross technique": "The cross is a power punch from your rear hand. Rotate your hips and shoulders while extending the arm, pivot back foot for maximum power.",
+        "hook technique": "Hooks are thrown in a circular motion. Keep elbow at 90 degrees, rotate your torso, and pivot your feet. Don't swing wide - keep it tight.",
+        "uppercut technique": "Uppercuts are thrown upward. Bend knees slightly, drop the hand, and drive upward using leg power. Great for close range.",
+        "defensive techniques": "Key defenses: 1) Slip - move head sideways, 2) Bob and weave - duck under punches, 3) Parry - deflect punches with gloves, 4) Block - cover up, 5) Footwork - move out of range"
+    },
+
+    training: {
+        "improve punching power": "To increase punching power: 1) Focus on technique over strength, 2) Do explosive exercises like medicine ball throws, 3) Strengthen core muscles, 4) Practice hip rotation, 5) Use heavy bag with proper form",
+        "boxing footwork drills": "Essential footwork drills: 1) Ladder drills for agility, 2) Shadow boxing with emphasis on movement, 3) Circle drills around a cone, 4) Pivot practice, 5) Skip rope for 15-30 minutes daily",
+        "endurance training": "Build boxing endurance with: 1) Roadwork (running) 3-4 times weekly, 2) High-intensity bag work, 3) Circuit training, 4) Sparring sessions, 5) Interval training on assault bike",
+        "speed training": "Improve hand speed with: 1) Speed bag training, 2) Double-end bag, 3) Shadow boxing with light weights, 4) Focus mitts with a trainer, 5) Reaction drills"
+    },
+
+    equipment: {
+        "essential boxing equipment": "Must-have gear: 1) Hand wraps for wrist support, 2) Boxing gloves (16oz for sparring), 3) Mouthguard, 4) Headgear (for sparring), 5) Groin protector, 6) Quality boxing shoes",
+        "choose boxing gloves": "Select gloves based on use: Bag gloves for training, sparring gloves (16oz+) for partner work, competition gloves for fights. Leather lasts longer than synthetic.",
+        "hand wrapping technique": "Wrap hands properly: Start at wrist, wrap around thumb, through fingers, across knuckles, and secure. Should feel snug but not cutting circulation."
+    },
+
+    rules: {
+        "basic boxing rules": "Main rules: 3-minute rounds with 1-minute rest, 10-point must system, legal punches above belt, no hitting behind head or back, referee stops fight if fighter can't continue",
+        "scoring in boxing": "Fights are scored: 10-9 for round winner, 10-8 for dominant round, 10-7 for very dominant. Judges consider clean punching, effective aggression, ring generalship, and defense",
+        "weight classes": "Main weight classes: Heavyweight (200+ lbs), Light Heavyweight (175 lbs), Middleweight (160 lbs), Welterweight (147 lbs), Lightweight (135 lbs), Featherweight (126 lbs)"
+    },
+
+    nutrition: {
+        "boxing diet": "Boxers need: Lean proteins (chicken, fish), complex carbs (brown rice, oats), healthy fats (avocado, nuts), plenty vegetables. Stay hydrated and time meals around training.",
+        "weight cutting": "Safe weight cutting involves gradual reduction over weeks, never drastic dehydration. Work with nutritionist and maintain performance."
+    }
+};
+
+// AI Response Generator
+function generateBoxingResponse(userMessage) {
+    const lowerMessage = userMessage.toLowerCase();
+
+    // Check for specific topics
+    for (const [category, topics] of Object.entries(boxingKnowledge)) {
+        for (const [keyword, response] of Object.entries(topics)) {
+            if (lowerMessage.includes(keyword)) {
+                return response;
+            }
+        }
+    }
+
+    // General responses for common questions
+    if (lowerMessage.includes('hello') || lowerMessage.includes('hi') || lowerMessage.includes('hey')) {
+        return "👊 Hello! Ready to talk boxing? Ask me about techniques, training, equipment, or rules!";
+    }
+
+    if (lowerMessage.includes('thank')) {
+        return "You're welcome! Keep training hard and let me know if you have more boxing questions!";
+    }
+
+    if (lowerMessage.includes('beginner') || lowerMessage.includes('start')) {
+        return "For beginners: Start with proper stance and basic punches (jab, cross). Focus on defense and footwork. Always use hand wraps and get quality instruction. Consistency is key!";
+    }
+
+    if (lowerMessage.includes('sparring')) {
+        return "Sparring tips: Start light, focus on technique over power, always use headgear and mouthguard, listen to your coach, and spar with different partners to learn various styles.";
+    }
+
+    // Default response for non-boxing questions
+    if (!lowerMessage.match(/(box|punch|fight|train|glove|stance|jab|hook|uppercut|spar|round|ko|tko|ring|coach)/)) {
+        return "I specialize in boxing knowledge only. Please ask me about boxing techniques, training, equipment, rules, or history!";
+    }
+
+    // Fallback response
+    return "That's a great boxing question! Based on your query, I'd recommend focusing on proper technique first. Would you like more specific information about any particular aspect of boxing?";
+}
+
+// Chatbot functionality
+document.addEventListener('DOMContentLoaded', function() {
+    const chatbotContainer = document.getElementById('chatbot-container');
+    const chatbotBackdrop = document.getElementById('chatbot-backdrop');
+    const closeChatbot = document.getElementById('close-chatbot');
+    const sendButton = document.getElementById('send-message');
+    const chatInput = document.getElementById('chatbot-input');
+    const messagesContainer = document.getElementById('chatbot-messages');
+    const typingIndicator = document.getElementById('typing-indicator');
+    const quickQuestions = document.querySelectorAll('.quick-question');
+
+    // Open chatbot
+    window.openChatbot = function() {
+        chatbotContainer.classList.remove('hidden');
+        document.body.style.overflow = 'hidden';
+        chatInput.focus();
+    }
+
+    // Close chatbot
+    function closeChatbotFunc() {
+        chatbotContainer.classList.add('hidden');
+        document.body.style.overflow = 'auto';
+    }
+
+    // Event listeners
+    if (closeChatbot) closeChatbot.addEventListener('click', closeChatbotFunc);
+    if (chatbotBackdrop) chatbotBackdrop.addEventListener('click', closeChatbotFunc);
+
+    // Send message function
+    function sendMessage() {
+        const message = chatInput.value.trim();
+        if (message === '') return;
+
+        // Add user message
+        addMessage(message, 'user');
+        chatInput.value = '';
+
+        // Show typing indicator
+        typingIndicator.classList.remove('hidden');
+
+        // Simulate AI thinking and response
+        setTimeout(() => {
+            typingIndicator.classList.add('hidden');
+            const response = generateBoxingResponse(message);
+            addMessage(response, 'bot');
+        }, 1500);
+    }
+
+    // Add message to chat
+    function addMessage(text, sender) {
+        const messageDiv = document.createElement('div');
+        messageDiv.className = `flex justify-${sender === 'user' ? 'end' : 'start'} message-slide-in`;
+
+        const messageContent = `
+            <div class="max-w-[85%]">
+                <div class="${sender === 'user' ? 'bg-accent-red text-white rounded-lg rounded-br-none' : 'bg-secondary-black text-white rounded-lg rounded-tl-none border border-border-gray'} p-3">
+                    <p class="text-sm">${text}</p>
+                </div>
+                <span class="text-xs text-gray-500 mt-1 block">${new Date().toLocaleTimeString([], {hour: '2-digit', minute:'2-digit'})}</span>
+            </div>
+        `;
+
+        messageDiv.innerHTML = messageContent;
+        messagesContainer.appendChild(messageDiv);
+        messagesContainer.scrollTop = messagesContainer.scrollHeight;
+    }
+
+    // Event listeners for sending messages
+    if (sendButton) sendButton.addEventListener('click', sendMessage);
+    if (chatInput) {
+        chatInput.addEventListener('keypress', function(e) {
+            if (e.key === 'Enter') {
+                sendMessage();
+            }
+        });
+    }
+
+    // Quick question buttons
+    quickQuestions.forEach(button => {
+        button.addEventListener('click', function() {
+            const question = this.getAttribute('data-question');
+            chatInput.value = question;
+            sendMessage();
+        });
+    });
+
+    // Close with Escape key
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape' && !chatbotContainer.classList.contains('hidden')) {
+            closeChatbotFunc();
+        }
+    });
+});
+
+// GSAP Animations
+document.addEventListener('DOMContentLoaded', function() {
+    if (typeof gsap !== 'undefined' && typeof ScrollTrigger !== 'undefined') {
+        gsap.registerPlugin(ScrollTrigger);
+
+        // Hero section animations
+        if (document.querySelector('.home-hero')) {
+            gsap.to('.hero-title', {
+                opacity: 1,
+                y: 0,
+                duration: 1,
+                ease: "power2.out"
+            });
+
+            gsap.to('.hero-subtitle', {
+                opacity: 1,
+                y: 0,
+                duration: 1,
+                delay: 0.3,
+                ease: "power2.out"
+            });
+
+            gsap.to('.hero-buttons', {
+                opacity: 1,
+                y: 0,
+                duration: 1,
+                delay: 0.6,
+                ease: "power2.out"
+            });
+        }
+
+        // Page title animations for other pages
+        const pageTitle = document.querySelector('.page-title');
+        const pageSubtitle = document.querySelector('.page-subtitle');
+
+        if (pageTitle || pageSubtitle) {
+            gsap.to('.page-title, .page-subtitle', {
+                opacity: 1,
+                y: 0,
+                duration: 1,
+                scrollTrigger: {
+                    trigger: '.section-dark',
+                    start: "top 80%",
+                    toggleActions: "play none none reverse"
+                }
+            });
+        }
+
+        // Footer animations
+        const footerElements = document.querySelectorAll('footer > div > div > div');
+        if (footerElements.length > 0) {
+            footerElements.forEach((element, index) => {
+                gsap.to(element, {
+                    opacity: 1,
+                    y: 0,
+                    duration: 0.8,
+                    delay: index * 0.1,
+                    scrollTrigger: {
+                        trigger: 'footer',
+                        start: "top 90%",
+                        toggleActions: "play none none reverse"
+                    }
+                });
+            });
+        }
+
+        // 3D card hover effects
+        const cards = document.querySelectorAll('.card-pro');
+        if (cards.length > 0) {
+            cards.forEach(card => {
+                card.addEventListener('mousemove', (e) => {
+                    const rect = card.getBoundingClientRect();
+                    const x = e.clientX - rect.left;
+                    const y = e.clientY - rect.top;
+
+                    const centerX = rect.width / 2;
+                    const centerY = rect.height / 2;
+
+                    const rotateY = (x - centerX) / 20;
+                    const rotateX = (centerY - y) / 20;
+
+                    gsap.to(card, {
+                        rotationY: rotateY,
+                        rotationX: rotateX,
+                        transformPerspective: 1000,
+                        duration: 0.3,
+                        ease: "power2.out"
+                    });
+                });
+
+                card.addEventListener('mouseleave', () => {
+                    gsap.to(card, {
+                        rotationY: 0,
+                        rotationX: 0,
+                        duration: 0.5,
+                        ease: "power3.out"
+                    });
+                });
+            });
+        }
+
+        // Button hover animations
+        const buttons = document.querySelectorAll('.btn-pro');
+        if (buttons.length > 0) {
+            buttons.forEach(button => {
+                button.addEventListener('mouseenter', () => {
+                    gsap.to(button, {
+                        scale: 1.05,
+                        duration: 0.3,
+                        ease: "power2.out"
+                    });
+                });
+
+                button.addEventListener('mouseleave', () => {
+                    gsap.to(button, {
+                        scale: 1,
+                        duration: 0.3,
+                        ease: "power2.out"
+                    });
+                });
+            });
+        }
+
+        // Stats number animations
+        const statsNumbers = document.querySelectorAll('.stats-number');
+        if (statsNumbers.length > 0) {
+            statsNumbers.forEach(number => {
+                number.addEventListener('mouseenter', () => {
+                    gsap.to(number, {
+                        scale: 1.2,
+                        color: '#ef4444',
+                        duration: 0.3,
+                        ease: "power2.out"
+                    });
+                });
+
+                number.addEventListener('mouseleave', () => {
+                    gsap.to(number, {
+                        scale: 1,
+                        color: '#dc2626',
+                        duration: 0.3,
+                        ease: "power2.out"
+                    });
+                });
+            });
+        }
+    }
+});
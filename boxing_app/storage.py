@@ -0,0 +1,237 @@
+"""
+Static files storage for production builds.
+
+On top of WhiteNoise's fingerprinted, gzip/brotli pre-compressed storage,
+``collectstatic`` here also:
+
+- re-encodes the collected JPEG/PNG photos, capped at
+  ``STATIC_IMAGE_MAX_WIDTH`` (the source files are left untouched),
+- writes AVIF/WebP copies next to them (``images/x.jpg`` ->
+  ``images/x.avif``), which templates pick up through
+  ``static_variants()`` once they are in the manifest,
+- minifies the project's stylesheets and scripts (``STATIC_MINIFY``),
+- writes the rules of each ``STATIC_CRITICAL_CSS`` stylesheet that the
+  page shell (``base.html`` outside the content block) uses to
+  ``<name>.critical.css``, which ``{% stylesheet %}`` inlines in the page
+  head (``critical_css_for()``) while the full file loads without blocking.
+"""
+import fnmatch
+import io
+import posixpath
+import re
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.template.loader import get_template
+from PIL import Image, ImageOps
+from rcssmin import cssmin
+from rjsmin import jsmin
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from . import images
+
+
+OPTIMIZED_EXTENSIONS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG'}
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 80, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+}
+MINIFIERS = {'.css': cssmin, '.js': jsmin}
+CRITICAL_TEMPLATE = 'boxing_app/base.html'
+
+
+def modern_name(path, fmt):
+    return f'{posixpath.splitext(path)[0]}.{fmt}'
+
+
+def critical_name(path):
+    return f'{posixpath.splitext(path)[0]}.critical.css'
+
+
+def static_variants(path):
+    """``[(format, url)]`` of the AVIF/WebP copies of a static image that the current build has"""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    return [
+        (fmt, staticfiles_storage.url(modern_name(path, fmt)))
+        for fmt in images.output_formats()
+        if modern_name(path, fmt) in hashed_files
+    ]
+
+
+def optimize_image(data, fmt):
+    """``data`` re-encoded and scaled down to ``STATIC_IMAGE_MAX_WIDTH``, plus the decoded image"""
+    largest = settings.STATIC_IMAGE_MAX_WIDTH
+    image = Image.open(io.BytesIO(data))
+    image.draft('RGB', (largest, largest))
+    image = ImageOps.exif_transpose(image)
+    if image.width > largest:
+        image = image.resize((largest, max(1, round(image.height * largest / image.width))), Image.LANCZOS, reducing_gap=3.0)
+    if fmt == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **SAVE_OPTIONS[fmt])
+    return buffer.getvalue(), image
+
+
+def css_rules(css):
+    """Top-level ``(prelude, body)`` pairs of a stylesheet, comments removed"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    rules, depth, start, prelude = [], 0, 0, ''
+    for i, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude, start = css[start:i].strip(), i + 1
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[start:i].strip()))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            # @import / @charset
+            rules.append((css[start:i].strip(), None))
+            start = i + 1
+    return rules
+
+
+def markup_tokens(html):
+    """Tag names, ``.class`` and ``#id`` tokens used by a piece of markup"""
+    tokens = {tag.lower() for tag in re.findall(r'<([a-zA-Z][\w-]*)', html)}
+    for value in re.findall(r'\bclass="([^"]*)"', html):
+        tokens.update(f'.{name}' for name in re.sub(r'{[{%].*?[%}]}', ' ', value).split())
+    tokens.update(f'#{name}' for name in re.findall(r'\bid="([\w-]+)"', html))
+    return tokens
+
+
+def selector_used(selector, tokens):
+    # Pseudo-classes/-elements and attribute selectors don't decide whether an element exists
+    selector = re.sub(r'::?[\w-]+(\([^)]*\))?|\[[^\]]*\]', '', selector)
+    parts = re.findall(r'[.#]?[\w-]+|\*', selector)
+    return all(part == '*' or part in tokens or part.lower() in tokens for part in parts)
+
+
+def critical_css(css, html):
+    """The rules of ``css`` that apply to elements in ``html``, keeping at-rules that contain any"""
+    tokens = markup_tokens(html) | {'html', 'body'}
+    kept = []
+    for prelude, body in css_rules(css):
+        if body is None:
+            kept.append(f'{prelude};')
+        elif prelude.startswith('@media') or prelude.startswith('@supports'):
+            inner = critical_css(body, html)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            # @font-face, @keyframes, ...: cheap, and referenced by the rules that are kept
+            kept.append(f'{prelude}{{{body}}}')
+        elif any(selector_used(selector, tokens) for selector in prelude.split(',')):
+            kept.append(f'{prelude}{{{body}}}')
+    return '\n'.join(kept)
+
+
+def page_shell():
+    """``base.html`` without the per-page content block, with its includes: what every page shows first"""
+    source = get_template(CRITICAL_TEMPLATE).template.source
+    source = re.sub(r'{%\s*block content\s*%}.*?{%\s*endblock\s*%}', '', source, flags=re.S)
+    return re.sub(
+        r'''{%\s*include\s+['"]([^'"]+)['"][^%]*%}''', lambda match: get_template(match.group(1)).template.source, source,
+    )
+
+
+_critical_cache = {}
+
+
+def critical_css_for(path):
+    """The built ``.critical.css`` of a stylesheet, ready to inline; None when there is none"""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    name = critical_name(path)
+    if path not in settings.STATIC_CRITICAL_CSS or name not in hashed_files:
+        return None
+    hashed = hashed_files[name]
+    if hashed not in _critical_cache:  # the hash changes with the content
+        with staticfiles_storage.open(hashed) as file:
+            css = file.read().decode()
+        base = staticfiles_storage.url(name)
+
+        def absolute(match):
+            # Relative to the stylesheet, not to the page it is inlined in
+            url = match.group(2)
+            if re.match(r'[a-z]+:|/|#', url):
+                return match.group(0)
+            return f'url({match.group(1)}{urljoin(base, url)}{match.group(1)})'
+
+        _critical_cache[hashed] = re.sub(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)', absolute, css).replace('</', '<\\/')
+    return _critical_cache[hashed]
+
+
+class OptimizedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = dict(paths)
+            self.optimize_images(paths)
+            self.minify(paths)
+            self.extract_critical_css(paths)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def _replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self.save(name, ContentFile(content))
+
+    def optimize_images(self, paths):
+        for path, (storage, source_path) in list(paths.items()):
+            fmt = OPTIMIZED_EXTENSIONS.get(posixpath.splitext(path)[1].lower())
+            if fmt is None:
+                continue
+            with storage.open(source_path) as file:
+                original = file.read()
+            modern = {modern_name(path, ext): ext for ext in images.output_formats()}
+            # Unchanged since the last run: collectstatic kept the optimized copy
+            if self.size(path) != len(original):
+                paths.update((name, (self, name)) for name in modern if name not in paths and self.exists(name))
+                paths[path] = (self, path)
+                continue
+
+            optimized, image = optimize_image(original, fmt)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+            if len(optimized) < len(original):
+                self._replace(path, optimized)
+            # The fingerprint and compressed copies are made from what is served
+            paths[path] = (self, path)
+            served = min(len(optimized), len(original))
+            for name, ext in modern.items():
+                if name in paths:  # a hand-made file of that name wins
+                    continue
+                buffer = io.BytesIO()
+                image.save(buffer, ext.upper(), **images.SAVE_OPTIONS[ext])
+                if self.exists(name):
+                    self.delete(name)
+                # Only offered when it is actually smaller
+                if buffer.tell() < served:
+                    self.save(name, ContentFile(buffer.getvalue()))
+                    paths[name] = (self, name)
+
+    def minify(self, paths):
+        for path, (storage, source_path) in list(paths.items()):
+            minifier = MINIFIERS.get(posixpath.splitext(path)[1])
+            if minifier is None or not any(fnmatch.fnmatch(path, pattern) for pattern in settings.STATIC_MINIFY):
+                continue
+            # Always from the source, so an unchanged file gives the same output (and hash)
+            with storage.open(source_path) as file:
+                self._replace(path, minifier(file.read().decode()).encode())
+            paths[path] = (self, path)
+
+    def extract_critical_css(self, paths):
+        shell = page_shell()
+        for path in settings.STATIC_CRITICAL_CSS:
+            if path not in paths:
+                continue
+            storage, source_path = paths[path]
+            with storage.open(source_path) as file:
+                css = file.read().decode()
+            name = critical_name(path)
+            self._replace(name, critical_css(css, shell).encode())
+            paths[name] = (self, name)
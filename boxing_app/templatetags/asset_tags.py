@@ -0,0 +1,22 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from boxing_app.storage import critical_css_for
+
+register = template.Library()
+
+
+@register.simple_tag
+def stylesheet(path):
+    """``<link>`` to a stylesheet; with a built ``.critical.css`` that is inlined and the link doesn't block rendering"""
+    critical = critical_css_for(path)
+    if critical is None:
+        return format_html('<link rel="stylesheet" href="{}">', static(path))
+    return format_html(
+        '<style>{}</style>\n'
+        '    <link rel="stylesheet" href="{}" media="print" onload="this.media=\'all\'">\n'
+        '    <noscript><link rel="stylesheet" href="{}"></noscript>',
+        mark_safe(critical), static(path), static(path),
+    )
@@ -34,5 +34,5 @@ register = template.Library()
 
 @register.filter
 def sum_values(values):
-    """Sum all values in a dictionary"""
-    return sum(values.values())    
\ No newline at end of file
+    """Sum all values in a dictionary (0 for a missing one)"""
+    return sum(values.values()) if values else 0    
\ No newline at end of file
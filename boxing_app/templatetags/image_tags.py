@@ -0,0 +1,60 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from boxing_app import images
+from boxing_app.storage import static_variants
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(instance, sizes='100vw', alt='', css_class='', loading='lazy'):
+    """``<picture>`` with AVIF/WebP srcsets for ``instance.image``; a plain ``<img>`` until they are built"""
+    meta = images.current(instance)
+    if meta is None:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            instance.image.url, alt, css_class, loading,
+        )
+    sources = format_html_join(
+        '', '<source type="image/{}" srcset="{}" sizes="{}">',
+        ((fmt, images.srcset(meta, fmt), sizes) for fmt in meta['formats']),
+    )
+    # display: contents keeps the <img> sized by the surrounding layout
+    return format_html(
+        '<picture style="display: contents">{}<img src="{}" alt="{}" class="{}" width="{}" height="{}" '
+        'loading="{}" decoding="async"></picture>',
+        sources, instance.image.url, alt, css_class, meta['width'], meta['height'], loading,
+    )
+
+
+@register.simple_tag
+def image_srcset(instance, fmt='webp'):
+    """Just the ``srcset`` value, for markup that builds its own ``<img>``"""
+    meta = images.current(instance)
+    return images.srcset(meta, fmt) if meta and fmt in meta['formats'] else ''
+
+
+@register.simple_tag
+def static_picture(path, alt='', css_class='', loading='lazy'):
+    """``<picture>`` for a static image with the AVIF/WebP copies made by collectstatic, if any"""
+    img = format_html('<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">', static(path), alt, css_class, loading)
+    variants = static_variants(path)
+    if not variants:
+        return img
+    sources = format_html_join('', '<source type="image/{}" srcset="{}">', variants)
+    return format_html('<picture style="display: contents">{}{}</picture>', sources, img)
+
+
+@register.simple_tag
+def static_image_set(path):
+    """CSS ``image-set()`` of a static image's AVIF/WebP copies and the image itself; '' without copies"""
+    variants = static_variants(path)
+    if not variants:
+        return ''
+    fallback = 'png' if path.lower().endswith('.png') else 'jpeg'
+    options = [*variants, (fallback, static(path))]
+    return format_html(
+        'image-set({})', format_html_join(', ', 'url("{}") type("image/{}")', ((url, fmt) for fmt, url in options)),
+    )
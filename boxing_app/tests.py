@@ -1,3 +1,923 @@
-from django.test import TestCase
+import json
+import re
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core import signing
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.template import Context, Template
+from django.test import Client, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from PIL import Image
+
+from . import catalog, content_cache, images
+from .admin import thumbnail
+from .cart import COOKIE_NAME, COOKIE_SALT, DatabaseCart
+from .management.commands.purge_sessions import purge_expired
+from .storage import critical_css
+from .search import search_products
+from .models import (
+    CartItem, Event, GalleryImage, MembershipPlan, NavbarItem, Service, ShopItem,
+    Trainer, TrainingSchedule,
+)
+
+
+class CartViewTests(TestCase):
+    def setUp(self):
+        self.products = [
+            ShopItem.objects.create(name=f'Glove {i}', price=Decimal('10.00'), order=i)
+            for i in range(30)
+        ]
+
+    def set_cart(self, cart):
+        self.client.cookies[COOKIE_NAME] = cookie_signer().sign(json.dumps(cart))
+
+    def cart_cookie(self):
+        value = self.client.cookies[COOKIE_NAME].value
+        return json.loads(cookie_signer().unsign(value)) if value else {}
+
+    def cart_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('cart'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_cart_query_count_is_independent_of_cart_size(self):
+        self.set_cart({str(self.products[0].id): 1})
+        _, small = self.cart_queries()
+
+        self.set_cart({str(p.id): 2 for p in self.products})
+        response, large = self.cart_queries()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.context['cart_items']), 30)
+        self.assertEqual(response.context['cart_count'], 60)
+
+    def test_cart_totals(self):
+        self.set_cart({str(self.products[0].id): 3})
+        response, _ = self.cart_queries()
+        self.assertEqual(response.context['subtotal'], Decimal('30.00'))
+        self.assertEqual(response.context['shipping'], Decimal('15.00'))
+        self.assertEqual(response.context['tax'], Decimal('2.4000'))
+        self.assertEqual(response.context['total'], Decimal('47.4000'))
+
+    def test_stale_ids_are_dropped(self):
+        inactive = self.products[1]
+        inactive.is_active = False
+        inactive.save()
+        self.set_cart({
+            str(self.products[0].id): 1,
+            str(inactive.id): 1,
+            '999999': 4,
+            'not-an-id': 2,
+        })
+        response, _ = self.cart_queries()
+        self.assertEqual(response.context['cart_count'], 1)
+        self.assertEqual(self.cart_cookie(), {str(self.products[0].id): 1})
+
+    def test_quantity_views(self):
+        product = self.products[0]
+        self.client.get(reverse('add_to_cart', args=[product.id]))
+        self.client.post(reverse('increase_quantity', args=[product.id]))
+        self.assertEqual(self.cart_cookie(), {str(product.id): 2})
+
+        self.client.post(reverse('decrease_quantity', args=[product.id]))
+        self.assertEqual(self.cart_cookie(), {str(product.id): 1})
+
+        self.client.post(reverse('decrease_quantity', args=[product.id]))
+        self.assertEqual(self.cart_cookie(), {})
+
+        self.client.get(reverse('add_to_cart', args=[product.id]))
+        self.client.post(reverse('remove_from_cart', args=[product.id]))
+        self.assertEqual(self.cart_cookie(), {})
+
+    def test_ajax_add_returns_count(self):
+        response = self.client.get(
+            reverse('add_to_cart', args=[self.products[0].id]),
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        self.assertEqual(response.json()['cart_count'], 1)
+
+    def test_guest_cart_does_not_write_the_session(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('add_to_cart', args=[self.products[0].id]))
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+        self.assertFalse([q for q in ctx.captured_queries if 'django_session' in q['sql']])
+        self.assertEqual(self.cart_cookie(), {str(self.products[0].id): 1})
+
+    def test_guest_cart_count_is_not_modified_until_the_cart_changes(self):
+        self.set_cart({str(self.products[0].id): 2})
+        response = self.client.get(reverse('get_cart_count'))
+        self.assertEqual(response.json()['cart_count'], 2)
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('get_cart_count'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        self.set_cart({str(self.products[0].id): 3})
+        self.assertEqual(self.client.get(reverse('get_cart_count'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_session_cart_from_before_is_moved_to_the_cookie(self):
+        session = self.client.session
+        session['cart'] = {str(self.products[0].id): 2, 'bogus': 1}
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        self.assertEqual(self.client.get(reverse('get_cart_count')).json()['cart_count'], 2)
+        self.assertEqual(self.cart_cookie(), {str(self.products[0].id): 2})
+        self.assertNotIn('cart', self.client.session)
+
+    def test_tampered_cookie_is_an_empty_cart(self):
+        self.client.cookies[COOKIE_NAME] = json.dumps({str(self.products[0].id): 5})
+        self.assertEqual(self.client.get(reverse('get_cart_count')).json()['cart_count'], 0)
+
+
+def cookie_signer():
+    return signing.get_cookie_signer(salt=COOKIE_NAME + COOKIE_SALT)
+
+
+class MemberCartTests(TestCase):
+    def setUp(self):
+        self.products = [
+            ShopItem.objects.create(name=f'Glove {i}', price=Decimal('10.00'), order=i)
+            for i in range(30)
+        ]
+        self.user = User.objects.create_user('boxer', password='pass')
+        # Cart totals are cached per user id, and ids come round again between tests
+        cache.clear()
+
+    def lines(self):
+        return dict(CartItem.objects.filter(user=self.user).values_list('item_id', 'quantity'))
+
+    def test_quantity_views_update_rows(self):
+        self.client.force_login(self.user)
+        product = self.products[0]
+        self.client.get(reverse('add_to_cart', args=[product.id]))
+        self.client.post(reverse('increase_quantity', args=[product.id]))
+        self.assertEqual(self.lines(), {product.id: 2})
+
+        self.client.post(reverse('decrease_quantity', args=[product.id]))
+        self.assertEqual(self.lines(), {product.id: 1})
+        self.client.post(reverse('decrease_quantity', args=[product.id]))
+        self.assertEqual(self.lines(), {})
+        self.assertNotIn(COOKIE_NAME, self.client.cookies)
+
+    def test_cart_page_query_count_is_independent_of_cart_size(self):
+        self.client.force_login(self.user)
+        CartItem.objects.create(user=self.user, item=self.products[0], quantity=1)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse('cart'))
+        CartItem.objects.bulk_create(CartItem(user=self.user, item=p, quantity=2) for p in self.products[1:])
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(reverse('cart'))
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(response.context['cart_count'], 59)
+
+    def test_inactive_products_are_dropped(self):
+        self.client.force_login(self.user)
+        CartItem.objects.create(user=self.user, item=self.products[0], quantity=1)
+        CartItem.objects.create(user=self.user, item=self.products[1], quantity=3)
+        ShopItem.objects.filter(pk=self.products[1].pk).update(is_active=False)
+        self.assertEqual(self.client.get(reverse('cart')).context['cart_count'], 1)
+        self.assertEqual(self.lines(), {self.products[0].id: 1})
+
+    def test_guest_cart_is_merged_on_login(self):
+        CartItem.objects.create(user=self.user, item=self.products[0], quantity=1)
+        self.client.get(reverse('add_to_cart', args=[self.products[0].id]))
+        self.client.get(reverse('add_to_cart', args=[self.products[1].id]))
+
+        self.client.post(reverse('login'), {'username': 'boxer', 'password': 'pass'})
+        self.assertEqual(self.lines(), {self.products[0].id: 2, self.products[1].id: 1})
+        self.assertEqual(self.client.cookies[COOKIE_NAME].value, '')
+
+        # Logging out and in again doesn't add the guest cart twice
+        self.client.get(reverse('logout'))
+        self.client.post(reverse('login'), {'username': 'boxer', 'password': 'pass'})
+        self.assertEqual(self.lines(), {self.products[0].id: 2, self.products[1].id: 1})
+
+    def test_session_cart_from_before_is_moved_to_the_account(self):
+        self.client.force_login(self.user)
+        CartItem.objects.create(user=self.user, item=self.products[0], quantity=1)
+        session = self.client.session
+        session['cart'] = {str(self.products[0].id): 2, str(self.products[1].id): 1}
+        session.save()
+        self.assertEqual(self.client.get(reverse('get_cart_count')).json()['cart_count'], 4)
+        self.assertEqual(self.lines(), {self.products[0].id: 3, self.products[1].id: 1})
+        self.assertNotIn('cart', self.client.session)
+        # Only once
+        self.client.get(reverse('get_cart_count'))
+        self.assertEqual(self.lines(), {self.products[0].id: 3, self.products[1].id: 1})
+
+    def test_totals_are_cached_until_the_cart_changes(self):
+        CartItem.objects.create(user=self.user, item=self.products[0], quantity=2)
+        CartItem.objects.create(user=self.user, item=self.products[1], quantity=1)
+        totals = DatabaseCart(self.user).totals()
+        self.assertEqual((totals.count, totals.subtotal), (3, Decimal('30.00')))
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(DatabaseCart(self.user).totals().version, totals.version)
+        self.assertFalse([q for q in ctx.captured_queries if 'boxing_app_cartitem' in q['sql']])
+
+        DatabaseCart(self.user).add(self.products[2].id)
+        totals = DatabaseCart(self.user).totals()
+        self.assertEqual((totals.count, totals.subtotal), (4, Decimal('40.00')))
+
+        ShopItem.objects.get(pk=self.products[0].pk).delete()
+        self.assertEqual(DatabaseCart(self.user).totals().count, 2)
+
+    def test_badge_does_not_query_the_cart(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('add_to_cart', args=[self.products[0].id]))
+        self.client.get(reverse('contact'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('contact'))
+        self.assertContains(response, '<span class="cart-badge">1</span>', html=True)
+        self.assertFalse([q for q in ctx.captured_queries if 'boxing_app_cartitem' in q['sql']])
+
+    def test_cart_count_is_not_modified_until_the_cart_changes(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('get_cart_count'))
+        self.assertEqual(response.json()['cart_count'], 0)
+        etag = response['ETag']
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(reverse('get_cart_count'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.get(reverse('add_to_cart', args=[self.products[0].id]))
+        response = self.client.get(reverse('get_cart_count'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['cart_count'], 1)
+
+    def test_add_after_losing_the_insert_race(self):
+        cart = DatabaseCart(self.user)
+        product = self.products[0]
+        increment = DatabaseCart._increment
+        calls = []
+
+        def parallel_request_inserts_first(self, product_id, quantity):
+            calls.append(product_id)
+            if len(calls) == 1:
+                # The other request's INSERT lands after our UPDATE found nothing
+                CartItem.objects.create(user=self.user, item_id=product_id, quantity=1)
+                return 0
+            return increment(self, product_id, quantity)
+
+        with mock.patch.object(DatabaseCart, '_increment', parallel_request_inserts_first):
+            cart.add(product.id)
+        self.assertEqual(self.lines(), {product.id: 2})
+
+
+    def test_decrease_does_not_delete_a_line_raised_in_parallel(self):
+        cart = DatabaseCart(self.user)
+        product = self.products[0]
+        CartItem.objects.create(user=self.user, item=product, quantity=1)
+
+        def parallel_add_lands_after_our_update(self, product_id):
+            # Our UPDATE saw quantity 1; then another request's add commits
+            CartItem.objects.filter(user=self.user, item_id=product_id).update(quantity=F('quantity') + 1)
+            return 0
+
+        with mock.patch.object(DatabaseCart, '_decrement', parallel_add_lands_after_our_update):
+            self.assertEqual(cart.decrease(product.id), 2)
+        self.assertEqual(self.lines(), {product.id: 2})
+
+
+@skipUnlessDBFeature('test_db_allows_multiple_connections')
+class CartConcurrencyTests(TransactionTestCase):
+    def test_parallel_adds_are_all_counted(self):
+        user = User.objects.create_user('boxer')
+        product = ShopItem.objects.create(name='Glove', price=Decimal('10.00'))
+        requests = 8
+        barrier = threading.Barrier(requests)
+        errors = []
+
+        def add():
+            client = Client()
+            client.force_login(user)
+            try:
+                barrier.wait()
+                client.get(reverse('add_to_cart', args=[product.id]))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=add) for _ in range(requests)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(list(CartItem.objects.filter(user=user).values_list('quantity', flat=True)), [requests])
+
+
+class SessionTests(TestCase):
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_member_cart_requests_do_not_query_the_session_table(self):
+        user = User.objects.create_user('boxer')
+        product = ShopItem.objects.create(name='Glove', price=Decimal('10.00'))
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('add_to_cart', args=[product.id]), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+            self.client.get(reverse('get_cart_count'))
+        self.assertFalse([q for q in ctx.captured_queries if 'django_session' in q['sql']])
+
+    def test_purge_deletes_only_expired_sessions_in_batches(self):
+        now = timezone.now()
+        Session.objects.bulk_create(
+            [Session(session_key=f'old{i}', session_data='', expire_date=now - timedelta(days=1)) for i in range(5)]
+            + [Session(session_key='live', session_data='', expire_date=now + timedelta(days=1))]
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(purge_expired(batch_size=2), 5)
+        self.assertEqual(sum(q['sql'].startswith('DELETE') for q in ctx.captured_queries), 3)
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+
+class ContentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Service.objects.create(name='Sparring', link='/services', order=1)
+
+    def test_warm_hit_does_not_touch_the_database(self):
+        call_command('warm_content_cache', stdout=open('/dev/null', 'w'))
+        for name in ('home', 'about', 'services', 'training_schedule', 'membership_plans'):
+            with self.assertNumQueries(0):
+                self.client.get(reverse(name))
+
+    def test_save_and_delete_invalidate_dependent_entries(self):
+        response = self.client.get(reverse('services'))
+        self.assertEqual(len(response.context['services']), 1)
+
+        service = Service.objects.create(name='Conditioning', link='/services', order=2)
+        response = self.client.get(reverse('services'))
+        self.assertEqual(len(response.context['services']), 2)
+
+        service.delete()
+        response = self.client.get(reverse('services'))
+        self.assertEqual(len(response.context['services']), 1)
+
+    def test_shared_model_invalidates_every_page_using_it(self):
+        self.client.get(reverse('home'))
+        self.client.get(reverse('about'))
+        Trainer.objects.create(name='Coach Carter', role='Head Coach')
+        self.assertEqual(len(self.client.get(reverse('home')).context['trainers']), 1)
+        self.assertEqual(len(self.client.get(reverse('about')).context['trainers']), 1)
+
+    def test_hit_and_miss_counters(self):
+        content_cache.reset_stats()
+        # membership_plans is not page-cached, so both requests reach the content cache
+        self.client.get(reverse('membership_plans'))
+        self.client.get(reverse('membership_plans'))
+        self.assertEqual(content_cache.get_stats(), {'hits': 1, 'misses': 1})
+
+
+class LayoutFragmentCacheTests(TestCase):
+    def setUp(self):
+        caches['template_fragments'].clear()
+        cache.clear()
+        self.product = ShopItem.objects.create(name='Bag Gloves', price=Decimal('30.00'))
+        self.user = User.objects.create_user('member', password='pw')
+
+    def nav(self):
+        return caches['template_fragments'].get(make_template_fragment_key('base_nav', [True, 0]))
+
+    def test_nav_follows_login_state(self):
+        self.assertContains(self.client.get(reverse('about')), reverse('login'))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('about'))
+        self.assertContains(response, reverse('logout'))
+        self.assertNotContains(response, reverse('login'))
+
+    def test_nav_is_shared_between_members(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('about'))
+        self.assertIn(reverse('logout'), self.nav())
+
+        other = User.objects.create_user('other', password='pw')
+        self.client.force_login(other)
+        self.assertContains(self.client.get(reverse('services')), reverse('logout'))
+
+    def test_cart_badge_follows_cart_size(self):
+        self.client.force_login(self.user)
+        self.assertNotContains(self.client.get(reverse('about')), '<span class="cart-badge">')
+        self.client.get(reverse('add_to_cart', args=[self.product.id]))
+        self.client.get(reverse('add_to_cart', args=[self.product.id]))
+        self.assertContains(self.client.get(reverse('about')), '<span class="cart-badge">2</span>', html=True)
+        self.client.get(reverse('clear_cart'))
+        self.assertNotContains(self.client.get(reverse('about')), '<span class="cart-badge">')
+
+
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        caches['template_fragments'].clear()
+        Service.objects.create(name='Sparring', link='/services', order=1)
+
+    def test_repeat_visit_is_served_from_cache(self):
+        first = self.client.get(reverse('services'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('services'))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertIn('public', second['Cache-Control'])
+        self.assertIn('max-age=60', second['Cache-Control'])
+        self.assertIn('Cookie', second['Vary'])
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(reverse('facilities'))['ETag']
+        response = self.client.get(reverse('facilities'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_admin_save_invalidates_page(self):
+        self.client.get(reverse('services'))
+        Service.objects.create(name='Conditioning', link='/services', order=2)
+        self.assertEqual(len(self.client.get(reverse('services')).context['services']), 2)
+
+    def test_members_and_carts_bypass_cache(self):
+        self.client.get(reverse('services'))
+        self.client.force_login(User.objects.create_user('member', password='pw'))
+        response = self.client.get(reverse('services'))
+        self.assertContains(response, reverse('logout'))
+        self.assertIn('private', response['Cache-Control'])
+        self.client.logout()
+
+        product = ShopItem.objects.create(name='Wraps', price=Decimal('8.00'))
+        self.client.get(reverse('add_to_cart', args=[product.id]))
+        self.assertIsNotNone(self.client.get(reverse('services')).context)
+        self.client.get(reverse('clear_cart'))
+        self.assertIsNone(self.client.get(reverse('services')).context)
+
+
+# Only the temporary STATICFILES_DIRS, not boxing_app/static and the admin's files
+FILE_SYSTEM_FINDER = 'django.contrib.staticfiles.finders.FileSystemFinder'
+
+
+class PrerenderTests(TestCase):
+    def setUp(self):
+        caches['template_fragments'].clear()
+        self.output = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.output)
+        # The stylesheets and scripts, but just the images the templates use, to keep the image build short
+        source = Path(__file__).parent / 'static'
+        static = Path(tempfile.mkdtemp()) / 'static'
+        self.addCleanup(shutil.rmtree, static.parent)
+        shutil.copytree(source, static, ignore=lambda directory, names: names if directory.endswith('images') else [])
+        for name in ('pexels-clickerhappy-3797.jpg', 'pexels-pixabay-163403.jpg'):
+            shutil.copy(source / 'images' / name, static / 'images' / name)
+        overrides = override_settings(STATICFILES_DIRS=[static], STATICFILES_FINDERS=[FILE_SYSTEM_FINDER])
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        Service.objects.create(name='Sparring', link='/services', order=1)
+
+    def prerender(self):
+        stdout = StringIO()
+        call_command('prerender', output=self.output, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_pages_are_exported_with_fingerprinted_assets(self):
+        report = self.prerender()
+        home = (self.output / 'index.html').read_text()
+        self.assertTrue((self.output / 'services' / 'index.html').exists())
+        self.assertRegex(home, r'/static/images/pexels-clickerhappy-3797\.[0-9a-f]{12}\.jpg')
+        self.assertRegex(home, r'url\("/static/images/pexels-clickerhappy-3797\.[0-9a-f]{12}\.webp"\) type\("image/webp"\)')
+        self.assertIn('skipped /shop/: uses a CSRF token', report)
+        self.assertFalse((self.output / 'shop' / 'index.html').exists())
+
+    def test_critical_css_is_inlined_and_the_stylesheet_does_not_block(self):
+        self.prerender()
+        home = (self.output / 'index.html').read_text()
+        inlined = re.search(r'<style>(.*?)</style>', home, re.S).group(1)
+        self.assertIn('.nav-professional{', inlined)
+        self.assertNotIn('.cards-grid', inlined)  # only in page templates
+        self.assertRegex(home, r'<link rel="stylesheet" href="/static/css/style\.[0-9a-f]{12}\.css" media="print" onload=')
+        self.assertRegex(home, r'<noscript><link rel="stylesheet" href="/static/css/style\.[0-9a-f]{12}\.css"></noscript>')
+
+    def test_exported_pages_fetch_the_visitors_nav(self):
+        self.prerender()
+        home = (self.output / 'index.html').read_text()
+        self.assertIn(f'<body data-prerendered class="font-inter bg-primary-black text-white" data-nav-url="{reverse("site_nav")}">', home)
+
+        cache.clear()
+        member = User.objects.create_user('member')
+        CartItem.objects.create(user=member, item=ShopItem.objects.create(name='Gloves', price=Decimal('10.00')), quantity=2)
+        self.client.force_login(member)
+        response = self.client.get(reverse('site_nav'))
+        self.assertContains(response, reverse('logout'))
+        self.assertContains(response, '<span class="cart-badge">2</span>', html=True)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(self.client.get(reverse('site_nav'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_rebuild_only_renders_changed_pages(self):
+        self.prerender()
+        self.assertIn(' 0 rendered,', self.prerender())
+
+        Service.objects.create(name='Conditioning', link='/services', order=2)
+        self.assertIn(' 1 rendered,', self.prerender())
+
+
+class StaticBuildTests(TestCase):
+    def setUp(self):
+        self.source = source = Path(tempfile.mkdtemp())
+        self.static_root = Path(tempfile.mkdtemp())
+        for directory in (source, self.static_root):
+            self.addCleanup(shutil.rmtree, directory)
+        (source / 'images').mkdir()
+        (source / 'css').mkdir()
+        Image.linear_gradient('L').resize((800, 400)).convert('RGB').save(source / 'images' / 'hero.jpg', quality=100)
+        (source / 'js').mkdir()
+        (source / 'js' / 'script.js').write_text('// Greeting\nconsole.log( "hello" );\n')
+        (source / 'css' / 'style.css').write_text(
+            '.nav-professional { color: red; }\n'
+            + ''.join(f'.unused-{i} {{ color: blue; }}\n' for i in range(100))
+            + '@media (max-width: 600px) { .nav-professional { color: white; } .unused-0 { color: black; } }\n'
+        )
+        overrides = override_settings(
+            STATICFILES_DIRS=[source], STATICFILES_FINDERS=[FILE_SYSTEM_FINDER], STATIC_ROOT=self.static_root,
+            STATIC_IMAGE_MAX_WIDTH=200,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def build(self):
+        stdout = StringIO()
+        call_command('build_static', ignore_patterns=['admin'], stdout=stdout)
+        manifest = json.loads((self.static_root / 'staticfiles.json').read_text())['paths']
+        return stdout.getvalue(), manifest
+
+    def test_images_are_shrunk_converted_and_fingerprinted(self):
+        report, manifest = self.build()
+        hashed = manifest['images/hero.jpg']
+        self.assertRegex(hashed, r'^images/hero\.[0-9a-f]{12}\.jpg$')
+        self.assertEqual(Image.open(self.static_root / hashed).width, 200)
+        self.assertIn('images/hero.webp', manifest)
+        self.assertIn('images/hero.jpg', report)
+        self.assertIn('total:', report)
+
+    def test_css_and_js_are_minified_and_compressed(self):
+        _, manifest = self.build()
+        self.assertTrue((self.static_root / f"{manifest['css/style.css']}.gz").exists())
+        self.assertTrue((self.static_root / manifest['css/style.css']).read_text().startswith('.nav-professional{color:red}'))
+        self.assertEqual((self.static_root / manifest['js/script.js']).read_text(), 'console.log("hello");')
+        critical = (self.static_root / manifest['css/style.critical.css']).read_text()
+        self.assertEqual(critical, '.nav-professional{color:red}\n@media (max-width:600px){.nav-professional{color:white}}')
+        self.assertNotIn('unused', critical)
+
+    def test_inlined_critical_css_points_at_the_fingerprinted_files(self):
+        (self.source / 'css' / 'style.css').write_text(".nav-professional { background: url('../images/hero.jpg'); }")
+        self.build()
+        storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': 'boxing_app.storage.OptimizedStaticFilesStorage'}}
+        with override_settings(STORAGES=storages):
+            html = Template("{% load asset_tags %}{% stylesheet 'css/style.css' %}").render(Context())
+        self.assertRegex(html, r'<style>\.nav-professional\{background:url\("/static/images/hero\.[0-9a-f]{12}\.jpg"\)\}</style>')
+        self.assertIn('media="print"', html)
+
+    def test_unchanged_images_are_not_re_encoded(self):
+        self.build()
+        collected = self.static_root / 'images' / 'hero.jpg'
+        mtime = collected.stat().st_mtime_ns
+        self.build()
+        self.assertEqual(collected.stat().st_mtime_ns, mtime)
+
+    def test_critical_css_keeps_rules_for_the_markup(self):
+        css = 'body { margin: 0; } a:hover { color: red; } .card > .title { x: 1; } .modal { x: 2; } @font-face { font-family: X; }'
+        kept = critical_css(css, '<div class="card {% if a %}open{% endif %}"><a class="title">x</a></div>')
+        self.assertEqual(kept.split('\n'), [
+            'body{margin: 0;}', 'a:hover{color: red;}', '.card > .title{x: 1;}', '@font-face{font-family: X;}',
+        ])
+
+    def test_stylesheet_without_a_build_is_a_plain_link(self):
+        html = Template("{% load asset_tags %}{% stylesheet 'css/style.css' %}").render(Context())
+        self.assertEqual(html, '<link rel="stylesheet" href="/static/css/style.css">')
+
+    def test_static_picture_without_a_build_is_a_plain_img(self):
+        html = Template("{% load image_tags %}{% static_picture 'images/hero.jpg' alt='Hero' %}").render(Context())
+        self.assertNotIn('<picture', html)
+        self.assertIn('src="/static/images/hero.jpg" alt="Hero"', html)
+
+
+class AssetBundleTests(TestCase):
+    def test_pages_link_and_preload_their_bundles(self):
+        html = self.client.get(reverse('home')).content.decode()
+        self.assertIn('<link rel="stylesheet" href="/static/css/style.css">', html)
+        self.assertIn('<link rel="preload" href="/static/js/pages/home.js" as="script">', html)
+        self.assertIn('<script src="/static/js/pages/home.js"></script>', html)
+        # Only the Tailwind config is still inline
+        self.assertEqual(html.count('<script>'), 1)
+        self.assertNotIn('<style>', html)
+
+    def test_shop_script_settings_come_from_the_page(self):
+        html = self.client.get(reverse('shop'), {'category': 'gloves'}).content.decode()
+        self.assertIn(f'data-catalog-url="{reverse("catalog_api")}"', html)
+        self.assertIn('data-category="gloves"', html)
+
+    def test_page_weight_report(self):
+        stdout = StringIO()
+        call_command('benchmark_page_weight', stdout=stdout)
+        self.assertRegex(stdout.getvalue(), r'js/pages/home\.js +[\d.]+ KB ->')
+
+
+def jpeg_upload(name, size=(100, 50)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        overrides = override_settings(
+            MEDIA_ROOT=media, IMAGE_WIDTHS=[32, 64], IMAGE_THUMBNAIL_SIZE=20, IMAGE_DERIVATIVES_BACKGROUND=False,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.storage = ShopItem._meta.get_field('image').storage
+
+    def upload(self, item, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            item.image = jpeg_upload(name)
+            item.save()
+        item.refresh_from_db()
+        return item
+
+    def test_upload_builds_variants_and_metadata(self):
+        item = self.upload(ShopItem(name='Gloves', price=Decimal('10.00')), 'gloves.jpg')
+        meta = item.image_variants
+        self.assertEqual(meta['source'], item.image.name)
+        self.assertEqual((meta['width'], meta['height'], meta['widths']), (100, 50, [32, 64]))
+        for width in meta['widths']:
+            for fmt in meta['formats']:
+                name = images.variant_name(item.image.name, f'{width}w', fmt)
+                with self.storage.open(name) as file:
+                    self.assertEqual(Image.open(file).width, width)
+        self.assertTrue(self.storage.exists(images.variant_name(item.image.name, 'thumb', 'webp')))
+
+    def test_replacing_the_image_rebuilds_variants(self):
+        item = self.upload(ShopItem(name='Gloves', price=Decimal('10.00')), 'gloves.jpg')
+        item = self.upload(item, 'mitts.jpg')
+        self.assertEqual(item.image_variants['source'], item.image.name)
+        self.assertIn('mitts', item.image_variants['source'])
+
+    def test_picture_markup_and_admin_thumbnail(self):
+        item = ShopItem.objects.create(name='Gloves', price=Decimal('10.00'), image='shop/missing.jpg')
+        html = Template('{% load image_tags %}{% responsive_image item sizes="160px" alt="x" %}').render(Context({'item': item}))
+        self.assertNotIn('<picture', html)
+        self.assertIn(item.image.url, thumbnail(item))
+
+        item = self.upload(item, 'gloves.jpg')
+        html = Template('{% load image_tags %}{% responsive_image item sizes="160px" alt="x" %}').render(Context({'item': item}))
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn('64w" sizes="160px"', html)
+        self.assertIn('width="100" height="50"', html)
+        self.assertIn('/thumb.webp', thumbnail(item))
+
+    def test_catalog_api_returns_srcset(self):
+        self.upload(ShopItem(name='Gloves', price=Decimal('10.00')), 'gloves.jpg')
+        product = self.client.get(reverse('catalog_api')).json()['products'][0]
+        self.assertRegex(product['image_srcset'], r'/media/shop/variants/gloves/32w\.webp 32w, .*64w\.webp 64w$')
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        self.gloves = ShopItem.objects.create(
+            name='Pro Sparring Gloves', price=Decimal('89.00'), category='Gloves',
+            description='16oz leather gloves for sparring',
+        )
+        self.bag = ShopItem.objects.create(
+            name='Heavy Bag', price=Decimal('149.00'), category='Equipment',
+            description='Pairs well with bag gloves',
+        )
+        self.wraps = ShopItem.objects.create(
+            name='Hand Wraps', price=Decimal('9.00'), category='Accessories',
+            description='Cotton wraps',
+        )
+
+    def search(self, query):
+        return list(search_products(ShopItem.objects.filter(is_active=True), query))
+
+    def test_prefix_matching_and_ranking(self):
+        self.assertEqual(self.search('glov'), [self.gloves, self.bag])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search('leather sparring'), [self.gloves])
+        self.assertEqual(self.search('leather wraps'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.wraps.name = 'Gel Wraps'
+        self.wraps.save()
+        self.assertEqual(self.search('gel'), [self.wraps])
+        self.wraps.delete()
+        self.assertEqual(self.search('gel'), [])
+
+    def test_shop_view_search(self):
+        response = self.client.get(reverse('shop'), {'search': 'heavy'})
+        self.assertEqual(list(response.context['shop_items']), [self.bag])
+
+
+class ListingIndexTests(TestCase):
+    """Every public listing query must be answered from an index, not a table scan + sort"""
+
+    INDEX_PLAN = {
+        'sqlite': re.compile(r'USING (COVERING )?INDEX'),
+        'postgresql': re.compile(r'Index (Only )?Scan|Bitmap Index Scan'),
+    }
+    BAD_PLAN = {
+        'sqlite': re.compile(r'USE TEMP B-TREE|SCAN \S+$', re.MULTILINE),
+        'postgresql': re.compile(r'Seq Scan'),
+    }
+
+    LISTING_TABLES = re.compile(
+        r'FROM "boxing_app_(navbaritem|service|trainer|event|shopitem|trainingschedule|galleryimage|membershipplan)"'
+    )
+
+    def setUp(self):
+        cache.clear()
+        caches['template_fragments'].clear()
+        for i in range(5):
+            ShopItem.objects.create(name=f'Item {i}', price=Decimal(10 + i), order=i, category='Gloves' if i % 2 else 'Bags')
+        MembershipPlan.objects.create(name='Monthly', plan_type='beginner', price=Decimal('49.00'), features='Gym')
+
+    def listing_queries(self):
+        """The SELECTs on listing tables that the public pages and the catalog API run"""
+        requests = [(reverse(name), {}) for name in ('home', 'about', 'services', 'training_schedule', 'membership_plans')]
+        for sort in ('', *catalog.SORT_OPTIONS):
+            for category in ('', 'Gloves'):
+                requests.append((reverse('shop'), {'sort': sort, 'category': category}))
+                requests.append((reverse('catalog_api'), {'sort': sort, 'category': category}))
+        with self.settings(CATALOG_PAGE_SIZE=2), CaptureQueriesContext(connection) as ctx:
+            for url, params in requests:
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                # And the keyset query for the next page
+                cursor = response.json()['next_cursor'] if url == reverse('catalog_api') else None
+                if cursor:
+                    self.client.get(url, dict(params, cursor=cursor))
+        queries = list(dict.fromkeys(
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('SELECT') and self.LISTING_TABLES.search(query['sql'])
+        ))
+        self.assertTrue(any('"id" >' in sql for sql in queries))  # the cursor queries were captured
+        return queries
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables would otherwise always be seq-scanned
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+                return '\n'.join(row[0] for row in cursor.fetchall())
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+    def test_listing_queries_use_an_index(self):
+        if connection.vendor not in self.INDEX_PLAN:
+            self.skipTest(f'no EXPLAIN expectations for {connection.vendor}')
+        for sql in self.listing_queries():
+            with self.subTest(sql):
+                plan = self.explain(sql)
+                self.assertRegex(plan, self.INDEX_PLAN[connection.vendor])
+                self.assertNotRegex(plan, self.BAD_PLAN[connection.vendor])
+
+
+class MembershipPlansViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        MembershipPlan.objects.create(
+            name='Starter', plan_type='beginner', price=Decimal('40.00'),
+            original_price=Decimal('50.00'), features='Gym access, Group classes', display_order=1,
+        )
+        MembershipPlan.objects.create(
+            name='Fight Camp', plan_type='pro', price=Decimal('120.00'),
+            features='Sparring, Coaching', is_hot_sale=True, display_order=2,
+        )
+        MembershipPlan.objects.create(
+            name='Retired', plan_type='elite', price=Decimal('300.00'), features='-', is_active=False,
+        )
+
+    def test_cold_render_runs_one_plan_query(self):
+        self.client.get(reverse('membership_plans'))  # creates the default page content
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('membership_plans'))
+        plan_queries = [q for q in ctx.captured_queries if 'boxing_app_membershipplan' in q['sql']]
+        self.assertEqual(len(plan_queries), 1)
+
+    def test_plans_are_partitioned_and_precomputed(self):
+        context = self.client.get(reverse('membership_plans')).context
+        self.assertEqual([p.name for p in context['plans']], ['Starter'])
+        self.assertEqual([p.name for p in context['hot_sale_plans']], ['Fight Camp'])
+        self.assertEqual(
+            context['plan_categories'],
+            {'beginner': True, 'pro': True, 'elite': False, 'custom': False},
+        )
+        starter = context['plans'][0]
+        self.assertEqual(starter.features_list, ['Gym access', 'Group classes'])
+        self.assertEqual(starter.discount, 20)
+        self.assertEqual(starter.savings, Decimal('10.00'))
+        self.assertEqual(starter.duration_text, '1 Month')
+
+
+class CatalogApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(7):
+            ShopItem.objects.create(
+                name=f'Item {i}', price=Decimal(10 + i % 3), order=i,
+                category='Gloves' if i % 2 else 'Apparel', description='x' * 500,
+            )
+
+    def fetch_all(self, **params):
+        pages, cursor = [], None
+        while True:
+            query = dict(params, limit=3, **({'cursor': cursor} if cursor else {}))
+            data = self.client.get(reverse('catalog_api'), query).json()
+            pages.append(data['products'])
+            cursor = data['next_cursor']
+            if not cursor:
+                return pages
+
+    def test_keyset_pages_cover_every_product_once(self):
+        pages = self.fetch_all(sort='price_high_low')
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        products = [p for page in pages for p in page]
+        self.assertEqual(len({p['id'] for p in products}), 7)
+        prices = [p['price'] for p in products]
+        self.assertEqual(prices, sorted(prices, reverse=True))
+
+    def test_filters_and_field_projection(self):
+        data = self.client.get(reverse('catalog_api'), {'category': 'Gloves', 'fields': 'id,name,bogus'}).json()
+        self.assertEqual(len(data['products']), 3)
+        self.assertEqual(set(data['products'][0]), {'id', 'name'})
+
+    def test_default_fields_leave_out_description(self):
+        data = self.client.get(reverse('catalog_api')).json()
+        self.assertNotIn('description', data['products'][0])
+
+    def test_page_size_is_capped(self):
+        with self.settings(CATALOG_MAX_PAGE_SIZE=2):
+            data = self.client.get(reverse('catalog_api'), {'limit': 1000}).json()
+        self.assertEqual(len(data['products']), 2)
+
+    def test_search_pages_by_relevance(self):
+        pages = self.fetch_all(search='item')
+        self.assertEqual(sum(len(page) for page in pages), 7)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('catalog_api'), {'cursor': 'forged'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_is_only_valid_for_its_own_listing(self):
+        def next_cursor(**params):
+            return self.client.get(reverse('catalog_api'), dict(params, limit=3)).json()['next_cursor']
+
+        cursors = {
+            'relevance': ({'search': 'item'}, next_cursor(search='item')),
+            'price': ({'sort': 'price_low_high'}, next_cursor(sort='price_low_high')),
+        }
+        replays = [
+            ({'search': 'item', 'sort': 'price_low_high'}, 'relevance'),
+            ({}, 'price'),
+            ({'sort': 'name_a_z'}, 'price'),
+            ({'sort': 'price_low_high', 'category': 'Gloves'}, 'price'),
+        ]
+        for params, issued_for in replays:
+            cursor = cursors[issued_for][1]
+            response = self.client.get(reverse('catalog_api'), dict(params, cursor=cursor))
+            self.assertEqual(response.status_code, 400, (params, issued_for))
+        # Same listing: fine
+        params, cursor = cursors['price']
+        self.assertEqual(self.client.get(reverse('catalog_api'), dict(params, limit=3, cursor=cursor)).status_code, 200)
+
+    def test_etag_revalidation(self):
+        response = self.client.get(reverse('catalog_api'))
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('catalog_api'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        ShopItem.objects.create(name='New', price=Decimal('5.00'))
+        response = self.client.get(reverse('catalog_api'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_shop_page_renders_first_page(self):
+        with self.settings(CATALOG_PAGE_SIZE=5):
+            response = self.client.get(reverse('shop'))
+        self.assertEqual(len(response.context['shop_items']), 5)
+        self.assertTrue(response.context['next_cursor'])
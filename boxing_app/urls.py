@@ -36,8 +36,10 @@ urlpatterns = [
     path('clear-cart/', views.clear_cart, name='clear_cart'),
 
     # ------- AJAX ENDPOINTS -------
-    path('filter-products/', views.filter_products_ajax, name='filter_products'),
+    path('api/v1/catalog/', views.catalog_api, name='catalog_api'),
+    path('filter-products/', views.catalog_api, name='filter_products'),
     path('get-cart-count/', views.get_cart_count, name='get_cart_count'),
+    path('nav/', views.site_nav, name='site_nav'),
 
     # ------- EXTRA PAGES -------
     path('testimonials/', views.testimonials, name='testimonials'),
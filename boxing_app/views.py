@@ -1,17 +1,18 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, HttpResponseNotFound
-from django.db.models import Q
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import (
-    ShopItem, MembershipPlan, HomePageContent, GalleryImage, 
-    Trainer, Event, NavbarItem, Service, About, TrainingSchedule,
-    MembershipPageContent
-)
-from decimal import Decimal
+from .models import ShopItem, MembershipPlan, NavbarItem, About
+from . import catalog
+from . import content_cache
+from .page_cache import cache_anonymous_page
+import hashlib
 import json
 
 
@@ -19,63 +20,20 @@ import json
 def index(request):
     return render(request, 'boxing_app/index.html')
 
+@cache_anonymous_page('home')
 def home(request):
     """Home page view with all required data"""
-    # Get home page content or create default
-    home_content, created = HomePageContent.objects.get_or_create(
-        id=1,
-        defaults={
-            'title': "IT'S ALL ABOUT WHAT YOU CAN ACHIEVE",
-            'subtitle': "Empower yourself to make the changes you need to make. Elite boxing training for champions.",
-            'hero_button_1_text': "Start Training",
-            'hero_button_1_link': "/training-schedule",
-            'hero_button_2_text': "Learn More", 
-            'hero_button_2_link': "/about",
-        }
-    )
-    
-    # Get active data for the template
-    gallery_images = GalleryImage.objects.filter(is_active=True)
-    trainers = Trainer.objects.filter(is_active=True)
-    events = Event.objects.filter(is_active=True)
-    
-    context = {
-        'home_content': home_content,
-        'gallery_images': gallery_images,
-        'trainers': trainers,
-        'events': events,
-    }
-    
-    return render(request, 'boxing_app/home.html', context)
+    return render(request, 'boxing_app/home.html', content_cache.get('home'))
  
+@cache_anonymous_page('services')
 def services(request):
     """Services page view"""
-    services_list = Service.objects.filter(is_active=True)
-    return render(request, 'boxing_app/services.html', {'services': services_list})
+    return render(request, 'boxing_app/services.html', content_cache.get('services'))
 
+@cache_anonymous_page('about')
 def about(request):
     """About page view"""
-    try:
-        about_content = About.objects.first()
-        if not about_content:
-            # Create default about content if none exists
-            about_content = About.objects.create(
-                title="About Boxing Academy",
-                description="Welcome to our premier boxing academy...",
-                mission="To train champions and build character...",
-                contact_email="info@boxingacademy.com",
-                contact_phone="+1 (555) 123-4567",
-                address="123 Boxing Street, City, State 12345"
-            )
-    except Exception as e:
-        # Fallback if there's any issue
-        about_content = None
-    
-    trainers = Trainer.objects.filter(is_active=True)
-    return render(request, 'boxing_app/about.html', {
-        'about': about_content,
-        'trainers': trainers
-    })
+    return render(request, 'boxing_app/about.html', content_cache.get('about'))
 
 def contact(request):
     """Contact page view"""
@@ -94,20 +52,23 @@ def contact(request):
     
     return render(request, 'boxing_app/contact.html', {'about': about_content})
 
+@cache_anonymous_page('training_schedule')
 def training_schedule(request):
     """Training schedule page view"""
-    schedule = TrainingSchedule.objects.filter(is_active=True)
-    return render(request, 'boxing_app/training_schedule.html', {'schedule': schedule})
+    return render(request, 'boxing_app/training_schedule.html', content_cache.get('training_schedule'))
 
 # -------------------- EXTRA PAGES --------------------
+@cache_anonymous_page()
 def facilities(request):
     """Facilities page view"""
     return render(request, 'boxing_app/facilities.html')
 
+@cache_anonymous_page()
 def testimonials(request):
     """Testimonials page view"""
     return render(request, 'boxing_app/testimonials.html')
 
+@cache_anonymous_page()
 def motivational(request):
     """Motivational page view"""
     return render(request, 'boxing_app/motivational.html')
@@ -145,51 +106,24 @@ def bmi_calculator(request):
 
 # -------------------- SHOP & PRODUCTS --------------------
 def shop(request):
-    """Display all products with filtering, sorting, and search"""
+    """Display the first page of products with filtering, sorting, and search"""
     category = request.GET.get('category', '')
     sort_by = request.GET.get('sort', '')
     search_query = request.GET.get('search', '')
 
-    products = ShopItem.objects.filter(is_active=True)
-
-    # Search filter
-    if search_query:
-        products = products.filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(category__icontains=search_query)
-        )
-
-    # Category filter
-    if category:
-        products = products.filter(category=category)
-
-    # Sorting
-    sort_options = {
-        'price_low_high': 'price',
-        'price_high_low': '-price',
-        'name_a_z': 'name',
-        'name_z_a': '-name',
-    }
-    if sort_by in sort_options:
-        products = products.order_by(sort_options[sort_by])
-    else:
-        products = products.order_by('order')
-
-    # Unique category list
-    categories = ShopItem.objects.filter(is_active=True).values_list('category', flat=True).distinct()
-
-    # Get cart count for display
-    cart = request.session.get('cart', {})
-    cart_count = sum(cart.values())
+    # Search (ranked best match first unless a sort is picked) and category filter
+    products = catalog.filtered_products(category, search_query)
+    shop_items, next_cursor = catalog.get_page(
+        products, catalog.sort_key(sort_by, search_query), scope=[category, search_query],
+    )
 
     context = {
-        'shop_items': products,
-        'categories': [(cat, cat) for cat in categories if cat],
+        'shop_items': shop_items,
+        'next_cursor': next_cursor,
+        'categories': content_cache.get('shop_categories')['categories'],
         'selected_category': category,
         'selected_sort': sort_by,
         'search_query': search_query,
-        'cart_count': cart_count,
     }
 
     return render(request, 'boxing_app/shop.html', context)
@@ -208,26 +142,10 @@ def product_detail(request, product_id):
 
 # -------------------- CART SYSTEM --------------------
 def add_to_cart(request, product_id):
-    """Adds product to session cart"""
-    # Ensure cart exists in session
-    if 'cart' not in request.session:
-        request.session['cart'] = {}
-    
+    """Adds product to the cart"""
     product = get_object_or_404(ShopItem, id=product_id, is_active=True)
-    cart = request.session['cart']
+    request.cart.add(product.id)
 
-    # Convert to string for JSON compatibility
-    product_id_str = str(product_id)
-    
-    # Add or update quantity
-    if product_id_str in cart:
-        cart[product_id_str] += 1
-    else:
-        cart[product_id_str] = 1
-    
-    # Save the session
-    request.session.modified = True
-    
     messages.success(request, f'{product.name} added to cart!')
     
     # For AJAX requests
@@ -235,63 +153,32 @@ def add_to_cart(request, product_id):
         return JsonResponse({
             'success': True,
             'message': f'{product.name} added to cart!',
-            'cart_count': sum(cart.values())
+            'cart_count': request.cart.totals().count
         })
     
     # Redirect back to shop or where it came from
     return redirect('shop')
 
 def cart(request):
-    """Displays items currently in session cart"""
-    cart = request.session.get('cart', {})
-    cart_items = []
-    subtotal = Decimal('0.00')
-    cart_count = 0
-
-    for product_id_str, quantity in cart.items():
-        try:
-            product_id = int(product_id_str)
-            product = ShopItem.objects.get(id=product_id, is_active=True)
-            item_subtotal = product.price * Decimal(quantity)
-            cart_items.append({
-                'product': product, 
-                'quantity': quantity, 
-                'subtotal': item_subtotal,
-                'product_id': product.id
-            })
-            subtotal += item_subtotal
-            cart_count += quantity
-        except (ShopItem.DoesNotExist, ValueError):
-            if product_id_str in cart:
-                del cart[product_id_str]
-                request.session.modified = True
-
-    # Calculate shipping, tax, and total using Decimal
-    shipping = Decimal('0.00') if subtotal > Decimal('100.00') else Decimal('15.00')
-    tax = subtotal * Decimal('0.08')
-    total = subtotal + shipping + tax
+    """Displays items currently in the cart"""
+    summary = request.cart.hydrate()
 
     context = {
-        'cart_items': cart_items,
-        'subtotal': subtotal,
-        'shipping': shipping,
-        'tax': tax,
-        'total': total,
-        'cart_count': cart_count
+        'cart_items': summary.items,
+        'subtotal': summary.subtotal,
+        'shipping': summary.shipping,
+        'tax': summary.tax,
+        'total': summary.total,
+        'cart_count': summary.count
     }
     
     return render(request, 'boxing_app/cart.html', context)
 
 def remove_from_cart(request, product_id):
     """Removes a product from the cart"""
-    cart = request.session.get('cart', {})
-    product_id_str = str(product_id)
-
-    if product_id_str in cart:
+    if product_id in request.cart:
         product = get_object_or_404(ShopItem, id=product_id)
-        del cart[product_id_str]
-        request.session['cart'] = cart
-        request.session.modified = True
+        request.cart.remove(product_id)
         messages.success(request, f'{product.name} removed from cart!')
     else:
         messages.error(request, 'Item not found in cart!')
@@ -300,14 +187,9 @@ def remove_from_cart(request, product_id):
 
 def increase_quantity(request, product_id):
     """Increases quantity of product in cart"""
-    cart = request.session.get('cart', {})
-    product_id_str = str(product_id)
-    
-    if product_id_str in cart:
+    if product_id in request.cart:
         product = get_object_or_404(ShopItem, id=product_id)
-        cart[product_id_str] += 1
-        request.session['cart'] = cart
-        request.session.modified = True
+        request.cart.increase(product_id)
         messages.success(request, f'Increased {product.name} quantity!')
     else:
         messages.error(request, 'Item not found in cart!')
@@ -316,27 +198,18 @@ def increase_quantity(request, product_id):
 
 def decrease_quantity(request, product_id):
     """Decreases quantity of product in cart"""
-    cart = request.session.get('cart', {})
-    product_id_str = str(product_id)
-    
-    if product_id_str in cart:
+    if product_id in request.cart:
         product = get_object_or_404(ShopItem, id=product_id)
-        if cart[product_id_str] > 1:
-            cart[product_id_str] -= 1
+        if request.cart.decrease(product_id):
             messages.success(request, f'Decreased {product.name} quantity!')
         else:
-            del cart[product_id_str]
             messages.success(request, f'{product.name} removed from cart!')
         
-        request.session['cart'] = cart
-        request.session.modified = True
-        
     return redirect('cart')
 
 def clear_cart(request):
     """Clears all items from the cart"""
-    request.session['cart'] = {}
-    request.session.modified = True
+    request.cart.clear()
     messages.success(request, 'Cart cleared successfully!')
     return redirect('cart')
 
@@ -348,86 +221,65 @@ def membership_detail(request, plan_name):
 
 def membership_plans(request):
     """Display all membership plans"""
-    # Get all active plans
-    plans = MembershipPlan.objects.filter(is_active=True).order_by('display_order')
-    
-    # Separate hot sale plans
-    hot_sale_plans = plans.filter(is_hot_sale=True)
-    regular_plans = plans.filter(is_hot_sale=False)
-    
-    # Get plan categories for filtering
-    plan_categories = {
-        'beginner': plans.filter(plan_type='beginner').exists(),
-        'pro': plans.filter(plan_type='pro').exists(),
-        'elite': plans.filter(plan_type='elite').exists(),
-        'custom': plans.filter(plan_type='custom').exists(),
-    }
-    
-    # Get membership page content
-    membership_content, created = MembershipPageContent.objects.get_or_create(
-        id=1,
-        defaults={
-            'title': 'CHAMPIONSHIP',
-            'subtitle': 'MEMBERSHIP PLANS',
-            'description': 'Choose the perfect training program to unleash your potential and join our championship legacy',
-            'hot_sale_title': 'HOT SALE - LIMITED TIME OFFER',
-            'hot_sale_description': 'Special discounted plans for a limited time. Don\'t miss this opportunity!'
-        }
-    )
-    
-    return render(request, 'boxing_app/membership_plans.html', {
-        'plans': regular_plans,
-        'hot_sale_plans': hot_sale_plans,
-        'plan_categories': plan_categories,
-        'membership_content': membership_content
-    })
+    return render(request, 'boxing_app/membership_plans.html', content_cache.get('membership_plans'))
 
 # -------------------- AJAX ENDPOINTS --------------------
-def filter_products_ajax(request):
-    """AJAX filter endpoint"""
-    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
-        category = request.GET.get('category', '')
-        sort_by = request.GET.get('sort', '')
-        search_query = request.GET.get('search', '')
-
-        products = ShopItem.objects.filter(is_active=True)
-
-        if search_query:
-            products = products.filter(
-                Q(name__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(category__icontains=search_query)
-            )
-
-        if category:
-            products = products.filter(category=category)
-
-        sort_options = {
-            'price_low_high': 'price',
-            'price_high_low': '-price',
-            'name_a_z': 'name',
-            'name_z_a': '-name',
-        }
-        if sort_by in sort_options:
-            products = products.order_by(sort_options[sort_by])
+def catalog_etag(request):
+    """Changes whenever a ShopItem is saved/deleted or the query changes"""
+    version = content_cache.get_versions([ShopItem])[0]
+    query = sorted(request.GET.items())
+    return hashlib.md5(f'{version}:{query}'.encode()).hexdigest()
+
+@condition(etag_func=catalog_etag)
+def catalog_api(request):
+    """JSON catalog: keyset-paginated, field-projected product listing
+
+    Query parameters: ``category``, ``search``, ``sort``, ``fields``
+    (comma separated), ``limit`` (capped at CATALOG_MAX_PAGE_SIZE) and
+    ``cursor`` (the ``next_cursor`` of the previous page).
+    """
+    category = request.GET.get('category', '')
+    search_query = request.GET.get('search', '')
+    fields = catalog.parse_fields(request.GET.get('fields'))
 
-        product_data = [{
-            'id': p.id,
-            'name': p.name,
-            'price': float(p.price),
-            'category': p.category,
-            'image_url': p.image.url if p.image else '',
-            'description': p.description,
-        } for p in products]
+    products = catalog.filtered_products(category, search_query)
+    try:
+        rows, next_cursor = catalog.get_page(
+            products,
+            catalog.sort_key(request.GET.get('sort', ''), search_query),
+            cursor=request.GET.get('cursor'),
+            limit=request.GET.get('limit'),
+            fields=fields,
+            scope=[category, search_query],
+        )
+    except catalog.InvalidCursor:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
 
-        return JsonResponse({'products': product_data})
+    return JsonResponse({
+        'products': catalog.serialize(rows, fields),
+        'next_cursor': next_cursor,
+    })
 
-    return JsonResponse({'error': 'Invalid request'}, status=400)
+def cart_etag(request):
+    """Changes whenever the visitor's cart or the catalog does"""
+    return request.cart.totals().version
 
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
+@condition(etag_func=cart_etag)
 def get_cart_count(request):
-    """AJAX endpoint: get current cart count"""
-    cart = request.session.get('cart', {})
-    return JsonResponse({'cart_count': sum(cart.values())})
+    """AJAX endpoint: get current cart count (a 304 while the cart is unchanged)"""
+    return JsonResponse({'cart_count': request.cart.totals().count})
+
+def nav_etag(request):
+    return f'{int(request.user.is_authenticated)}.{request.cart.totals().version}'
+
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
+@condition(etag_func=nav_etag)
+def site_nav(request):
+    """The navigation bar for this visitor; pre-rendered (logged-out) pages swap it in"""
+    return render(request, 'boxing_app/nav.html')
 
 # -------------------- USER AUTH --------------------
    # -------------------- USER AUTH --------------------
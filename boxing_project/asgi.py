@@ -2,6 +2,8 @@
 ASGI config for boxing_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+This is what production serves (see Procfile) so that the async chatbot
+view can wait on the LLM without holding a worker.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
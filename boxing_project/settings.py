@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'boxing_app',  # ✅ Add this line
+    'chatbot',
 ]
 
 MIDDLEWARE = [
@@ -49,6 +50,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'boxing_app.cart.CartMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -68,13 +70,26 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'boxing_app.context_processors.cart_totals',
             ],
         },
     },
 ]
 
+# Production keeps parsed templates in memory. Under DEBUG Django picks the
+# loaders itself and drops its cached copies when a template file changes.
+if not DEBUG:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 
 WSGI_APPLICATION = 'boxing_project.wsgi.application'
+ASGI_APPLICATION = 'boxing_project.asgi.application'
 
 
 # Database
@@ -94,6 +109,128 @@ else:
     }
 
 
+# Cache
+# Production runs several workers (Procfile), so point CACHE_BACKEND at a
+# shared backend (Redis, see .env.example). The default cache holds the
+# content versions (boxing_app.content_cache), member cart versions and totals
+# behind the cart-count ETag (boxing_app.cart) and the chatbot rate-limit
+# buckets (chatbot.ratelimit); on a per-process LocMemCache a worker keeps
+# serving stale content and carts after another saved a change, and each
+# worker hands out its own rate limit.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='boxing-cache'),
+    },
+    # Chatbot answers keyed on the normalized question (chatbot.response_cache).
+    # LocMemCache evicts the least recently used entry once MAX_ENTRIES is reached.
+    'chatbot': {
+        'BACKEND': config('CHATBOT_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CHATBOT_CACHE_LOCATION', default='boxing-chatbot'),
+        'TIMEOUT': config('CHATBOT_CACHE_TIMEOUT', default=60 * 60 * 6, cast=int),
+        'OPTIONS': {'MAX_ENTRIES': config('CHATBOT_CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    },
+    # Rendered markup: {% cache %} fragments of the base layout and whole
+    # anonymous pages (boxing_app.page_cache). Templates only change with a
+    # deploy, so keep it per process or give each release its own KEY_PREFIX
+    # on a shared backend.
+    'template_fragments': {
+        'BACKEND': config('TEMPLATE_FRAGMENT_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('TEMPLATE_FRAGMENT_CACHE_LOCATION', default='boxing-fragments'),
+        'KEY_PREFIX': config('TEMPLATE_FRAGMENT_CACHE_KEY_PREFIX', default=''),
+    },
+    # Sessions read through this cache (SESSION_ENGINE below). With more than
+    # one app server process it must be shared (Redis, Memcached): a
+    # per-process copy would keep serving a session after another process
+    # changed or deleted it (e.g. on logout).
+    'sessions': {
+        'BACKEND': config('SESSION_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('SESSION_CACHE_LOCATION', default='boxing-sessions'),
+    },
+}
+
+# With a shared session cache, sessions are read from the cache and only fall
+# back to the database on a miss; Django writes them only when they change
+# (carts are not in the session, see boxing_app.cart). On the per-process
+# LocMemCache they stay in the database: the Procfile runs several workers,
+# and a logout in one would leave the session cached in the others.
+# `manage.py purge_sessions` deletes expired rows in batches, e.g. from a
+# daily scheduled job.
+SESSION_ENGINE = config(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.db' if CACHES['sessions']['BACKEND'].endswith('.LocMemCache')
+    else 'django.contrib.sessions.backends.cached_db',
+)
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Seconds a cached page content entry lives (entries are also invalidated on save/delete)
+CONTENT_CACHE_TIMEOUT = config('CONTENT_CACHE_TIMEOUT', default=60 * 60, cast=int)
+
+# Whole pages served to anonymous visitors with an empty cart: seconds kept on
+# the server (saves in the admin invalidate them sooner) and the max-age
+# browsers and proxies are allowed to reuse them for
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=60 * 60, cast=int)
+PAGE_CACHE_MAX_AGE = config('PAGE_CACHE_MAX_AGE', default=60, cast=int)
+
+
+# Shop catalog paging (shop page and /api/v1/catalog/)
+CATALOG_PAGE_SIZE = 24
+CATALOG_MAX_PAGE_SIZE = 100
+
+
+# Chatbot LLM (any OpenAI-compatible chat completions API, e.g. the
+# `manage.py stub_llm_server` stub for local load tests)
+OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
+OPENAI_API_BASE = config('OPENAI_API_BASE', default='https://api.openai.com/v1/')
+OPENAI_MODEL = config('OPENAI_MODEL', default='gpt-3.5-turbo')
+LLM_TIMEOUT = config('LLM_TIMEOUT', default=10.0, cast=float)
+LLM_CONNECT_TIMEOUT = config('LLM_CONNECT_TIMEOUT', default=3.0, cast=float)
+LLM_MAX_CONNECTIONS = config('LLM_MAX_CONNECTIONS', default=20, cast=int)
+LLM_MAX_CONCURRENCY = config('LLM_MAX_CONCURRENCY', default=8, cast=int)
+# Calls that may wait for a free slot per worker; more are refused with a 429
+LLM_MAX_QUEUE = config('LLM_MAX_QUEUE', default=16, cast=int)
+# Local boxing-topic classifier (chatbot.topic_classifier), written by train_topic_classifier.
+# Messages scoring between REJECT and ACCEPT are still sent to the model.
+CHATBOT_CLASSIFIER_PATH = config('CHATBOT_CLASSIFIER_PATH', default=str(BASE_DIR / 'var' / 'topic_classifier.json'))
+CHATBOT_CLASSIFIER_ACCEPT = config('CHATBOT_CLASSIFIER_ACCEPT', default=0.8, cast=float)
+CHATBOT_CLASSIFIER_REJECT = config('CHATBOT_CLASSIFIER_REJECT', default=0.15, cast=float)
+CHATBOT_CLASSIFIER_MAX_HISTORY = config('CHATBOT_CLASSIFIER_MAX_HISTORY', default=50_000, cast=int)
+# The yes/no boxing check gets a much shorter deadline than full answers
+LLM_CLASSIFY_TIMEOUT = config('LLM_CLASSIFY_TIMEOUT', default=2.5, cast=float)
+# Circuit breaker (chatbot.circuit): once LLM_BREAKER_FAILURE_RATE of the last
+# LLM_BREAKER_WINDOW calls (and at least LLM_BREAKER_MIN_CALLS) failed, the model is
+# not called for LLM_BREAKER_COOLDOWN seconds and the keyword/canned fallbacks answer
+LLM_BREAKER_WINDOW = config('LLM_BREAKER_WINDOW', default=20, cast=int)
+LLM_BREAKER_MIN_CALLS = config('LLM_BREAKER_MIN_CALLS', default=5, cast=int)
+LLM_BREAKER_FAILURE_RATE = config('LLM_BREAKER_FAILURE_RATE', default=0.5, cast=float)
+LLM_BREAKER_COOLDOWN = config('LLM_BREAKER_COOLDOWN', default=30.0, cast=float)
+
+# Token buckets for the chatbot API (chatbot.ratelimit), kept in the default cache:
+# requests per minute and burst size, per user when logged in, per client IP otherwise.
+CHATBOT_USER_RATE_PER_MINUTE = config('CHATBOT_USER_RATE_PER_MINUTE', default=20, cast=int)
+CHATBOT_USER_BURST = config('CHATBOT_USER_BURST', default=10, cast=int)
+CHATBOT_ANON_RATE_PER_MINUTE = config('CHATBOT_ANON_RATE_PER_MINUTE', default=10, cast=int)
+CHATBOT_ANON_BURST = config('CHATBOT_ANON_BURST', default=5, cast=int)
+# Number of reverse proxies in front of the app that append to X-Forwarded-For
+# (1 on Heroku/Render); 0 trusts only REMOTE_ADDR
+CHATBOT_PROXY_COUNT = config('CHATBOT_PROXY_COUNT', default=0, cast=int)
+
+# Chat history is queued in memory and written with bulk_create (chatbot.history):
+# every CHAT_HISTORY_FLUSH_INTERVAL seconds or once CHAT_HISTORY_BATCH_SIZE messages
+# are waiting. CHAT_HISTORY_MAX_PENDING bounds the loss if a worker is killed: once
+# that many messages are unwritten, the request writes them itself. 0 writes every
+# message inside its request.
+CHAT_HISTORY_BATCH_SIZE = config('CHAT_HISTORY_BATCH_SIZE', default=50, cast=int)
+CHAT_HISTORY_FLUSH_INTERVAL = config('CHAT_HISTORY_FLUSH_INTERVAL', default=2.0, cast=float)
+CHAT_HISTORY_MAX_PENDING = config('CHAT_HISTORY_MAX_PENDING', default=200, cast=int)
+
+# archive_chat_history moves messages older than this many days into gzipped
+# JSONL files (one per month) under CHAT_HISTORY_ARCHIVE_DIR
+CHAT_HISTORY_RETENTION_DAYS = config('CHAT_HISTORY_RETENTION_DAYS', default=90, cast=int)
+CHAT_HISTORY_ARCHIVE_DIR = config('CHAT_HISTORY_ARCHIVE_DIR', default=str(BASE_DIR / 'archive' / 'chat_history'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -132,9 +269,36 @@ USE_TZ = True
 # settings.py
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'boxing_app/static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Responsive copies of uploaded photos (boxing_app.images): widths in px,
+# admin thumbnail size, and whether uploads are processed in a background
+# thread (otherwise right after the save commits, inside the request)
+IMAGE_WIDTHS = [320, 640, 1024, 1600]
+IMAGE_THUMBNAIL_SIZE = 100
+IMAGE_DERIVATIVES_BACKGROUND = config('IMAGE_DERIVATIVES_BACKGROUND', default=True, cast=bool)
+
+# collectstatic in production (boxing_app.storage): photos are re-encoded at
+# most this wide with AVIF/WebP copies, our CSS/JS is minified, everything
+# gets a content hash in its name and gzip/brotli copies, and these
+# stylesheets get a `.critical.css` with just the rules the page shell uses,
+# inlined by `{% stylesheet %}` (asset_tags) so the full file doesn't block rendering
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'boxing_app.storage.OptimizedStaticFilesStorage',
+    },
+}
+STATIC_IMAGE_MAX_WIDTH = 1920
+STATIC_MINIFY = ['css/*.css', 'js/*.js']
+STATIC_CRITICAL_CSS = ['css/style.css']
+
+# Output of `manage.py prerender` (static HTML export of the public pages)
+PRERENDER_DIR = BASE_DIR / 'dist'
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
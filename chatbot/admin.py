@@ -1,18 +1,60 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from . import llm, response_cache
 from .models import BoxingFAQ, ChatHistory, TrainingSchedule, MembershipPlan
 
 @admin.register(BoxingFAQ)
 class BoxingFAQAdmin(admin.ModelAdmin):
-    list_display = ['question', 'is_active', 'created_at']
+    list_display = ['question', 'priority', 'is_active', 'created_at']
+    list_editable = ['priority']
     list_filter = ['is_active', 'created_at']
     search_fields = ['question', 'answer', 'keywords']
 
+class EstimatedCountPaginator(Paginator):
+    """Uses the planner's row estimate for unfiltered lists of large PostgreSQL tables.
+
+    An exact COUNT(*) over millions of chat messages takes seconds on every
+    changelist page; the estimate is free and close enough for page links.
+    """
+    exact_below = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] >= self.exact_below:
+                    return row[0]
+        return super().count
+
 @admin.register(ChatHistory)
 class ChatHistoryAdmin(admin.ModelAdmin):
     list_display = ['user', 'user_message', 'is_boxing_related', 'created_at']
     list_filter = ['is_boxing_related', 'created_at']
     search_fields = ['user_message', 'bot_response']
     readonly_fields = ['created_at']
+    # Keep the changelist fast with millions of rows: one joined query for
+    # users, no second COUNT(*) for the "show all" total, estimated page count
+    list_select_related = ['user']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {
+            **(extra_context or {}),
+            'cache_stats': response_cache.get_stats(),
+            'breaker': llm.breaker.metrics(),
+        }
+        return super().changelist_view(request, extra_context)
 
 @admin.register(TrainingSchedule)
 class TrainingScheduleAdmin(admin.ModelAdmin):
@@ -0,0 +1,121 @@
+"""
+Circuit breaker for calls to an unreliable service (the model API).
+
+The breaker keeps the outcomes of the last ``LLM_BREAKER_WINDOW`` calls.
+Once at least ``LLM_BREAKER_MIN_CALLS`` of them are recorded and the share
+of failures reaches ``LLM_BREAKER_FAILURE_RATE``, it opens: calls are
+refused instantly for ``LLM_BREAKER_COOLDOWN`` seconds. After that it is
+half-open and lets a single trial call through; success closes it again,
+failure re-opens it for another cooldown.
+
+State is per process, like the connection pool it protects.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    def __init__(self, name, window=None, min_calls=None, failure_rate=None, cooldown=None):
+        self.name = name
+        # None reads the setting on every use, so override_settings applies
+        self._window = window
+        self._min_calls = min_calls
+        self._failure_rate = failure_rate
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+        self.reset()
+
+    def _setting(self, value, name):
+        return value if value is not None else getattr(settings, name)
+
+    @property
+    def window(self):
+        return self._setting(self._window, 'LLM_BREAKER_WINDOW')
+
+    @property
+    def min_calls(self):
+        return self._setting(self._min_calls, 'LLM_BREAKER_MIN_CALLS')
+
+    @property
+    def failure_rate(self):
+        return self._setting(self._failure_rate, 'LLM_BREAKER_FAILURE_RATE')
+
+    @property
+    def cooldown(self):
+        return self._setting(self._cooldown, 'LLM_BREAKER_COOLDOWN')
+
+    def reset(self):
+        with self._lock:
+            self.state = CLOSED
+            self._outcomes = deque()
+            self._opened_at = 0.0
+            self._trial_running = False
+            self.counters = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def allow(self):
+        """Whether a call may go ahead now; every allowed call must end in ``record()`` or ``release()``"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                logger.info("Circuit %s half-open, sending a trial call", self.name)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.counters['rejected'] += 1
+            return False
+
+    def record(self, success):
+        with self._lock:
+            self.counters['successes' if success else 'failures'] += 1
+            if self.state == HALF_OPEN:
+                self._trial_running = False
+                if success:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                    logger.info("Circuit %s closed", self.name)
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            while len(self._outcomes) > self.window:
+                self._outcomes.popleft()
+            failures = self._outcomes.count(False)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def release(self):
+        """End an allowed call that neither succeeded nor failed (cancelled, or refused by us)"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_running = False
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.counters['opened'] += 1
+        logger.warning("Circuit %s open for %.0fs", self.name, self.cooldown)
+
+    def metrics(self):
+        with self._lock:
+            calls = self.counters['successes'] + self.counters['failures']
+            return {
+                'state': self.state,
+                **self.counters,
+                'failure_rate': self.counters['failures'] / calls * 100 if calls else 0,
+            }
@@ -0,0 +1,97 @@
+"""
+Compiled FAQ keyword matcher.
+
+All FAQ keywords are compiled into one Aho-Corasick automaton, so a message
+is matched against every keyword of every FAQ in a single pass over its
+characters. The automaton is rebuilt only when the BoxingFAQ content
+version changes (bumped on save/delete, see ``chatbot.signals``).
+
+Keywords keep the old substring semantics ("spar" matches "sparring").
+When several FAQs match, the highest ``priority`` wins, then the FAQ that
+matched the most distinct keywords, then the longest matched text, then
+the newest FAQ.
+"""
+from collections import deque
+
+from boxing_app import content_cache
+
+from .models import BoxingFAQ
+
+
+class FAQMatcher:
+    def __init__(self, entries):
+        """``entries`` is an iterable of ``(answer, keywords, priority)`` tuples, newest first"""
+        self.answers = []
+        self.priorities = []
+        # Trie as parallel lists: goto[state] = {char: state}
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # state -> [(faq_index, keyword_length, keyword_id)]
+        keyword_ids = {}
+
+        for index, (answer, keywords, priority) in enumerate(entries):
+            self.answers.append(answer)
+            self.priorities.append(priority)
+            for keyword in {k.strip().lower() for k in keywords.split(',')}:
+                if not keyword:
+                    continue
+                keyword_id = keyword_ids.setdefault(keyword, len(keyword_ids))
+                state = 0
+                for char in keyword:
+                    next_state = self.goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self.goto)
+                        self.goto[state][char] = next_state
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.output.append([])
+                    state = next_state
+                self.output[state].append((index, len(keyword), keyword_id))
+
+        # Breadth-first pass to fill in failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def __len__(self):
+        return len(self.answers)
+
+    def matches(self, message):
+        """Return ``{faq_index: (distinct_keywords, matched_length)}`` for every FAQ hit"""
+        goto, fail, output = self.goto, self.fail, self.output
+        hits = {}
+        state = 0
+        for char in message.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index, length, keyword_id in output[state]:
+                hits.setdefault(index, {})[keyword_id] = length
+        return {index: (len(found), sum(found.values())) for index, found in hits.items()}
+
+    def best_answer(self, message):
+        hits = self.matches(message)
+        if not hits:
+            return None
+        best = max(hits, key=lambda index: (self.priorities[index], *hits[index], -index))
+        return self.answers[best]
+
+
+_matcher = (None, None)
+
+
+def get_matcher():
+    """The matcher for the current FAQ version, rebuilt after any FAQ change"""
+    global _matcher
+    version = content_cache.get_versions([BoxingFAQ])[0]
+    if _matcher[0] != version:
+        faqs = BoxingFAQ.objects.filter(is_active=True).order_by('-created_at', '-id')
+        _matcher = (version, FAQMatcher(faqs.values_list('answer', 'keywords', 'priority')))
+    return _matcher[1]
@@ -0,0 +1,131 @@
+"""
+Buffered ChatHistory writer.
+
+Chat turns are queued in memory and written with one ``bulk_create`` per
+batch by a background thread, so a chat request never waits on an insert
+and a commit. A batch is written every ``CHAT_HISTORY_FLUSH_INTERVAL``
+seconds, or sooner once ``CHAT_HISTORY_BATCH_SIZE`` messages are waiting.
+
+Loss is bounded: if ``CHAT_HISTORY_MAX_PENDING`` messages are still
+unwritten (the database is slow or down), the request that queued the last
+one flushes the queue itself, so a killed worker loses at most that many
+messages. If that flush fails too, the error is logged rather than raised
+into the request, and only the newest ``CHAT_HISTORY_MAX_PENDING`` messages
+are kept queued. Pending messages are flushed at interpreter exit, which covers
+graceful gunicorn/uvicorn shutdowns.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection
+
+from .models import ChatHistory
+
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+    def __init__(self, batch_size=None, flush_interval=None, max_pending=None):
+        # None reads the setting on every use, so override_settings applies
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    @property
+    def batch_size(self):
+        return self._batch_size if self._batch_size is not None else settings.CHAT_HISTORY_BATCH_SIZE
+
+    @property
+    def flush_interval(self):
+        return self._flush_interval if self._flush_interval is not None else settings.CHAT_HISTORY_FLUSH_INTERVAL
+
+    @property
+    def max_pending(self):
+        return self._max_pending if self._max_pending is not None else settings.CHAT_HISTORY_MAX_PENDING
+
+    def __len__(self):
+        return len(self._pending)
+
+    def record(self, **fields):
+        """Queue one ChatHistory row built from ``fields``"""
+        entry = ChatHistory(**fields)
+        if self.max_pending <= 0 or self._closed:
+            entry.save()
+            return
+
+        with self._lock:
+            self._pending.append(entry)
+            pending = len(self._pending)
+            if self._thread is None:
+                self._start()
+
+        if pending >= self.max_pending:
+            try:
+                self.flush()
+            except Exception:
+                # The answer is already computed; flush() kept the newest max_pending rows queued
+                logger.exception("Could not write chat history; %d messages still pending", len(self))
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Write every queued message now; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                ChatHistory.objects.bulk_create(batch, batch_size=self.batch_size)
+            except Exception:
+                # Put the batch back for the next flush, but never hold more than max_pending
+                with self._lock:
+                    self._pending = (batch + self._pending)[-max(self.max_pending, 1):]
+                raise
+            return len(batch)
+
+    def close(self):
+        """Stop the background thread and write whatever is left"""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Could not write %d pending chat messages", len(self))
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name='chat-history-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Could not write chat history; will retry")
+            finally:
+                # This thread's connection is never closed by the request cycle
+                connection.close()
+
+
+writer = HistoryWriter()
+
+
+def record(**fields):
+    writer.record(**fields)
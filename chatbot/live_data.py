@@ -0,0 +1,112 @@
+"""
+Precomputed live-data answers for the chatbot.
+
+The schedule, membership and coach answers are rendered once into the
+content cache (``boxing_app.content_cache``) together with a variant per
+day and per coach, and rebuilt only after a TrainingSchedule or
+MembershipPlan is saved or deleted. Answering a message then costs a cache
+read and no queries.
+"""
+import re
+from datetime import timedelta
+
+from django.utils import timezone
+
+from boxing_app import content_cache
+
+from .models import MembershipPlan, TrainingSchedule
+
+
+SCHEDULE_FOOTER = "\nBook your spot through our website or front desk!"
+
+DAY_CODES = [code for code, _ in TrainingSchedule.DAY_CHOICES]
+
+DAY_NAMES = {label.lower(): code for code, label in TrainingSchedule.DAY_CHOICES}
+
+# Abbreviations that are not also everyday words ("sat", "sun", "wed", "mon" are)
+DAY_ALIASES = {'tue': 'tue', 'tues': 'tue', 'weds': 'wed', 'thu': 'thu', 'thur': 'thu', 'thurs': 'thu'}
+
+
+def _schedule_line(schedule):
+    return f"• {schedule.time_slot} - {schedule.class_type} (Coach: {schedule.coach}) - {schedule.available_slots} slots available\n"
+
+
+def _grouped_by_day(schedules):
+    text = ""
+    current_day = None
+    for schedule in schedules:
+        if schedule.day != current_day:
+            text += f"\n{schedule.get_day_display()}:\n"
+            current_day = schedule.day
+        text += _schedule_line(schedule)
+    return text
+
+
+@content_cache.register('chatbot_live_data', TrainingSchedule, MembershipPlan)
+def build_answers():
+    schedules = list(TrainingSchedule.objects.all().order_by('day', 'time_slot'))
+    plans = list(MembershipPlan.objects.filter(is_active=True))
+    day_names = dict(TrainingSchedule.DAY_CHOICES)
+
+    answers = {'schedule': None, 'by_day': {}, 'by_coach': {}, 'membership': None, 'coaches': None}
+
+    if schedules:
+        answers['schedule'] = "📅 Current Training Schedule:\n\n" + _grouped_by_day(schedules) + SCHEDULE_FOOTER
+
+        for code in DAY_CODES:
+            classes = [schedule for schedule in schedules if schedule.day == code]
+            if classes:
+                answers['by_day'][code] = (
+                    f"📅 {day_names[code]} Classes:\n\n" + ''.join(map(_schedule_line, classes)) + SCHEDULE_FOOTER
+                )
+            else:
+                answers['by_day'][code] = (
+                    f"📅 There are no classes on {day_names[code]}. Ask me for the full schedule to find another day!"
+                )
+
+        coaches = list(dict.fromkeys(schedule.coach for schedule in schedules))
+        for coach in coaches:
+            classes = [schedule for schedule in schedules if schedule.coach == coach]
+            answers['by_coach'][coach.lower()] = (
+                f"📅 Classes with Coach {coach}:\n" + _grouped_by_day(classes) + SCHEDULE_FOOTER
+            )
+        answers['coaches'] = (
+            f"👨‍🏫 Our certified coaches: {', '.join(coaches)}\n\nAll our coaches are experienced professionals with "
+            "competitive backgrounds. Book a private session for personalized training!"
+        )
+
+    if plans:
+        response = "💳 Membership Plans:\n\n"
+        for plan in plans:
+            response += f"• {plan.name}: ${plan.price}/{plan.duration}\n"
+            response += f"  Features: {plan.features}\n\n"
+        answers['membership'] = response + "Visit us for a free trial class!"
+
+    return answers
+
+
+def get_answers():
+    return content_cache.get('chatbot_live_data')
+
+
+def mentioned_day(message_lower):
+    """The day code a message asks about ("tuesday", "fridays", "thurs", "today"), or None"""
+    words = re.findall(r"[a-z]+", message_lower)
+    for word in words:
+        if word in ('today', 'tonight', 'tomorrow'):
+            date = timezone.localdate() + timedelta(days=1 if word == 'tomorrow' else 0)
+            return DAY_CODES[date.weekday()]
+        name = word[:-1] if word.endswith('days') else word
+        if name in DAY_NAMES:
+            return DAY_NAMES[name]
+        if word in DAY_ALIASES:
+            return DAY_ALIASES[word]
+    return None
+
+
+def mentioned_coach(answers, message_lower):
+    """The precomputed answer for a coach named in the message, or None"""
+    for coach, answer in answers['by_coach'].items():
+        if re.search(rf"\b{re.escape(coach)}\b", message_lower):
+            return answer
+    return None
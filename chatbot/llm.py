@@ -0,0 +1,186 @@
+"""
+Async client for the OpenAI-compatible chat completions API.
+
+One pooled ``httpx.AsyncClient`` and one concurrency semaphore are kept per
+event loop (under ASGI that is one per worker; under WSGI each request gets
+its own loop). The client is closed when its loop shuts down, so the
+short-lived loops of WSGI requests and ``streaming.iterate_sync`` don't leak
+connection pools. Every call has its own timeout, so a slow model can only tie
+up the chat request that is waiting on it.
+
+At most ``LLM_MAX_CONCURRENCY`` calls run at once per worker and at most
+``LLM_MAX_QUEUE`` more wait for a slot; beyond that calls fail fast with
+``LLMBusy`` so the API can answer 429 instead of piling up requests.
+
+Every call goes through a circuit breaker (``chatbot.circuit``): while the
+API keeps failing, calls fail instantly with ``LLMUnavailable`` and the
+callers' keyword and canned fallbacks answer without waiting on timeouts.
+"""
+import asyncio
+import json
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
+from django.conf import settings
+
+from .circuit import CircuitBreaker
+
+
+class LLMError(Exception):
+    """The model could not be reached or returned an unusable response"""
+
+
+class LLMBusy(LLMError):
+    """Too many calls are already waiting for a model slot"""
+
+
+class LLMUnavailable(LLMError):
+    """The circuit breaker is open; the model is not being called for now"""
+
+
+breaker = CircuitBreaker('llm')
+
+
+_clients = weakref.WeakKeyDictionary()
+_semaphores = weakref.WeakKeyDictionary()
+_waiting = weakref.WeakKeyDictionary()
+
+
+def is_configured():
+    return bool(getattr(settings, 'OPENAI_API_KEY', ''))
+
+
+async def _close_with_loop(client):
+    # Parked at the yield for the loop's lifetime: asyncio.run() and Runner.close()
+    # finalize the async generators still open on a loop (shutdown_asyncgens)
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+async def _client():
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(loop)
+    if entry is None:
+        client = httpx.AsyncClient(
+            base_url=settings.OPENAI_API_BASE,
+            headers={'Authorization': f'Bearer {settings.OPENAI_API_KEY}'},
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+        )
+        closer = _close_with_loop(client)
+        await closer.asend(None)  # never suspends, so no other call can race us here
+        entry = _clients[loop] = (client, closer)
+    return entry[0]
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+@asynccontextmanager
+async def _slot():
+    """Hold one of the worker's model slots, queueing for it if the queue has room"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphore()
+    if semaphore.locked() and _waiting.get(loop, 0) >= settings.LLM_MAX_QUEUE:
+        raise LLMBusy("Too many chat requests are waiting for the model")
+    _waiting[loop] = _waiting.get(loop, 0) + 1
+    try:
+        await semaphore.acquire()
+    finally:
+        _waiting[loop] -= 1
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+@contextmanager
+def _guard():
+    """Refuse the call while the breaker is open, and report how it went"""
+    if not breaker.allow():
+        raise LLMUnavailable("The model API is failing; not calling it for a while")
+    try:
+        yield
+    except LLMBusy:
+        # Our own queue is full; says nothing about the API's health
+        breaker.release()
+        raise
+    except LLMError:
+        breaker.record(False)
+        raise
+    except BaseException:
+        # Cancelled, or the caller stopped reading a stream
+        breaker.release()
+        raise
+    breaker.record(True)
+
+
+async def chat_completion(messages, *, max_tokens, temperature, timeout=None):
+    """Return the text of the model's reply to ``messages``"""
+    payload = {
+        'model': settings.OPENAI_MODEL,
+        'messages': messages,
+        'max_tokens': max_tokens,
+        'temperature': temperature,
+    }
+    with _guard():
+        try:
+            async with _slot():
+                client = await _client()
+                response = await client.post(
+                    'chat/completions', json=payload,
+                    timeout=httpx.Timeout(timeout if timeout is not None else settings.LLM_TIMEOUT,
+                                          connect=settings.LLM_CONNECT_TIMEOUT),
+                )
+            response.raise_for_status()
+            return response.json()['choices'][0]['message']['content'].strip()
+        except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+            raise LLMError(str(e) or e.__class__.__name__) from e
+
+
+async def stream_completion(messages, *, max_tokens, temperature, timeout=None):
+    """Yield the model's reply to ``messages`` piece by piece as it is generated
+
+    ``timeout`` applies to each read, so a long answer is fine as long as
+    tokens keep arriving.
+    """
+    payload = {
+        'model': settings.OPENAI_MODEL,
+        'messages': messages,
+        'max_tokens': max_tokens,
+        'temperature': temperature,
+        'stream': True,
+    }
+    with _guard():
+        try:
+            async with _slot():
+                client = await _client()
+                async with client.stream(
+                    'POST', 'chat/completions', json=payload,
+                    timeout=httpx.Timeout(timeout if timeout is not None else settings.LLM_TIMEOUT,
+                                          connect=settings.LLM_CONNECT_TIMEOUT),
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith('data:'):
+                            continue
+                        data = line[len('data:'):].strip()
+                        if data == '[DONE]':
+                            break
+                        text = json.loads(data)['choices'][0]['delta'].get('content')
+                        if text:
+                            yield text
+        except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+            raise LLMError(str(e) or e.__class__.__name__) from e
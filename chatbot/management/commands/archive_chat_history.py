@@ -0,0 +1,68 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+from itertools import groupby
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from chatbot.models import ChatHistory
+
+
+FIELDS = ['id', 'user_id', 'user__username', 'user_message', 'bot_response', 'is_boxing_related', 'created_at']
+
+
+class Command(BaseCommand):
+    help = (
+        "Move chat history older than the retention window into gzipped JSONL files, one per "
+        "month, in chunks. Each chunk is written and synced before its rows are deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.CHAT_HISTORY_RETENTION_DAYS,
+                            help="Keep messages newer than this many days")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--output-dir', default=settings.CHAT_HISTORY_ARCHIVE_DIR)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many messages would move")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        old = ChatHistory.objects.filter(created_at__lt=cutoff).order_by('created_at', 'id')
+
+        if options['dry_run']:
+            self.stdout.write(f"{old.count()} messages older than {cutoff:%Y-%m-%d %H:%M} would be archived")
+            return
+
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        archived = 0
+        files = set()
+        while True:
+            # Archived rows are deleted, so the next chunk is always the oldest one left
+            rows = list(old.values(*FIELDS)[:options['chunk_size']])
+            if not rows:
+                break
+            for month, month_rows in groupby(rows, key=lambda row: row['created_at'].strftime('%Y-%m')):
+                path = output_dir / f'chat_history_{month}.jsonl.gz'
+                self.append(path, month_rows)
+                files.add(path)
+            ChatHistory.objects.filter(id__in=[row['id'] for row in rows]).delete()
+            archived += len(rows)
+            self.stdout.write(f"  archived {archived} messages (up to {rows[-1]['created_at']:%Y-%m-%d})")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} messages older than {cutoff:%Y-%m-%d} into {len(files)} file(s) in {output_dir}"
+        ))
+
+    def append(self, path, rows):
+        # Each append is a new gzip member; gzip readers (gzip.open, zcat) read them back as one stream
+        with open(path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+                for row in rows:
+                    archive.write(json.dumps(row, cls=DjangoJSONEncoder).encode() + b'\n')
+            raw.flush()
+            os.fsync(raw.fileno())
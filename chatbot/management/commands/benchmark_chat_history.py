@@ -0,0 +1,66 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from chatbot.history import HistoryWriter
+from chatbot.models import ChatHistory
+
+
+MARKER = '[benchmark_chat_history]'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request ChatHistory inserts with the batched writer. Rows are committed "
+        "(commit cost is what is being measured) and deleted again afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=2000, help="Messages per thread")
+        parser.add_argument('--threads', type=int, default=4, help="Concurrent 'requests'")
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        messages, threads = options['messages'], options['threads']
+        total = messages * threads
+        self.stdout.write(f"{total} chat turns from {threads} threads on {connection.vendor}\n")
+        self.stdout.write(f"{'mode':<16}{'turns/s':>10}{'in-request ms':>16}")
+        try:
+            direct = self.run(lambda **fields: ChatHistory.objects.create(**fields), messages, threads)
+            writer = HistoryWriter(batch_size=options['batch_size'], flush_interval=0.5, max_pending=total)
+            batched = self.run(writer.record, messages, threads, finish=writer.close)
+        finally:
+            ChatHistory.objects.filter(user_message__startswith=MARKER).delete()
+
+        self.report('per-request', total, *direct)
+        self.report('batched', total, *batched)
+        self.stdout.write(f"\nbatched writes: {direct[0] / batched[0]:.1f}x the throughput")
+
+    def run(self, record, messages, threads, finish=None):
+        in_request = []
+
+        def worker(n):
+            spent = 0.0
+            for i in range(messages):
+                start = time.perf_counter()
+                record(user=None, user_message=f'{MARKER} {n}/{i} what time is sparring?',
+                       bot_response='Sparring is Tuesday and Thursday at 7pm.', is_boxing_related=True)
+                spent += time.perf_counter() - start
+            in_request.append(spent)
+            connection.close()
+
+        start = time.perf_counter()
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        if finish:
+            finish()
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(in_request) / (messages * threads) * 1000
+
+    def report(self, mode, total, elapsed, in_request_ms):
+        self.stdout.write(f"{mode:<16}{total / elapsed:>10.0f}{in_request_ms:>16.3f}")
@@ -0,0 +1,70 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from chatbot.faq_matcher import FAQMatcher
+
+
+MESSAGES = [
+    "What time is sparring on Tuesday?",
+    "How much is the monthly membership?",
+    "Can you recommend gloves for a beginner who wants to train for competition?",
+    "hello there, is the gym open on public holidays and do you have showers?",
+]
+
+
+def linear_scan(entries, message):
+    """The previous per-FAQ, per-keyword substring scan"""
+    for answer, keywords, priority in entries:
+        keywords = [k.strip().lower() for k in keywords.split(',')]
+        if any(keyword in message.lower() for keyword in keywords):
+            return answer
+    return None
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark the compiled FAQ matcher against the old linear keyword scan (no database needed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--faqs', type=int, default=10_000)
+        parser.add_argument('--keywords', type=int, default=4, help="Keywords per FAQ")
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        entries = []
+        for i in range(options['faqs']):
+            keywords = [
+                ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12)))
+                for _ in range(options['keywords'])
+            ]
+            entries.append((f'answer {i}', ', '.join(keywords), 0))
+        # A few real keywords near the end, the worst case for the linear scan
+        entries[-1] = ('membership answer', 'membership, price, cost', 0)
+        entries[-2] = ('sparring answer', 'sparring, spar', 0)
+
+        start = time.perf_counter()
+        matcher = FAQMatcher(entries)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        repeat = options['repeat']
+        linear = self.time(lambda m: linear_scan(entries, m), repeat)
+        compiled = self.time(matcher.best_answer, repeat)
+
+        for message in MESSAGES:
+            assert linear_scan(entries, message) == matcher.best_answer(message), message
+
+        self.stdout.write(f"{options['faqs']} FAQs x {options['keywords']} keywords, "
+                          f"{len(matcher.goto)} automaton states, built in {build_ms:.1f} ms")
+        self.stdout.write(f"linear scan:  {linear:8.3f} ms/message")
+        self.stdout.write(f"compiled:     {compiled:8.3f} ms/message ({linear / compiled:.0f}x faster)")
+
+    def time(self, match, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for message in MESSAGES:
+                match(message)
+        return (time.perf_counter() - start) * 1000 / (repeat * len(MESSAGES))
@@ -0,0 +1,52 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chatbot.topic_classifier import TopicClassifier, is_keyword_match, keyword_examples, training_examples
+
+
+class Command(BaseCommand):
+    help = (
+        "Cross-validate the local topic classifier on the training data (seed set, FAQs, labelled "
+        "chat history) against the keyword check, and time it per message"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--folds', type=int, default=5)
+        parser.add_argument('--max-history', type=int, default=None)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        examples = training_examples(options['max_history'])
+        random.Random(options['seed']).shuffle(examples)
+        folds = options['folds']
+        accept, reject = settings.CHATBOT_CLASSIFIER_ACCEPT, settings.CHATBOT_CLASSIFIER_REJECT
+
+        correct = confident = confident_correct = keyword_correct = 0
+        elapsed = 0.0
+        for fold in range(folds):
+            test = examples[fold::folds]
+            train = [example for i, example in enumerate(examples) if i % folds != fold]
+            classifier = TopicClassifier().fit(keyword_examples() + train)
+            for text, label in test:
+                start = time.perf_counter()
+                probability = classifier.probability(text)
+                elapsed += time.perf_counter() - start
+                correct += (probability >= 0.5) == label
+                keyword_correct += is_keyword_match(text) == label
+                if probability >= accept or probability <= reject:
+                    confident += 1
+                    confident_correct += (probability >= accept) == label
+
+        total = len(examples)
+        self.stdout.write(f"{total} labelled messages, {folds}-fold cross-validation")
+        self.stdout.write(f"keyword check accuracy:          {keyword_correct / total:6.1%}")
+        self.stdout.write(f"classifier accuracy (p >= 0.5):  {correct / total:6.1%}")
+        self.stdout.write(
+            f"decided locally ({reject} >= p or p >= {accept}): {confident / total:6.1%} of messages, "
+            f"{confident_correct / max(confident, 1):.1%} correct"
+        )
+        self.stdout.write(f"sent to the model:               {(total - confident) / total:6.1%}")
+        self.stdout.write(f"classification time:             {elapsed / total * 1e6:6.1f} µs/message")
@@ -0,0 +1,82 @@
+import asyncio
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+from django.core.management.base import BaseCommand
+
+
+def time_page(url, page, duration):
+    latencies = []
+    with httpx.Client(base_url=url, timeout=30) as client:
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            client.get(page).raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Flood a running site's chatbot API from many clients while timing an ordinary page, "
+        "and report page latency before and during the flood plus the chatbot status codes. "
+        "Run the site against the stub model (stub_llm_server) to avoid API costs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--page', default='/', help="Page whose latency is measured")
+        parser.add_argument('--abusers', type=int, default=50, help="Concurrent chatbot clients")
+        parser.add_argument('--rate', type=float, default=2.0,
+                            help="Requests per second per abuser (0 for back-to-back, which mostly measures CPU)")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per phase")
+        parser.add_argument('--spoof-ips', action='store_true',
+                            help="Give every abuser its own X-Forwarded-For (needs CHATBOT_PROXY_COUNT >= 1)")
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        loop = asyncio.get_running_loop()
+        probe = (options['url'], options['page'], options['duration'])
+        limits = httpx.Limits(max_connections=options['abusers'] + 10)
+        # The page is timed from its own process so the flood generator's CPU use doesn't skew it
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            baseline = await loop.run_in_executor(pool, time_page, *probe)
+
+            async with httpx.AsyncClient(base_url=options['url'], timeout=30, limits=limits) as client:
+                statuses = Counter()
+                stop = asyncio.Event()
+                abusers = [
+                    asyncio.create_task(self.abuse(client, n, options['rate'], options['spoof_ips'], statuses, stop))
+                    for n in range(options['abusers'])
+                ]
+                flooded = await loop.run_in_executor(pool, time_page, *probe)
+                stop.set()
+                await asyncio.gather(*abusers)
+
+        self.stdout.write(f"page {options['page']}: {'p50 ms':>8}{'p95 ms':>8}{'max ms':>8}{'requests':>10}")
+        self.report('baseline', baseline)
+        self.report(f"{options['abusers']} abusers", flooded)
+        self.stdout.write("chatbot responses: " + ', '.join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=lambda item: str(item[0]))))
+
+    async def abuse(self, client, n, rate, spoof_ips, statuses, stop):
+        headers = {'X-Forwarded-For': f'10.0.{n // 250}.{n % 250 + 1}'} if spoof_ips else {}
+        interval = 1 / rate if rate else 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                # An abuser ignores Retry-After and keeps its pace
+                response = await client.post('/chatbot/api/', json={'message': f'How do I throw a jab? #{n}'}, headers=headers)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            await asyncio.sleep(max(0, interval - (time.perf_counter() - start)))
+
+    def report(self, label, latencies):
+        latencies = sorted(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+        self.stdout.write(f"  {label:<14}{statistics.median(latencies):>8.1f}{p95:>8.1f}{latencies[-1]:>8.1f}{len(latencies):>10}")
@@ -0,0 +1,115 @@
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers any POST .../chat/completions with a canned completion after ``latency`` seconds
+
+    Streaming requests get the reply word by word as server-sent events,
+    ``token_latency`` seconds apart. A fraction ``error_rate`` of requests
+    fails with a 500 instead, to exercise timeouts and the circuit breaker.
+    """
+
+    latency = 0.0
+    token_latency = 0.0
+    error_rate = 0.0
+    reply = "Keep your hands up and your chin down! 🥊"
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.rstrip('/').endswith('chat/completions'):
+            self.send_error(404)
+            return
+
+        self.server.completions += 1
+        time.sleep(self.latency)
+        # Classification prompts ask for a bare yes/no
+        system = next((m['content'] for m in request.get('messages', []) if m.get('role') == 'system'), '')
+        content = 'yes' if "Answer only 'yes' or 'no'" in system else self.reply
+        try:
+            if random.random() < self.error_rate:
+                self.send_error(500, "Injected failure")
+            elif request.get('stream'):
+                self.stream(request, content)
+            else:
+                self.respond(request, content)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out and hung up
+
+    def respond(self, request, content):
+        body = json.dumps({
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'model': request.get('model', 'stub'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, request, content):
+        # HTTP/1.0: the body ends when the connection closes
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        words = content.split(' ')
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.token_latency)
+            chunk = {
+                'id': 'chatcmpl-stub',
+                'object': 'chat.completion.chunk',
+                'model': request.get('model', 'stub'),
+                'choices': [{'index': 0, 'delta': {'content': word if i == 0 else ' ' + word}, 'finish_reason': None}],
+            }
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+            self.wfile.flush()
+        self.wfile.write(b'data: [DONE]\n\n')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=8001, latency=0.0, token_latency=0.0, error_rate=0.0):
+    handler = type('Handler', (StubLLMHandler,), {
+        'latency': latency, 'token_latency': token_latency, 'error_rate': error_rate,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.completions = 0  # requests served, for tests
+    return server
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local OpenAI-compatible stub for load tests. Point the site at it with "
+        "OPENAI_API_BASE=http://127.0.0.1:8001/v1/ and any OPENAI_API_KEY."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8001)
+        parser.add_argument('--latency', type=float, default=1.0, help="Seconds to wait before answering")
+        parser.add_argument('--token-latency', type=float, default=0.05,
+                            help="Seconds between words of a streamed answer")
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help="Fraction of requests answered with a 500 (0-1)")
+
+    def handle(self, *args, **options):
+        server = make_server(
+            options['host'], options['port'], options['latency'], options['token_latency'], options['error_rate'],
+        )
+        self.stdout.write(f"Stub LLM listening on http://{options['host']}:{options['port']}/v1/ "
+                          f"(latency {options['latency']}s, error rate {options['error_rate']:.0%})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
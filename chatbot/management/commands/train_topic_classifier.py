@@ -0,0 +1,45 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chatbot.topic_classifier import TopicClassifier, keyword_examples, training_examples
+
+
+class Command(BaseCommand):
+    help = (
+        "Train the local boxing-topic classifier from labelled chat history, FAQs and the seed set, "
+        "and write it to CHATBOT_CLASSIFIER_PATH (workers pick up the new file automatically)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help="Defaults to CHATBOT_CLASSIFIER_PATH")
+        parser.add_argument('--max-history', type=int, default=None,
+                            help="Most recent chat messages to learn from (default CHATBOT_CLASSIFIER_MAX_HISTORY)")
+        parser.add_argument('--epochs', type=int, default=30)
+
+    def handle(self, *args, **options):
+        path = Path(options['output'] or settings.CHATBOT_CLASSIFIER_PATH)
+        examples = training_examples(options['max_history'])
+        positives = sum(label for _, label in examples)
+
+        start = time.perf_counter()
+        classifier = TopicClassifier().fit(keyword_examples() + examples, epochs=options['epochs'])
+        elapsed = time.perf_counter() - start
+        correct = sum((classifier.probability(text) >= 0.5) == label for text, label in examples)
+
+        # Write to a temporary file and rename, so a worker never reads a half-written model
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=path.parent, suffix='.tmp', delete=False) as model_file:
+            model_file.write(classifier.to_json())
+        os.replace(model_file.name, path)
+
+        self.stdout.write(
+            f"Trained on {len(examples)} examples ({positives} boxing, {len(examples) - positives} other) "
+            f"in {elapsed:.1f}s; training accuracy {correct / len(examples):.1%}; "
+            f"{len(classifier.weights)} weights"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Saved {path}"))
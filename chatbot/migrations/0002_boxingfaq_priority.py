@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boxingfaq',
+            name='priority',
+            field=models.IntegerField(default=0, help_text='When several FAQs match a message, the highest priority wins'),
+        ),
+    ]
@@ -1,10 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class BoxingFAQ(models.Model):
     question = models.CharField(max_length=255)
     answer = models.TextField()
     keywords = models.CharField(max_length=500, help_text="Comma-separated keywords")
+    priority = models.IntegerField(default=0, help_text="When several FAQs match a message, the highest priority wins")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -20,10 +22,17 @@ class ChatHistory(models.Model):
     user_message = models.TextField()
     bot_response = models.TextField()
     is_boxing_related = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the message is queued, not when the batch is written (see chatbot.history)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Newest-first listings (the admin adds -id as a tie-breaker) and
+            # the oldest-first scans of archive_chat_history
+            models.Index(fields=['-created_at', '-id'], name='chatbot_chat_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='chatbot_chat_user_idx'),
+        ]
 
 class TrainingSchedule(models.Model):
     DAY_CHOICES = [
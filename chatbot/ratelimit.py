@@ -0,0 +1,90 @@
+"""
+Token-bucket rate limiting for the chatbot API.
+
+Each client has a bucket of ``burst`` tokens in the default cache that
+refills at ``rate`` tokens per minute; every chat request takes one token.
+Logged-in users are limited per account, anonymous clients per IP address.
+An empty bucket gets a 429 with a ``Retry-After`` header saying when the
+next token will be available.
+
+Bucket updates are a read followed by a write. The lock below makes them
+exact within a process; across processes sharing a cache, two requests
+racing on the same bucket may both get the last token, which is an
+acceptable error for abuse protection.
+"""
+import math
+import threading
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+from . import llm
+
+
+BUCKET_KEY = 'chatbot:ratelimit:{scope}:{ident}'
+
+_lock = threading.Lock()
+
+
+def take_token(key, rate_per_minute, burst):
+    """Take one token from the bucket ``key``; returns 0 if allowed, else seconds until a token is free"""
+    rate = rate_per_minute / 60
+    # An untouched bucket refills completely in burst / rate seconds; after that it can expire
+    timeout = math.ceil(burst / rate) + 1
+    with _lock:
+        now = time.time()
+        tokens, updated = cache.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            cache.set(key, (tokens - 1, now), timeout)
+            return 0
+        cache.set(key, (tokens, now), timeout)
+    return (1 - tokens) / rate
+
+
+def client_ip(request):
+    """The client's address, taken from X-Forwarded-For only as far as our own proxies vouch for it"""
+    proxies = settings.CHATBOT_PROXY_COUNT
+    if proxies:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def check(request, user):
+    if user.is_authenticated:
+        key = BUCKET_KEY.format(scope='user', ident=user.pk)
+        return take_token(key, settings.CHATBOT_USER_RATE_PER_MINUTE, settings.CHATBOT_USER_BURST)
+    key = BUCKET_KEY.format(scope='ip', ident=client_ip(request))
+    return take_token(key, settings.CHATBOT_ANON_RATE_PER_MINUTE, settings.CHATBOT_ANON_BURST)
+
+
+def too_many_requests(retry_after, error="You're sending messages too quickly. Please wait a moment. 🥊"):
+    response = JsonResponse({'error': error}, status=429)
+    response['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def busy():
+    """The answer when the model queue is full (``llm.LLMBusy``)"""
+    return too_many_requests(1, "BoxingBot is answering a lot of questions right now. Please try again in a moment. 🥊")
+
+
+def rate_limit(view):
+    """Refuse requests from clients that have used up their bucket, and requests the model has no room for"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await request.auser()
+        retry_after = await sync_to_async(check)(request, user)
+        if retry_after:
+            return too_many_requests(retry_after)
+        try:
+            return await view(request, *args, **kwargs)
+        except llm.LLMBusy:
+            return busy()
+    return wrapper
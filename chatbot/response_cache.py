@@ -0,0 +1,90 @@
+"""
+Response cache for LLM results, keyed on the normalized question.
+
+"What time is sparring?", "sparring, what's the time" and "What time's
+sparring?" normalize to the same key (lowercased, punctuation and stopwords
+removed, tokens deduplicated and sorted), so repeat questions are answered
+without an API call. Question words and modals stay in the key: "when is
+sparring" and "where is sparring", or "can I spar" and "should I spar", ask
+different things. Entries live in the ``chatbot`` cache alias, whose TIMEOUT and
+MAX_ENTRIES settings give the TTL and LRU eviction; hit/miss counters are
+kept in the default cache so evictions never reset them.
+"""
+import hashlib
+import re
+
+from django.core.cache import cache, caches
+
+
+STOPWORDS = frozenset("""
+    a an and are as at be been being by do does did for from had has have
+    i i'm im is it its me my of on or our please so tell that the
+    their them then there these this those to us was we with you your yours
+""".split())
+
+KINDS = ('classify', 'response')
+KEY = 'chatbot:{kind}:{digest}'
+STATS_KEY = 'chatbot:stats:{kind}:{stat}'
+
+
+def normalize(message):
+    tokens = re.findall(r"[\w']+", message.lower())
+    # "what's" asks the same as "what"
+    words = {re.sub(r"'s$", '', token.strip("'")) for token in tokens} - STOPWORDS - {''}
+    # Fall back to the raw tokens for questions made only of stopwords
+    return ' '.join(sorted(words or set(tokens)))
+
+
+def cache_key(kind, message):
+    digest = hashlib.md5(normalize(message).encode()).hexdigest()
+    return KEY.format(kind=kind, digest=digest)
+
+
+async def _record(kind, stat):
+    key = STATS_KEY.format(kind=kind, stat=stat)
+    if not await cache.aadd(key, 1, None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, None)
+
+
+async def lookup(kind, message):
+    """The cached ``kind`` result for ``message``, or None"""
+    value = await caches['chatbot'].aget(cache_key(kind, message))
+    await _record(kind, 'misses' if value is None else 'hits')
+    return value
+
+
+async def store(kind, message, value):
+    await caches['chatbot'].aset(cache_key(kind, message), value)
+
+
+async def cached(kind, message, compute):
+    """Return the cached ``kind`` result for ``message`` or await ``compute()`` and store it.
+
+    Exceptions from ``compute`` propagate and nothing is cached, so failures
+    and fallbacks are never served from the cache.
+    """
+    value = await lookup(kind, message)
+    if value is None:
+        value = await compute()
+        await store(kind, message, value)
+    return value
+
+
+def get_stats():
+    """``{kind: {'hits', 'misses', 'hit_rate'}}`` for the admin"""
+    keys = {(kind, stat): STATS_KEY.format(kind=kind, stat=stat) for kind in KINDS for stat in ('hits', 'misses')}
+    found = cache.get_many(keys.values())
+    stats = {}
+    for kind in KINDS:
+        hits = found.get(keys[kind, 'hits'], 0)
+        misses = found.get(keys[kind, 'misses'], 0)
+        total = hits + misses
+        stats[kind] = {'hits': hits, 'misses': misses, 'hit_rate': hits / total * 100 if total else 0}
+    return stats
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(kind=kind, stat=stat) for kind in KINDS for stat in ('hits', 'misses')])
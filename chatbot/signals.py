@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from boxing_app.signals import invalidate_content
+
+from . import live_data  # noqa: F401 - registers the cached live-data answers
+from .models import BoxingFAQ, MembershipPlan, TrainingSchedule
+
+
+def connect_content_signals():
+    """Version the chatbot models in the content cache so compiled lookups rebuild on change"""
+    for model in (BoxingFAQ, TrainingSchedule, MembershipPlan):
+        post_save.connect(invalidate_content, sender=model, dispatch_uid=f'content_cache_save_{model._meta.label_lower}')
+        post_delete.connect(invalidate_content, sender=model, dispatch_uid=f'content_cache_delete_{model._meta.label_lower}')
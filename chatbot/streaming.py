@@ -0,0 +1,59 @@
+"""
+Server-sent event responses that stream under both ASGI and WSGI.
+
+Under ASGI the async event generator is handed to Django as is. Under
+WSGI Django would buffer an async iterator into one response, so the
+generator is driven from a private event loop instead and each event is
+written out as soon as it is produced.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+
+def event(name, data):
+    """One SSE frame; ``data`` is sent as JSON"""
+    return f'event: {name}\ndata: {json.dumps(data)}\n\n'
+
+
+def iterate_sync(events):
+    """Drive the async generator ``events`` from a plain (WSGI) iterator"""
+    with asyncio.Runner() as runner:
+        try:
+            while True:
+                try:
+                    yield runner.run(events.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            # Also runs when the client disconnects and the server closes us
+            runner.run(events.aclose())
+
+
+def event_stream(request, events, finished=None):
+    """Stream ``events`` (an async generator of SSE frames) as the response
+
+    ``finished`` is called once every event has been sent. It runs in the
+    request's own thread, so it may touch the database; keep database work
+    out of ``events`` itself, which under WSGI runs on a private loop.
+    """
+    if isinstance(request, ASGIRequest):
+        async def content():
+            async for frame in events:
+                yield frame
+            if finished:
+                await sync_to_async(finished)()
+    else:
+        def content():
+            yield from iterate_sync(events)
+            if finished:
+                finished()
+
+    response = StreamingHttpResponse(content(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx and similar proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,3 +1,620 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import tempfile
+import threading
+import zlib
+import time
+from unittest import mock
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import live_data, llm, ratelimit, response_cache, topic_classifier
+from .topic_classifier import TopicClassifier, features, seed_classifier
+from .circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from .history import HistoryWriter
+from .faq_matcher import FAQMatcher, get_matcher
+from .models import BoxingFAQ, ChatHistory, MembershipPlan, TrainingSchedule
+from .views import NOT_BOXING_RESPONSE, get_live_data_response
+from .management.commands.stub_llm_server import StubLLMHandler, make_server
+
+
+class StubLLMMixin:
+    latency = 0.0
+    token_latency = 0.0
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.llm_server = make_server(port=0, latency=cls.latency, token_latency=cls.token_latency)
+        threading.Thread(target=cls.llm_server.serve_forever, daemon=True).start()
+        host, port = cls.llm_server.server_address
+        # History is written inside the request so tests never race the background writer,
+        # and the local topic classifier always defers so every question reaches the model
+        cls.llm_settings = override_settings(
+            OPENAI_API_KEY='test', OPENAI_API_BASE=f'http://{host}:{port}/v1/', CHAT_HISTORY_MAX_PENDING=0,
+            CHATBOT_CLASSIFIER_ACCEPT=1.1, CHATBOT_CLASSIFIER_REJECT=-0.1,
+        )
+        cls.llm_settings.enable()
+
+    def setUp(self):
+        super().setUp()
+        # Rate-limit buckets and stats live in the default cache, answers in the chatbot one
+        cache.clear()
+        caches['chatbot'].clear()
+        self.llm_server.completions = 0
+        self.llm_server.RequestHandlerClass.error_rate = 0.0
+        llm.breaker.reset()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.llm_settings.disable()
+        cls.llm_server.shutdown()
+        cls.llm_server.server_close()
+        super().tearDownClass()
+
+    async def ask(self, message):
+        response = await self.async_client.post(
+            reverse('chatbot:chatbot_api'), json.dumps({'message': message}), content_type='application/json',
+        )
+        return response.status_code, response.json()
+
+
+class ChatbotApiTests(StubLLMMixin, TestCase):
+    latency = 0.2
+
+    async def test_ai_answer_from_llm(self):
+        status, data = await self.ask('How do I slip a jab?')
+        self.assertEqual(status, 200)
+        self.assertEqual(data['response'], StubLLMHandler.reply)
+
+    async def test_empty_message(self):
+        status, data = await self.ask('   ')
+        self.assertEqual(status, 400)
+
+    async def test_malformed_body(self):
+        for body in ('{"message": ', '["hi"]', '{"message": 5}'):
+            response = await self.async_client.post(reverse('chatbot:chatbot_api'), body, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'error': 'Invalid JSON'})
+
+    async def complete(self):
+        return await llm.chat_completion([{'role': 'user', 'content': 'hi'}], max_tokens=5, temperature=0)
+
+    async def test_slow_llm_calls_run_concurrently(self):
+        start = time.perf_counter()
+        replies = await asyncio.gather(*(self.complete() for _ in range(5)))
+        self.assertEqual(replies, [StubLLMHandler.reply] * 5)
+        self.assertLess(time.perf_counter() - start, 0.6)
+
+    @override_settings(LLM_MAX_CONCURRENCY=1)
+    async def test_concurrency_limit(self):
+        start = time.perf_counter()
+        await asyncio.gather(*(self.complete() for _ in range(3)))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.6)
+
+    @override_settings(LLM_TIMEOUT=0.05)
+    async def test_timeout_falls_back(self):
+        status, data = await self.ask('How do I punch harder?')
+        self.assertEqual(status, 200)
+        self.assertIn('trouble connecting', data['response'])
+
+
+class ResponseCacheTests(StubLLMMixin, TestCase):
+    latency = 0.1
+
+    def test_normalize_ignores_case_punctuation_stopwords_and_order(self):
+        self.assertEqual(response_cache.normalize('What time is SPARRING?'), 'sparring time what')
+        self.assertEqual(response_cache.normalize("sparring... what's the time"), 'sparring time what')
+        self.assertNotEqual(response_cache.normalize('sparring time'), response_cache.normalize('sparring gloves'))
+        self.assertEqual(response_cache.normalize('Who are you?'), 'who')
+
+    def test_question_words_and_modals_are_part_of_the_key(self):
+        pairs = [
+            ('when is sparring', 'where is sparring'),
+            ('who teaches sparring', 'why teach sparring'),
+            ('can I spar with a cold', 'should I spar with a cold'),
+            ('how do I wrap my hands', 'wrap my hands'),
+        ]
+        for first, second in pairs:
+            self.assertNotEqual(response_cache.cache_key('response', first), response_cache.cache_key('response', second))
+
+    async def test_repeat_question_skips_llm(self):
+        status, first = await self.ask('How do I slip a jab?')
+        self.assertEqual(self.llm_server.completions, 2)  # classification + answer
+
+        status, second = await self.ask('slip JAB, how do i?')
+        self.assertEqual(second, first)
+        self.assertEqual(self.llm_server.completions, 2)
+
+        stats = await sync_to_async(response_cache.get_stats)()
+        self.assertEqual(stats['response'], {'hits': 1, 'misses': 1, 'hit_rate': 50.0})
+        self.assertEqual(stats['classify']['hits'], 1)
+
+    async def test_failures_are_not_cached(self):
+        with override_settings(LLM_TIMEOUT=0.05):
+            status, data = await self.ask('How do I punch harder?')
+        self.assertIn('trouble connecting', data['response'])
+
+        status, data = await self.ask('How do I punch harder?')
+        self.assertEqual(data['response'], StubLLMHandler.reply)
+
+    def test_admin_shows_hit_rate(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get(reverse('admin:chatbot_chathistory_changelist'))
+        self.assertContains(response, 'Response cache')
+        self.assertEqual(response.context['cache_stats']['response']['hit_rate'], 0)
+
+
+@override_settings(CHATBOT_ANON_RATE_PER_MINUTE=60, CHATBOT_ANON_BURST=2)
+class RateLimitTests(StubLLMMixin, TestCase):
+    def post(self, **extra):
+        return self.client.post(
+            reverse('chatbot:chatbot_api'), json.dumps({'message': 'How do I slip a jab?'}),
+            content_type='application/json', **extra,
+        )
+
+    def test_anonymous_burst_then_429_with_retry_after(self):
+        self.assertEqual([self.post().status_code for _ in range(2)], [200, 200])
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        # Nothing reached the model for the refused request
+        self.assertEqual(self.llm_server.completions, 2)
+
+    def test_logged_in_users_have_their_own_bucket(self):
+        for _ in range(3):
+            self.post()
+        self.client.force_login(User.objects.create_user('boxer', password='pw'))
+        self.assertEqual(self.post().status_code, 200)
+
+    @override_settings(CHATBOT_PROXY_COUNT=1)
+    def test_forwarded_client_ip_behind_proxy(self):
+        for _ in range(3):
+            self.post(HTTP_X_FORWARDED_FOR='203.0.113.7')
+        self.assertEqual(self.post(HTTP_X_FORWARDED_FOR='203.0.113.7').status_code, 429)
+        self.assertEqual(self.post(HTTP_X_FORWARDED_FOR='203.0.113.8').status_code, 200)
+        # A spoofed first hop is ignored; our proxy appended the real address last
+        self.assertEqual(self.post(HTTP_X_FORWARDED_FOR='203.0.113.9, 203.0.113.7').status_code, 429)
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch('chatbot.ratelimit.time.time', return_value=1000.0):
+            self.assertEqual(ratelimit.take_token('bucket', 60, 1), 0)
+            self.assertAlmostEqual(ratelimit.take_token('bucket', 60, 1), 1.0)
+        with mock.patch('chatbot.ratelimit.time.time', return_value=1000.5):
+            self.assertAlmostEqual(ratelimit.take_token('bucket', 60, 1), 0.5)
+        with mock.patch('chatbot.ratelimit.time.time', return_value=1001.0):
+            self.assertEqual(ratelimit.take_token('bucket', 60, 1), 0)
+
+    @override_settings(LLM_MAX_CONCURRENCY=1, LLM_MAX_QUEUE=1)
+    async def test_full_model_queue_fails_fast(self):
+        async def complete():
+            return await llm.chat_completion([{'role': 'user', 'content': 'hi'}], max_tokens=5, temperature=0)
+
+        results = await asyncio.gather(*(complete() for _ in range(3)), return_exceptions=True)
+        self.assertEqual(sum(isinstance(result, llm.LLMBusy) for result in results), 1)
+        self.assertEqual(results.count(StubLLMHandler.reply), 2)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def breaker(self):
+        return CircuitBreaker('test', window=4, min_calls=3, failure_rate=0.5, cooldown=0.05)
+
+    def test_opens_on_failure_rate_and_refuses_calls(self):
+        breaker = self.breaker()
+        for success in (True, False):
+            self.assertTrue(breaker.allow())
+            breaker.record(success)
+        self.assertEqual(breaker.state, CLOSED)  # too few calls to judge
+
+        breaker.allow()
+        breaker.record(False)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.metrics()['rejected'], 1)
+
+    def test_half_open_lets_one_trial_through(self):
+        breaker = self.breaker()
+        for _ in range(3):
+            breaker.allow()
+            breaker.record(False)
+        time.sleep(0.06)
+
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())
+        breaker.record(False)
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.release()  # a cancelled trial frees the slot for the next one
+        self.assertTrue(breaker.allow())
+        breaker.record(True)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.metrics()['opened'], 2)
+
+
+@override_settings(LLM_BREAKER_MIN_CALLS=2, LLM_BREAKER_COOLDOWN=0.2)
+class CircuitBreakerApiTests(StubLLMMixin, TestCase):
+    latency = 0.3
+
+    def ask_timed(self, message='How do I slip a jab?'):
+        start = time.perf_counter()
+        response = self.client.post(
+            reverse('chatbot:chatbot_api'), json.dumps({'message': message}), content_type='application/json',
+        )
+        return response.json()['response'], time.perf_counter() - start
+
+    @override_settings(LLM_CLASSIFY_TIMEOUT=0.05, LLM_TIMEOUT=0.05)
+    def test_slow_api_opens_circuit_and_fallbacks_answer_instantly(self):
+        answer, elapsed = self.ask_timed()
+        self.assertIn('trouble connecting', answer)
+        self.assertEqual(llm.breaker.state, OPEN)
+
+        completions = self.llm_server.completions
+        answer, elapsed = self.ask_timed()
+        self.assertIn('trouble connecting', answer)
+        self.assertLess(elapsed, 0.05)
+        self.assertEqual(self.llm_server.completions, completions)
+        self.assertEqual(llm.breaker.metrics()['rejected'], 2)
+
+        # Keyword classification still turns away off-topic questions
+        answer, elapsed = self.ask_timed('What is the capital of France?')
+        self.assertIn('boxing specialist', answer)
+
+    def test_errors_open_circuit_until_a_trial_succeeds(self):
+        self.llm_server.RequestHandlerClass.error_rate = 1.0
+        self.ask_timed()
+        self.assertEqual(llm.breaker.state, OPEN)
+
+        self.llm_server.RequestHandlerClass.error_rate = 0.0
+        time.sleep(0.2)
+        answer, elapsed = self.ask_timed()
+        self.assertEqual(answer, StubLLMHandler.reply)
+        self.assertEqual(llm.breaker.state, CLOSED)
+
+    def test_admin_shows_breaker_metrics(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get(reverse('admin:chatbot_chathistory_changelist'))
+        self.assertContains(response, 'AI circuit breaker')
+        self.assertEqual(response.context['breaker']['state'], CLOSED)
+
+
+class TopicClassifierTests(StubLLMMixin, TestCase):
+    @override_settings(CHATBOT_CLASSIFIER_ACCEPT=0.8, CHATBOT_CLASSIFIER_REJECT=0.15)
+    def test_confident_messages_skip_the_model(self):
+        self.assertEqual(self.client.post(
+            reverse('chatbot:chatbot_api'), json.dumps({'message': 'Write me a poem about the ocean'}),
+            content_type='application/json',
+        ).json()['response'], NOT_BOXING_RESPONSE)
+        self.client.post(
+            reverse('chatbot:chatbot_api'), json.dumps({'message': 'Best gloves for the heavy bag?'}),
+            content_type='application/json',
+        )
+        # Only the answer to the boxing question needed the model
+        self.assertEqual(self.llm_server.completions, 1)
+
+    def test_seed_model_separates_topics(self):
+        classifier = seed_classifier()
+        self.assertGreater(classifier.probability('best gloves for the heavy bag'), 0.8)
+        self.assertLess(classifier.probability('what is the capital of Germany'), 0.15)
+        self.assertEqual(classifier.probability('?!'), 0.5)
+
+    def test_trained_model_round_trips_and_reloads(self):
+        ChatHistory.objects.create(user_message='Do you run sparring for teenagers?', bot_response='', is_boxing_related=True)
+        ChatHistory.objects.create(user_message='Recommend a sushi restaurant', bot_response='', is_boxing_related=False)
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'model.json'
+        with override_settings(CHATBOT_CLASSIFIER_PATH=str(path)):
+            call_command('train_topic_classifier', stdout=StringIO())
+            loaded = topic_classifier.get_classifier()
+            self.assertIs(topic_classifier.get_classifier(), loaded)
+            self.assertLess(loaded.probability('Recommend a sushi restaurant'), 0.5)
+            self.assertEqual(
+                TopicClassifier.from_json(loaded.to_json()).probability('sparring for teens'),
+                loaded.probability('sparring for teens'),
+            )
+
+            call_command('train_topic_classifier', stdout=StringIO())
+            self.assertIsNot(topic_classifier.get_classifier(), loaded)
+
+    def test_unreadable_model_file_falls_back_to_the_seed_model(self):
+        directory = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        for name, content in (('garbage.json', 'not json at all'), ('list.json', '[1, 2]'),
+                              ('old.json', '{"buckets": 1, "bias": 0, "weights": {}}')):
+            path = directory / name
+            path.write_text(content)
+            with override_settings(CHATBOT_CLASSIFIER_PATH=str(path)), self.assertLogs('chatbot.topic_classifier'):
+                classifier = topic_classifier.get_classifier()
+            self.assertGreater(classifier.probability('best gloves for the heavy bag'), 0.8)
+
+    def test_features_are_stable_across_processes(self):
+        # crc32, unlike hash(), does not change with PYTHONHASHSEED
+        self.assertEqual(sorted(features('jab')), sorted(features('JAB!')))
+        self.assertIn(zlib.crc32(b'jab') % topic_classifier.BUCKETS, features('jab'))
+
+
+def parse_events(body):
+    events = []
+    for frame in body.decode().split('\n\n'):
+        if frame:
+            name, data = frame.split('\n')
+            events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+class ChatbotStreamTests(StubLLMMixin, TestCase):
+    token_latency = 0.05
+
+    def post(self, message):
+        return self.client.post(
+            reverse('chatbot:chatbot_stream'), json.dumps({'message': message}), content_type='application/json',
+        )
+
+    def test_ai_answer_streams_tokens_under_wsgi(self):
+        user = User.objects.create_user('boxer', password='pw')
+        self.client.force_login(user)
+        response = self.post('How do I slip a jab?')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = parse_events(b''.join(response.streaming_content))
+
+        self.assertEqual(events[-1], ('done', {}))
+        tokens = [data['text'] for name, data in events if name == 'token']
+        self.assertEqual(len(tokens), len(StubLLMHandler.reply.split()))
+        self.assertEqual(''.join(tokens), StubLLMHandler.reply)
+        self.assertEqual(ChatHistory.objects.get(user=user).bot_response, StubLLMHandler.reply)
+
+        # The streamed answer fills the response cache
+        events = parse_events(b''.join(self.post('slip a jab how').streaming_content))
+        self.assertEqual(events, [('token', {'text': StubLLMHandler.reply}), ('done', {})])
+
+    def test_client_is_closed_with_the_event_loop_under_wsgi(self):
+        clients = []
+
+        async def get_client():
+            clients.append(await llm._client())
+            # Same loop, same client
+            self.assertIs(await llm._client(), clients[-1])
+
+        asyncio.run(get_client())
+        asyncio.run(get_client())
+        self.assertIsNot(clients[0], clients[1])
+        self.assertTrue(all(client.is_closed for client in clients))
+
+        # Each WSGI request runs its async work on loops of its own, torn down once the answer is sent
+        created = []
+        AsyncClient = llm.httpx.AsyncClient
+        with mock.patch.object(llm.httpx, 'AsyncClient', side_effect=lambda **kwargs: created.append(AsyncClient(**kwargs)) or created[-1]):
+            for message in ('How do I slip a jab?', 'How do I throw a hook?'):
+                events = parse_events(b''.join(self.post(message).streaming_content))
+                self.assertEqual(events[-1], ('done', {}))
+        self.assertGreaterEqual(len(created), 2)
+        self.assertTrue(all(client.is_closed for client in created))
+
+    async def test_first_token_arrives_before_the_answer_is_finished_under_asgi(self):
+        start = time.perf_counter()
+        response = await self.async_client.post(
+            reverse('chatbot:chatbot_stream'), json.dumps({'message': 'How do I slip a jab?'}),
+            content_type='application/json',
+        )
+        chunks = []
+        async for chunk in response.streaming_content:
+            chunks.append((time.perf_counter() - start, chunk))
+        first_token = next(at for at, chunk in chunks if chunk.startswith(b'event: token'))
+        self.assertLess(first_token, chunks[-1][0] - 0.2)
+        self.assertEqual(parse_events(b''.join(chunk for at, chunk in chunks))[-1], ('done', {}))
+
+    def test_faq_answer_is_one_event(self):
+        BoxingFAQ.objects.create(question='Gloves?', answer='Use 16oz gloves.', keywords='gloves')
+        events = parse_events(b''.join(self.post('Which gloves for sparring?').streaming_content))
+        self.assertEqual(events, [('message', {'text': 'Use 16oz gloves.'}), ('done', {})])
+
+    def test_empty_message(self):
+        self.assertEqual(self.post('').status_code, 400)
+
+
+class FAQMatcherTests(SimpleTestCase):
+    def test_overlapping_keywords_all_match(self):
+        matcher = FAQMatcher([
+            ('boxing', 'boxing', 0),
+            ('box', 'box', 0),
+            ('xing', 'xing', 0),
+        ])
+        self.assertEqual(set(matcher.matches('I love BOXING')), {0, 1, 2})
+
+    def test_priority_then_keyword_count_then_newest(self):
+        matcher = FAQMatcher([
+            ('newest', 'spar', 0),
+            ('most keywords', 'spar, time', 0),
+            ('older', 'spar', 0),
+        ])
+        self.assertEqual(matcher.best_answer('what time is sparring'), 'most keywords')
+        self.assertEqual(matcher.best_answer('sparring?'), 'newest')
+
+        matcher = FAQMatcher([('normal', 'spar, time', 0), ('pinned', 'spar', 5)])
+        self.assertEqual(matcher.best_answer('what time is sparring'), 'pinned')
+
+    def test_blank_keywords_never_match(self):
+        matcher = FAQMatcher([('answer', 'gloves, , ', 0)])
+        self.assertIsNone(matcher.best_answer('anything at all'))
+
+
+class FAQMatcherCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_matcher_rebuilds_after_faq_changes(self):
+        faq = BoxingFAQ.objects.create(question='Gloves?', answer='16oz', keywords='gloves')
+        self.assertEqual(get_matcher().best_answer('which gloves'), '16oz')
+        with self.assertNumQueries(0):
+            get_matcher()
+
+        faq.answer = '14oz'
+        faq.save()
+        self.assertEqual(get_matcher().best_answer('which gloves'), '14oz')
+
+        faq.delete()
+        self.assertIsNone(get_matcher().best_answer('which gloves'))
+
+
+class HistoryWriterTests(TransactionTestCase):
+    def record(self, writer, n):
+        for i in range(n):
+            writer.record(user_message=f'question {i}', bot_response='answer', is_boxing_related=True)
+
+    def test_batch_written_in_background_once_full(self):
+        writer = HistoryWriter(batch_size=3, flush_interval=60, max_pending=100)
+        self.addCleanup(writer.close)
+        self.record(writer, 2)
+        time.sleep(0.1)
+        self.assertEqual(ChatHistory.objects.count(), 0)
+
+        self.record(writer, 1)
+        # Wait on the writer rather than polling the table: the in-memory test
+        # database locks the whole table while the thread inserts
+        deadline = time.monotonic() + 2
+        while len(writer) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        with writer._flush_lock:
+            self.assertEqual(ChatHistory.objects.count(), 3)
+
+    def test_partial_batch_written_after_interval(self):
+        writer = HistoryWriter(batch_size=50, flush_interval=0.1, max_pending=100)
+        self.addCleanup(writer.close)
+        self.record(writer, 1)
+        time.sleep(0.4)
+        self.assertEqual(ChatHistory.objects.count(), 1)
+
+    def test_max_pending_bounds_unwritten_messages(self):
+        writer = HistoryWriter(batch_size=50, flush_interval=60, max_pending=5)
+        self.addCleanup(writer.close)
+        self.record(writer, 5)
+        # The fifth message was written by the caller itself, with the other four
+        self.assertEqual(ChatHistory.objects.count(), 5)
+        self.assertEqual(len(writer), 0)
+
+    def test_failed_max_pending_flush_is_logged_not_raised(self):
+        writer = HistoryWriter(batch_size=50, flush_interval=60, max_pending=3)
+        self.addCleanup(writer.close)
+        with mock.patch.object(ChatHistory.objects, 'bulk_create', side_effect=RuntimeError('database is down')):
+            with self.assertLogs('chatbot.history', 'ERROR'):
+                self.record(writer, 5)
+        # Still queued for the next flush, and still bounded
+        self.assertEqual([entry.user_message for entry in writer._pending], ['question 2', 'question 3', 'question 4'])
+
+        writer.flush()
+        self.assertEqual(ChatHistory.objects.count(), 3)
+
+    def test_close_flushes_and_keeps_queue_time(self):
+        writer = HistoryWriter(batch_size=50, flush_interval=60, max_pending=100)
+        self.record(writer, 1)
+        queued_at = writer._pending[0].created_at
+        time.sleep(0.05)
+        writer.close()
+        self.assertEqual(ChatHistory.objects.get().created_at, queued_at)
+
+
+class ChatHistoryRetentionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        now = timezone.now()
+        for days in (200, 120, 100, 10):
+            ChatHistory.objects.create(
+                user=self.user, user_message=f'{days} days ago', bot_response='answer',
+                created_at=now - timedelta(days=days),
+            )
+        self.output_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def archive(self, *args):
+        call_command('archive_chat_history', '--output-dir', str(self.output_dir), *args, stdout=StringIO())
+
+    def read_archive(self):
+        rows = []
+        for path in sorted(self.output_dir.glob('*.jsonl.gz')):
+            with gzip.open(path, 'rt') as archive:
+                rows += [json.loads(line) for line in archive]
+        return rows
+
+    def test_old_messages_move_to_archive_in_chunks(self):
+        self.archive('--days', '90', '--chunk-size', '2')
+        self.assertEqual(list(ChatHistory.objects.values_list('user_message', flat=True)), ['10 days ago'])
+
+        rows = self.read_archive()
+        self.assertEqual(sorted(row['user_message'] for row in rows), ['100 days ago', '120 days ago', '200 days ago'])
+        self.assertEqual(rows[0]['user__username'], 'admin')
+
+        # A later run appends to the month files instead of overwriting them
+        self.archive('--days', '0')
+        self.assertFalse(ChatHistory.objects.exists())
+        self.assertEqual(len(self.read_archive()), 4)
+
+    def test_dry_run_keeps_everything(self):
+        self.archive('--days', '90', '--dry-run')
+        self.assertEqual(ChatHistory.objects.count(), 4)
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+    def test_admin_changelist_skips_full_count(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:chatbot_chathistory_changelist'))
+        self.assertEqual(response.status_code, 200)
+        # One COUNT for the paginator and one page query with users joined in
+        history_queries = [q['sql'] for q in queries if 'FROM "chatbot_chathistory"' in q['sql']]
+        self.assertEqual(len(history_queries), 2)
+        self.assertEqual(response.context['cl'].full_result_count, None)
+
+
+class LiveDataAnswerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        TrainingSchedule.objects.create(day='tue', time_slot='6:00 PM', class_type='Sparring', coach='Mike')
+        TrainingSchedule.objects.create(day='mon', time_slot='7:00 AM', class_type='Fundamentals', coach='Ana')
+        TrainingSchedule.objects.create(day='tue', time_slot='7:00 AM', class_type='Conditioning', coach='Ana')
+        MembershipPlan.objects.create(name='Monthly', price='49.00', duration='month', features='All classes')
+
+    def test_answers_are_served_without_queries(self):
+        get_live_data_response('schedule?')
+        with self.assertNumQueries(0):
+            schedule = get_live_data_response('What is the class schedule?')
+            plans = get_live_data_response('How much is membership?')
+            coaches = get_live_data_response('Who are the coaches?')
+        self.assertIn('Monday:\n• 7:00 AM - Fundamentals (Coach: Ana)', schedule)
+        self.assertIn('• Monthly: $49.00/month', plans)
+        self.assertIn('Our certified coaches: Ana, Mike', coaches)
+
+    def test_day_and_coach_variants(self):
+        tuesday = get_live_data_response('Tuesday classes?')
+        self.assertIn('Tuesday Classes', tuesday)
+        self.assertIn('Sparring', tuesday)
+        self.assertNotIn('Fundamentals', tuesday)
+        self.assertIn('no classes on Sunday', get_live_data_response('anything on sundays?'))
+        self.assertIn('Tuesday Classes', get_live_data_response('what is on tues?'))
+
+    def test_everyday_words_are_not_days(self):
+        TrainingSchedule.objects.create(day='sat', time_slot='9:00 AM', class_type='Open Gym', coach='Lee')
+        for message in ('i sat on my wrist, what should i do?', 'can i train in the sun?', 'we wed next month'):
+            self.assertIsNone(live_data.mentioned_day(message))
+            self.assertIsNone(get_live_data_response(message))
+
+        mike = get_live_data_response('When does coach Mike teach?')
+        self.assertIn('Classes with Coach Mike', mike)
+        self.assertNotIn('Ana', mike)
+
+    def test_rebuilt_after_changes(self):
+        self.assertNotIn('Southpaw', get_live_data_response('schedule'))
+        TrainingSchedule.objects.create(day='fri', time_slot='5:00 PM', class_type='Southpaw Drills', coach='Lee')
+        self.assertIn('Southpaw Drills', get_live_data_response('schedule'))
+
+        MembershipPlan.objects.get().delete()
+        self.assertIsNone(get_live_data_response('membership price'))
@@ -0,0 +1,202 @@
+"""
+Local boxing-topic classifier.
+
+A logistic regression over hashed word unigrams, bigrams and character
+trigrams, trained from labelled ChatHistory messages, BoxingFAQ text and a
+built-in seed set. It answers "is this about boxing?" in tens of
+microseconds without a network call; ``check_if_boxing_related`` only asks
+the model when the probability falls between ``CHATBOT_CLASSIFIER_REJECT``
+and ``CHATBOT_CLASSIFIER_ACCEPT``.
+
+``train_topic_classifier`` writes the weights to ``CHATBOT_CLASSIFIER_PATH``
+as JSON. Each worker loads that file once and reloads it when it changes;
+without a file the classifier is trained from the seed set in memory.
+"""
+import json
+import logging
+import math
+import os
+import random
+import re
+import zlib
+
+from django.conf import settings
+
+from .models import BoxingFAQ, ChatHistory
+
+logger = logging.getLogger(__name__)
+
+
+BUCKETS = 1 << 18
+
+# Also the last-resort check when neither the classifier nor the model can decide
+BOXING_KEYWORDS = [
+    'boxing', 'punch', 'glove', 'train', 'spar', 'jab', 'cross', 'hook',
+    'uppercut', 'heavy bag', 'speed bag', 'ring', 'round', 'coach',
+    'training', 'technique', 'footwork', 'defense', 'combination',
+    'knockout', 'referee', 'gym', 'membership', 'schedule', 'class'
+]
+
+SEED_BOXING = [
+    "How do I throw a proper jab?", "What's the difference between a hook and an uppercut?",
+    "How can I improve my punching power?", "Best footwork drills for boxing", "How do I slip punches?",
+    "What size gloves should I use for sparring?", "How do I wrap my hands?", "When is sparring class?",
+    "How much is the monthly membership?", "What time does the gym open?", "Do you have beginner boxing classes?",
+    "Who are the coaches?", "How long are rounds in amateur boxing?", "How do I get better at the heavy bag?",
+    "Speed bag tips for beginners", "How do I bob and weave?", "What is a southpaw stance?",
+    "How do I defend against a jab?", "Is shadow boxing useful?", "How often should I train each week?",
+    "What should I eat before training?", "How do I cut weight safely for a fight?", "Can I book a private session?",
+    "How do I build stamina for three rounds?", "Which headgear do you recommend?", "Do I need a mouthguard?",
+    "How does boxing scoring work?", "What are the weight classes?", "How do I counter a hook?",
+    "What combinations should a beginner learn?", "Tips for my first amateur fight", "How do I keep my guard up?",
+    "Skipping rope workout for boxers", "How do I stop dropping my hands?", "Is there a class on Tuesday?",
+    "Do you sell boxing shoes?", "How do I cancel my gym membership?", "What is a one-two combination?",
+    "How to train with focus mitts", "Can kids join the boxing program?", "How do I recover after hard sparring?",
+    "What is ring generalship?", "Conditioning workout for fighters", "Kickboxing or boxing for fitness?",
+    "How do I get a free trial class?", "What muscles does boxing work?", "Are there women's boxing classes?",
+    "Who is the greatest boxer of all time?", "Tell me about Muhammad Ali", "How did Mike Tyson train?",
+    "Who won the heavyweight title fight?", "What made Floyd Mayweather's defense so good?",
+]
+
+SEED_OFF_TOPIC = [
+    "What is the capital of France?", "Write me a poem about the ocean", "How do I fix my laptop?",
+    "What's the weather tomorrow?", "Tell me a joke about cats", "Who won the election?",
+    "How do I cook pasta carbonara?", "Translate hello into Spanish", "What is the stock price of Apple?",
+    "Help me with my math homework", "How do I learn Python programming?", "Recommend a good movie",
+    "What is quantum physics?", "How do I change a car tire?", "Best places to visit in Italy",
+    "How do I write a cover letter?", "What's the meaning of life?", "Explain blockchain to me",
+    "How many planets are in the solar system?", "Can you book me a flight?", "What is the best phone to buy?",
+    "How do I grow tomatoes?", "Who painted the Mona Lisa?", "What time is it in Tokyo?",
+    "How do I reset my router?", "Give me a recipe for chocolate cake", "What is the square root of 144?",
+    "Who is the president of Brazil?", "How do I knit a scarf?", "Summarize the news today",
+    "What's a good name for my dog?", "How do I file my taxes?", "Explain how vaccines work",
+    "Write an essay about climate change", "What is the best video game?", "How do I play guitar chords?",
+    "Where can I buy concert tickets?", "What language is spoken in Brazil?", "How do I make coffee?",
+    "Tell me about the Roman empire", "What is machine learning?", "Can you write SQL for me?",
+    "How do I clean my oven?", "What's the plot of Hamlet?", "How tall is Mount Everest?",
+]
+
+
+def features(text):
+    """Hashed feature indices for ``text`` (word unigrams and bigrams, character trigrams)"""
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    grams = set(words)
+    grams.update(f'{a} {b}' for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f'<{word}>'
+        grams.update(f'#{padded[i:i + 3]}' for i in range(len(padded) - 2))
+    return [zlib.crc32(gram.encode()) % BUCKETS for gram in grams]
+
+
+class TopicClassifier:
+    def __init__(self, weights=None, bias=0.0):
+        self.weights = weights or {}
+        self.bias = bias
+
+    def probability(self, text):
+        """Probability that ``text`` is about boxing, training or the gym"""
+        indices = features(text)
+        if not indices:
+            return 0.5
+        scale = 1 / math.sqrt(len(indices))
+        score = self.bias + scale * sum(self.weights.get(index, 0.0) for index in indices)
+        return 1 / (1 + math.exp(-max(min(score, 30), -30)))
+
+    def fit(self, examples, epochs=30, learning_rate=1.0, l2=1e-5, seed=13):
+        """Train on ``(text, is_boxing_related)`` pairs with class-balanced SGD"""
+        examples = [(features(text), label) for text, label in examples]
+        examples = [(indices, label) for indices, label in examples if indices]
+        positives = sum(label for _, label in examples) or 1
+        negatives = (len(examples) - positives) or 1
+        class_weight = {True: len(examples) / (2 * positives), False: len(examples) / (2 * negatives)}
+
+        rng = random.Random(seed)
+        weights = {}
+        bias = 0.0
+        for epoch in range(epochs):
+            rng.shuffle(examples)
+            rate = learning_rate / math.sqrt(1 + epoch)
+            for indices, label in examples:
+                scale = 1 / math.sqrt(len(indices))
+                score = bias + scale * sum(weights.get(index, 0.0) for index in indices)
+                predicted = 1 / (1 + math.exp(-max(min(score, 30), -30)))
+                gradient = (predicted - float(label)) * class_weight[bool(label)]
+                for index in indices:
+                    weight = weights.get(index, 0.0)
+                    weights[index] = weight - rate * (gradient * scale + l2 * weight)
+                bias -= rate * gradient
+        self.weights = {index: weight for index, weight in weights.items() if abs(weight) >= 1e-4}
+        self.bias = bias
+        return self
+
+    def to_json(self):
+        return json.dumps({
+            'buckets': BUCKETS,
+            'bias': round(self.bias, 6),
+            'weights': {str(index): round(weight, 6) for index, weight in self.weights.items()},
+        })
+
+    @classmethod
+    def from_json(cls, data):
+        data = json.loads(data)
+        if data.get('buckets') != BUCKETS:
+            raise ValueError("Classifier was trained with a different feature size; retrain it")
+        return cls({int(index): weight for index, weight in data['weights'].items()}, data['bias'])
+
+
+def is_keyword_match(message):
+    message = message.lower()
+    return any(keyword in message for keyword in BOXING_KEYWORDS)
+
+
+def keyword_examples():
+    return [(keyword, True) for keyword in BOXING_KEYWORDS]
+
+
+def training_examples(max_history=None):
+    """``(text, is_boxing_related)`` pairs from the seed set, active FAQs and labelled chat history"""
+    max_history = max_history if max_history is not None else settings.CHATBOT_CLASSIFIER_MAX_HISTORY
+    examples = [(text, True) for text in SEED_BOXING] + [(text, False) for text in SEED_OFF_TOPIC]
+    for question, keywords in BoxingFAQ.objects.filter(is_active=True).values_list('question', 'keywords'):
+        examples.append((question, True))
+        examples.extend((keyword.strip(), True) for keyword in keywords.split(',') if keyword.strip())
+
+    seen = set()
+    history = ChatHistory.objects.order_by('-created_at').values_list('user_message', 'is_boxing_related')
+    for message, label in history[:max_history].iterator(chunk_size=2000):
+        key = message.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            examples.append((message, label))
+    return examples
+
+
+def seed_classifier():
+    return TopicClassifier().fit(
+        keyword_examples() + [(text, True) for text in SEED_BOXING] + [(text, False) for text in SEED_OFF_TOPIC]
+    )
+
+
+_loaded = (None, None)  # ((path, mtime, inode) of the loaded file, classifier)
+
+
+def get_classifier():
+    """The worker's classifier, loaded once and reloaded when the model file changes"""
+    global _loaded
+    path = settings.CHATBOT_CLASSIFIER_PATH
+    try:
+        stat = os.stat(path)
+        stamp = (str(path), stat.st_mtime_ns, stat.st_ino)
+    except OSError:
+        stamp = (str(path), None, None)
+    if _loaded[0] != stamp:
+        classifier = None
+        if stamp[1] is not None:
+            try:
+                with open(path) as model_file:
+                    classifier = TopicClassifier.from_json(model_file.read())
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                # Not retried until the file changes again (the stamp is kept)
+                logger.exception("Could not load the topic classifier from %s; using the seed model", path)
+        _loaded = (stamp, classifier or seed_classifier())
+    return _loaded[1]
@@ -1,8 +1,11 @@
 from django.urls import path
 from . import views
 
+app_name = 'chatbot'
+
 urlpatterns = [
     path('api/', views.chatbot_api, name='chatbot_api'),
+    path('api/stream/', views.chatbot_stream, name='chatbot_stream'),
     path('api/schedule/', views.get_training_schedule, name='training_schedule'),
     path('api/plans/', views.get_membership_plans, name='membership_plans'),
 ]
\ No newline at end of file
@@ -1,181 +1,253 @@
 import json
-import openai
-import os
+import logging
+
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from django.core.cache import cache
 from django.conf import settings
-from .models import BoxingFAQ, ChatHistory, TrainingSchedule, MembershipPlan
+from . import history, live_data, llm, response_cache, topic_classifier
+from .ratelimit import rate_limit
+from .streaming import event, event_stream
+from .faq_matcher import get_matcher
+from .models import TrainingSchedule, MembershipPlan
+
+logger = logging.getLogger(__name__)
+
+NOT_BOXING_RESPONSE = "I'm a boxing specialist assistant. I can only help with boxing-related questions like training, techniques, schedules, and equipment. Please ask me about boxing! 🥊"
+
+BOXING_SYSTEM_PROMPT = """You are BoxingBot, an expert boxing assistant for BoxingPro gym. 
+                    Only provide information about boxing training, techniques, equipment, and fitness.
+                    If asked about non-boxing topics, politely redirect to boxing.
+                    Keep responses concise and helpful. Include emojis occasionally.
+                    Focus on practical boxing advice."""
 
-# Initialize OpenAI (you'll need to set OPENAI_API_KEY in settings)
-openai.api_key = getattr(settings, 'OPENAI_API_KEY', '')
+NO_API_KEY_RESPONSE = "I'd love to help with boxing advice! For detailed AI-powered responses, please configure the OpenAI API key. Meanwhile, you can ask about our training schedules, membership plans, or boxing techniques! 🥊"
+
+LLM_ERROR_RESPONSE = "I'm having trouble connecting to my AI service right now. Please try again later or ask about our training schedules and membership plans! 🥊"
+
+
+def parse_message(request):
+    """The ``message`` of a JSON body; ValueError when the body isn't one"""
+    data = json.loads(request.body)
+    if not isinstance(data, dict) or not isinstance(data.get('message', ''), str):
+        raise ValueError("Expected a JSON object with a string 'message'")
+    return data.get('message', '').strip()
+
+async def get_instant_response(message):
+    """Steps 1-3: returns (response, is_boxing_related); response is None when the AI has to answer"""
+    # Step 1: Check if it's a boxing-related question using AI
+    if not await check_if_boxing_related(message):
+        return NOT_BOXING_RESPONSE, False
+    # Step 2: Check database for FAQs first
+    faq_response = await sync_to_async(get_faq_response)(message)
+    if faq_response:
+        return faq_response, True
+    # Step 3: Check live data from database
+    return await sync_to_async(get_live_data_response)(message), True
+
+def save_history(user, message, response, is_boxing_related):
+    if not user:
+        return
+    if not is_boxing_related:
+        response = "I specialize in boxing-related questions only."
+    # Queued and written in batches (see chatbot.history)
+    history.record(
+        user=user,
+        user_message=message,
+        bot_response=response,
+        is_boxing_related=is_boxing_related
+    )
 
 @csrf_exempt
 @require_POST
-def chatbot_api(request):
+@rate_limit
+async def chatbot_api(request):
+    """Async so that waiting on the model never blocks a worker (see chatbot.llm)"""
+    try:
+        user_message = parse_message(request)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not user_message:
+        return JsonResponse({'error': 'Empty message'}, status=400)
+
     try:
-        data = json.loads(request.body)
-        user_message = data.get('message', '').strip()
-        user_id = data.get('user_id')
-        
-        if not user_message:
-            return JsonResponse({'error': 'Empty message'}, status=400)
-        
         # Check if user is authenticated
-        user = request.user if request.user.is_authenticated else None
+        user = await request.auser()
+        user = user if user.is_authenticated else None
         
-        # Step 1: Check if it's a boxing-related question using AI
-        is_boxing_related = check_if_boxing_related(user_message)
-        
-        if not is_boxing_related:
-            # Save to history as non-boxing related
-            if user:
-                ChatHistory.objects.create(
-                    user=user,
-                    user_message=user_message,
-                    bot_response="I specialize in boxing-related questions only.",
-                    is_boxing_related=False
-                )
-            return JsonResponse({
-                'response': "I'm a boxing specialist assistant. I can only help with boxing-related questions like training, techniques, schedules, and equipment. Please ask me about boxing! 🥊"
-            })
-        
-        # Step 2: Check database for FAQs first
-        faq_response = get_faq_response(user_message)
-        if faq_response:
-            response_text = faq_response
-        else:
-            # Step 3: Check live data from database
-            live_data_response = get_live_data_response(user_message)
-            if live_data_response:
-                response_text = live_data_response
-            else:
-                # Step 4: Use AI for boxing-specific response
-                response_text = get_ai_boxing_response(user_message)
+        response_text, is_boxing_related = await get_instant_response(user_message)
+        if response_text is None:
+            # Step 4: Use AI for boxing-specific response
+            response_text = await get_ai_boxing_response(user_message)
         
         # Save to chat history
-        if user:
-            ChatHistory.objects.create(
-                user=user,
-                user_message=user_message,
-                bot_response=response_text,
-                is_boxing_related=True
-            )
+        await sync_to_async(save_history)(user, user_message, response_text, is_boxing_related)
         
         return JsonResponse({'response': response_text})
         
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    except llm.LLMBusy:
+        raise
+    except Exception:
+        logger.exception("Chatbot request failed")
+        return JsonResponse({'error': 'Something went wrong'}, status=500)
+
+@csrf_exempt
+@require_POST
+@rate_limit
+async def chatbot_stream(request):
+    """Same answers as chatbot_api, sent as server-sent events.
 
-def check_if_boxing_related(message):
-    """Use AI to determine if the question is boxing-related"""
+    FAQ and live-data answers arrive as one ``message`` event; AI answers
+    arrive as ``token`` events while the model is still writing. The stream
+    always ends with a ``done`` event.
+    """
     try:
-        if not openai.api_key:
+        user_message = parse_message(request)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not user_message:
+        return JsonResponse({'error': 'Empty message'}, status=400)
+
+    user = await request.auser()
+    user = user if user.is_authenticated else None
+
+    response_text, is_boxing_related = await get_instant_response(user_message)
+    if response_text is not None:
+        await sync_to_async(save_history)(user, user_message, response_text, is_boxing_related)
+
+        async def events():
+            yield event('message', {'text': response_text})
+            yield event('done', {})
+
+        return event_stream(request, events())
+
+    parts = []
+
+    async def events():
+        async for text in stream_ai_boxing_response(user_message):
+            parts.append(text)
+            yield event('token', {'text': text})
+        yield event('done', {})
+
+    return event_stream(request, events(), lambda: save_history(user, user_message, ''.join(parts), True))
+
+async def check_if_boxing_related(message):
+    """Classify locally; use AI only when the local classifier is unsure"""
+    probability = topic_classifier.get_classifier().probability(message)
+    if probability >= settings.CHATBOT_CLASSIFIER_ACCEPT:
+        return True
+    if probability <= settings.CHATBOT_CLASSIFIER_REJECT:
+        return False
+
+    try:
+        if not llm.is_configured():
             # Fallback: simple keyword check if no API key
-            boxing_keywords = [
-                'boxing', 'punch', 'glove', 'train', 'spar', 'jab', 'cross', 'hook',
-                'uppercut', 'heavy bag', 'speed bag', 'ring', 'round', 'coach',
-                'training', 'technique', 'footwork', 'defense', 'combination',
-                'knockout', 'referee', 'gym', 'membership', 'schedule', 'class'
-            ]
-            return any(keyword in message.lower() for keyword in boxing_keywords)
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Determine if this question is related to boxing, martial arts, training, fitness, or gym membership. Answer only 'yes' or 'no'."},
-                {"role": "user", "content": f"Question: {message}"}
-            ],
-            max_tokens=10,
-            temperature=0
-        )
+            return topic_classifier.is_keyword_match(message)
         
-        answer = response.choices[0].message.content.strip().lower()
-        return 'yes' in answer
+        async def classify():
+            answer = await llm.chat_completion(
+                [
+                    {"role": "system", "content": "Determine if this question is related to boxing, martial arts, training, fitness, or gym membership. Answer only 'yes' or 'no'."},
+                    {"role": "user", "content": f"Question: {message}"}
+                ],
+                max_tokens=10,
+                temperature=0,
+                timeout=settings.LLM_CLASSIFY_TIMEOUT
+            )
+            return 'yes' in answer.lower()
+
+        # Repeat questions skip the API call (see chatbot.response_cache)
+        return await response_cache.cached('classify', message, classify)
         
+    except llm.LLMBusy:
+        raise
     except Exception:
-        # Fallback to keyword check if AI fails
-        boxing_keywords = ['boxing', 'train', 'punch', 'glove', 'spar', 'gym', 'coach']
-        return any(keyword in message.lower() for keyword in boxing_keywords)
+        # Fallback to keyword check if AI fails (instant while the circuit breaker is open)
+        return topic_classifier.is_keyword_match(message)
+
 
 def get_faq_response(message):
     """Check database FAQs for matching questions"""
     try:
-        # Search in FAQs
-        faqs = BoxingFAQ.objects.filter(is_active=True)
-        for faq in faqs:
-            keywords = [k.strip().lower() for k in faq.keywords.split(',')]
-            if any(keyword in message.lower() for keyword in keywords):
-                return faq.answer
-        return None
+        # One pass over the message against every FAQ keyword
+        return get_matcher().best_answer(message)
     except Exception:
         return None
 
 def get_live_data_response(message):
-    """Fetch live data from database"""
+    """Answer schedule, membership and coach questions from precomputed blocks (see chatbot.live_data)"""
     message_lower = message.lower()
     
     try:
+        answers = live_data.get_answers()
+        day = live_data.mentioned_day(message_lower)
+        
         # Check for schedule-related questions
-        if any(word in message_lower for word in ['schedule', 'time', 'when', 'class', 'training time']):
-            schedules = TrainingSchedule.objects.all().order_by('day', 'time_slot')
-            if schedules.exists():
-                response = "📅 Current Training Schedule:\n\n"
-                current_day = None
-                for schedule in schedules:
-                    if schedule.day != current_day:
-                        response += f"\n{schedule.get_day_display()}:\n"
-                        current_day = schedule.day
-                    response += f"• {schedule.time_slot} - {schedule.class_type} (Coach: {schedule.coach}) - {schedule.available_slots} slots available\n"
-                return response + "\nBook your spot through our website or front desk!"
+        if day or any(word in message_lower for word in ['schedule', 'time', 'when', 'class', 'training time']):
+            if answers['schedule']:
+                # Narrow to one coach or one day when the message names them
+                return live_data.mentioned_coach(answers, message_lower) or answers['by_day'].get(day) or answers['schedule']
         
         # Check for membership questions
         if any(word in message_lower for word in ['membership', 'price', 'cost', 'plan', 'fee']):
-            plans = MembershipPlan.objects.filter(is_active=True)
-            if plans.exists():
-                response = "💳 Membership Plans:\n\n"
-                for plan in plans:
-                    response += f"• {plan.name}: ${plan.price}/{plan.duration}\n"
-                    response += f"  Features: {plan.features}\n\n"
-                return response + "Visit us for a free trial class!"
+            if answers['membership']:
+                return answers['membership']
         
         # Check for coach information
         if any(word in message_lower for word in ['coach', 'trainer', 'instructor']):
-            # Get unique coaches from schedule
-            coaches = TrainingSchedule.objects.values_list('coach', flat=True).distinct()
-            if coaches:
-                return f"👨‍🏫 Our certified coaches: {', '.join(coaches)}\n\nAll our coaches are experienced professionals with competitive backgrounds. Book a private session for personalized training!"
+            if answers['coaches']:
+                return live_data.mentioned_coach(answers, message_lower) or answers['coaches']
         
         return None
         
     except Exception:
         return None
 
-def get_ai_boxing_response(message):
+def boxing_messages(message):
+    return [
+        {"role": "system", "content": BOXING_SYSTEM_PROMPT},
+        {"role": "user", "content": message}
+    ]
+
+async def get_ai_boxing_response(message):
     """Get AI response for boxing-specific questions"""
     try:
-        if openai.api_key:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": """You are BoxingBot, an expert boxing assistant for BoxingPro gym. 
-                    Only provide information about boxing training, techniques, equipment, and fitness.
-                    If asked about non-boxing topics, politely redirect to boxing.
-                    Keep responses concise and helpful. Include emojis occasionally.
-                    Focus on practical boxing advice."""},
-                    {"role": "user", "content": message}
-                ],
+        if llm.is_configured():
+            return await response_cache.cached('response', message, lambda: llm.chat_completion(
+                boxing_messages(message),
                 max_tokens=200,
                 temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
+            ))
         else:
             # Fallback responses if no AI key
-            return "I'd love to help with boxing advice! For detailed AI-powered responses, please configure the OpenAI API key. Meanwhile, you can ask about our training schedules, membership plans, or boxing techniques! 🥊"
+            return NO_API_KEY_RESPONSE
             
+    except llm.LLMBusy:
+        raise
     except Exception as e:
-        return f"I'm having trouble connecting to my AI service right now. Please try again later or ask about our training schedules and membership plans! 🥊"
+        return LLM_ERROR_RESPONSE
+
+async def stream_ai_boxing_response(message):
+    """Yield the AI response in pieces as the model writes it; cached answers come in one piece"""
+    if not llm.is_configured():
+        yield NO_API_KEY_RESPONSE
+        return
+
+    cached = await response_cache.lookup('response', message)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    try:
+        async for text in llm.stream_completion(boxing_messages(message), max_tokens=200, temperature=0.7):
+            parts.append(text)
+            yield text
+    except Exception:
+        yield ('\n\n' if parts else '') + LLM_ERROR_RESPONSE
+        return
+    await response_cache.store('response', message, ''.join(parts))
 
 # Additional API endpoints
 @csrf_exempt